@@ -21,6 +21,22 @@ app.conf.beat_schedule = {
         "schedule": 30.0,  # Run every 30 seconds
         "args": (16, 16),  # Optional arguments
     },
+    "flush-article-view-counts": {
+        "task": "core_apps.articles.tasks.flush_article_view_counts",
+        "schedule": 30.0,  # Persist buffered article views every 30 seconds
+    },
+    "flush-user-last-logins": {
+        "task": "core_apps.users.tasks.flush_user_last_logins",
+        "schedule": 60.0,  # Persist buffered login times every minute
+    },
+    "send-outbox-emails": {
+        "task": "core_apps.common.tasks.send_outbox_emails",
+        "schedule": 30.0,  # Pick up retries and anything missed after commit
+    },
+    "purge-outbox-emails": {
+        "task": "core_apps.common.tasks.purge_outbox_emails",
+        "schedule": 60.0 * 60 * 24,
+    },
 }
 
 # Optional: Configure result backend
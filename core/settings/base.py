@@ -25,6 +25,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.sites",
     "django.contrib.humanize",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -49,7 +50,16 @@ THIRD_PARTY_APPS = [
     # "drf_haystack",
 ]
 
-LOCAL_APPS = ["core_apps.common", "core_apps.users", "core_apps.profiles"]
+LOCAL_APPS = [
+    "core_apps.common",
+    "core_apps.users",
+    "core_apps.profiles",
+    "core_apps.comments",
+    "core_apps.articles",
+    "core_apps.tags",
+    "core_apps.reactions",
+    "core_apps.timelines",
+]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
@@ -102,13 +112,26 @@ DATABASES = {
 }
 
 PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "core_apps.users.hashers.TunableArgon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
     "django.contrib.auth.hashers.ScryptPasswordHasher",
 ]
 
+# Argon2 cost (memory in KiB). Existing hashes are upgraded on the next
+# login after these change; size them with `manage.py benchmark_login`
+ARGON2_TIME_COST = int(getenv("ARGON2_TIME_COST", 2))
+ARGON2_MEMORY_COST = int(getenv("ARGON2_MEMORY_COST", 102400))
+ARGON2_PARALLELISM = int(getenv("ARGON2_PARALLELISM", 8))
+
+# Login attempts per login and client address before UserViewSet.login
+# locks them out, the ceiling per login across all addresses, and the
+# sliding window both are counted over
+LOGIN_ATTEMPTS = 5
+LOGIN_ACCOUNT_ATTEMPTS = 50
+LOCKOUT_DURATION = timedelta(minutes=15)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -145,6 +168,20 @@ CACHES = {
 # Cache time to live is 15 minutes (in seconds)
 CACHE_TTL = 60 * 15
 
+# Per-process tier of core_apps.common.tiered_cache in front of Redis;
+# the TTL bounds staleness should an invalidation message be missed
+LOCAL_CACHE_MAX_ENTRIES = 10_000
+LOCAL_CACHE_TTL = 30
+# Grace period during which an expired entry is still served while one
+# worker recomputes it (see TwoTierCache.get_or_set)
+CACHE_STALE_TTL = 60
+
+# Home timelines: entries kept per user, and the follower count above which
+# an author's articles are pulled at read time instead of fanned out
+TIMELINE_MAX_LENGTH = 800
+TIMELINE_FANOUT_FOLLOWER_LIMIT = 10_000
+TIMELINE_FANOUT_BATCH_SIZE = 1_000
+
 # Session cache configuration
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
@@ -167,7 +204,7 @@ CELERY_TIMEZONE = "UTC"
 # Django REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",  # Fully stateless
+        "core_apps.users.authentication.StatelessJWTAuthentication",  # No user query per request
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",  # Require authentication for all endpoints
@@ -182,8 +219,8 @@ REST_FRAMEWORK = {
     "PAGE_SIZE_QUERY_PARAM": "page_size",
     "MAX_PAGE_SIZE": 100,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",  # Throttle anonymous users
-        "rest_framework.throttling.UserRateThrottle",  # Throttle authenticated users
+        "core_apps.common.throttling.AnonSlidingWindowThrottle",  # Throttle anonymous users
+        "core_apps.common.throttling.UserSlidingWindowThrottle",  # Throttle authenticated users
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/day",  # Anonymous users: 100 requests per day
@@ -224,6 +261,7 @@ REST_AUTH = {
     "PASSWORD_RESET_SERIALIZER": "core_apps.users.serializers.CustomPasswordResetSerializer",
     "PASSWORD_RESET_CONFIRM_SERIALIZER": "core_apps.users.serializers.CustomPasswordResetConfirmSerializer",
     "PASSWORD_CHANGE_SERIALIZER": "core_apps.users.serializers.CustomPasswordChangeSerializer",
+    "OLD_PASSWORD_FIELD_ENABLED": True,  # CustomPasswordChangeSerializer checks it
     "USER_DETAILS_SERIALIZER": "core_apps.users.serializers.UserDetailsSerializer",
 }
 
@@ -233,6 +271,10 @@ ACCOUNT_UNIQUE_EMAIL = True  # Ensure email is unique
 ACCOUNT_USERNAME_REQUIRED = True  # Make username mandatory
 ACCOUNT_EMAIL_VERIFICATION = "mandatory"  # Require email verification
 ACCOUNT_EMAIL_CONFIRMATION_EXPIRE_DAYS = 3  # Expiration for confirmation emails
+ACCOUNT_ADAPTER = "core_apps.users.adapters.AccountAdapter"  # Queues emails
+
+# Frontend page that posts uid and token to users/password_reset_confirm
+PASSWORD_RESET_URL = getenv("PASSWORD_RESET_URL", "/password-reset/{uid}/{token}/")
 
 AUTH_USER_MODEL = "users.User"
 
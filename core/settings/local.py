@@ -24,7 +24,9 @@ ALLOWED_HOSTS = ["localhost", "127.0.0.1", "0.0.0.0"]
 
 ADMIN_URL = getenv("ADMIN_URL")
 
-EMAIL_BACKEND = "djcelery_email.backends.CeleryEmailBackend"
+# Sent from Celery already, in batches (see core_apps.common.outbox);
+# point EMAIL_HOST/EMAIL_PORT at mailpit to inspect them locally
+EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = getenv("EMAIL_HOST")
 EMAIL_PORT = getenv("EMAIL_PORT")
 DEFAULT_FROM_EMAIL = getenv("DEFAULT_FROM_EMAIL")
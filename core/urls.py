@@ -27,6 +27,12 @@ urlpatterns = [
         name="schema-swagger-ui",
     ),
     path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
+    path("api/v1/", include("core_apps.users.urls")),
+    path("api/v1/", include("core_apps.articles.urls")),
+    path("api/v1/", include("core_apps.comments.urls")),
+    path("api/v1/", include("core_apps.timelines.urls")),
+    path("api/v1/", include("core_apps.profiles.urls")),
+    path("api/v1/", include("core_apps.tags.urls")),
     # path("accounts/", include("allauth.urls")),  # Allauth URLs
 ]
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ArticlesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_apps.articles"
+
+    def ready(self):
+        from core_apps.articles import signals
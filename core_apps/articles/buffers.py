@@ -0,0 +1,4 @@
+from core_apps.common.buffers import get_counter_buffer
+
+# Article views waiting to be written by flush_article_view_counts
+view_counts = get_counter_buffer("article_view_counts")
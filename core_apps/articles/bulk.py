@@ -0,0 +1,258 @@
+import json
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import (
+    Case,
+    DateTimeField,
+    F,
+    PositiveIntegerField,
+    Q,
+    Value,
+    When,
+)
+from django.utils.text import slugify
+from loguru import logger
+from core_apps.tags.models import Tag, TaggedItem
+from core_apps.tags.signals import tag_counts_changed
+from .models import Article, Author
+from .search import get_search_backend
+from .serializers import ArticleImportRecordSerializer
+
+User = get_user_model()
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def export_articles_ndjson(chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield one JSON line per article with its author usernames and tags.
+
+    Articles are read with a server-side iterator and each chunk costs two
+    more queries for its authors and tags, so memory stays flat.
+    """
+    rows = (
+        Article.objects.order_by("id")
+        .values("id", "title", "slug", "body", "status", "created_at", "updated_at")
+        .iterator(chunk_size=chunk_size)
+    )
+    for chunk in _chunks(rows, chunk_size):
+        article_ids = [row["id"] for row in chunk]
+        authors: Dict[int, List[str]] = {}
+        for article_id, username in Author.objects.filter(
+            article_id__in=article_ids
+        ).values_list("article_id", "user__username"):
+            authors.setdefault(article_id, []).append(username)
+        tags: Dict[int, List[str]] = {}
+        for article_id, tag in TaggedItem.objects.filter(
+            article_id__in=article_ids
+        ).values_list("article_id", "tag__tag"):
+            tags.setdefault(article_id, []).append(tag)
+
+        for row in chunk:
+            article_id = row.pop("id")
+            row["authors"] = authors.get(article_id, [])
+            row["tags"] = tags.get(article_id, [])
+            yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+class ArticleImporter:
+    """
+    Import NDJSON articles chunk by chunk with bulk inserts.
+
+    Each chunk is validated in memory, then written in one transaction:
+    usernames and tag names are resolved with one query each, lines naming
+    unknown authors are reported as errors, existing titles/slugs are
+    skipped, missing tags are created, and articles, authors and tagged
+    items are inserted with bulk_create.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.created = 0
+        self.skipped = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def run(self, lines: Iterable[Union[str, bytes]]) -> Dict[str, Any]:
+        numbered = (
+            (number, line) for number, line in enumerate(lines, start=1) if line.strip()
+        )
+        for chunk in _chunks(numbered, self.chunk_size):
+            records = self.validate(chunk)
+            if records:
+                self.import_chunk(records)
+        return {"created": self.created, "skipped": self.skipped, "errors": self.errors}
+
+    def validate(
+        self, chunk: List[Tuple[int, Union[str, bytes]]]
+    ) -> List[Dict[str, Any]]:
+        records = []
+        for number, line in chunk:
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                self.errors.append({"line": number, "errors": str(e)})
+                continue
+            serializer = ArticleImportRecordSerializer(data=data)
+            if serializer.is_valid():
+                record = serializer.validated_data
+                record["line"] = number
+                record["slug"] = record.get("slug") or slugify(
+                    record["title"], allow_unicode=True
+                )
+                records.append(record)
+            else:
+                self.errors.append({"line": number, "errors": serializer.errors})
+        return records
+
+    def import_chunk(self, records: List[Dict[str, Any]]) -> None:
+        with transaction.atomic():
+            user_ids = dict(
+                User.objects.filter(
+                    username__in={name for r in records for name in r["authors"]}
+                ).values_list("username", "id")
+            )
+            records = self._drop_unknown_authors(records, user_ids)
+            records = self._drop_duplicates(records)
+            if not records:
+                return
+
+            tag_ids = self._resolve_tags({tag for r in records for tag in r["tags"]})
+
+            articles = Article.objects.bulk_create(
+                [
+                    Article(
+                        title=r["title"],
+                        slug=r["slug"],
+                        body=r["body"],
+                        status=r["status"],
+                    )
+                    for r in records
+                ]
+            )
+            # bulk_create stamps both columns with the current time
+            self._restore_timestamps(articles, records)
+            Author.objects.bulk_create(
+                [
+                    Author(article=article, user_id=user_ids[username])
+                    for article, r in zip(articles, records)
+                    for username in set(r["authors"])
+                ],
+                ignore_conflicts=True,
+            )
+            tagged_items = TaggedItem.objects.bulk_create(
+                [
+                    TaggedItem(article=article, tag_id=tag_ids[tag])
+                    for article, r in zip(articles, records)
+                    for tag in set(r["tags"])
+                ],
+                ignore_conflicts=True,
+            )
+            # bulk_create skips the signals that maintain Tag.article_count,
+            # the popular tags cache and the autocomplete version
+            published_items = [
+                item
+                for item in tagged_items
+                if item.article.status == Article.Status.PUBLISHED
+            ]
+            self._add_tag_counts(published_items)
+            if published_items:
+                transaction.on_commit(tag_counts_changed)
+
+            article_ids = [article.id for article in articles]
+            transaction.on_commit(
+                lambda: get_search_backend().index_articles(article_ids)
+            )
+
+        self.created += len(articles)
+        logger.info(f"Imported {len(articles)} articles")
+
+    def _drop_unknown_authors(
+        self, records: List[Dict[str, Any]], user_ids: Dict[str, int]
+    ) -> List[Dict[str, Any]]:
+        known = []
+        for record in records:
+            unknown = sorted(set(record["authors"]) - user_ids.keys())
+            if unknown:
+                self.errors.append(
+                    {
+                        "line": record["line"],
+                        "errors": {"authors": [f"Unknown users: {', '.join(unknown)}"]},
+                    }
+                )
+            else:
+                known.append(record)
+        return known
+
+    def _drop_duplicates(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        titles = {r["title"] for r in records}
+        slugs = {r["slug"] for r in records}
+        taken_titles, taken_slugs = set(), set()
+        for title, slug in Article.objects.filter(
+            Q(title__in=titles) | Q(slug__in=slugs)
+        ).values_list("title", "slug"):
+            taken_titles.add(title)
+            taken_slugs.add(slug)
+
+        unique = []
+        for record in records:
+            if record["title"] in taken_titles or record["slug"] in taken_slugs:
+                self.skipped += 1
+                continue
+            taken_titles.add(record["title"])
+            taken_slugs.add(record["slug"])
+            unique.append(record)
+        return unique
+
+    def _resolve_tags(self, names: set) -> Dict[str, int]:
+        tag_ids = dict(Tag.objects.filter(tag__in=names).values_list("tag", "id"))
+        missing = names - tag_ids.keys()
+        if missing:
+            Tag.objects.bulk_create(
+                [Tag(tag=name) for name in missing], ignore_conflicts=True
+            )
+            tag_ids.update(Tag.objects.filter(tag__in=missing).values_list("tag", "id"))
+        return tag_ids
+
+    def _restore_timestamps(
+        self, articles: List[Article], records: List[Dict[str, Any]]
+    ) -> None:
+        stamps = {
+            field: [
+                When(id=article.id, then=Value(r[field]))
+                for article, r in zip(articles, records)
+                if r.get(field)
+            ]
+            for field in ("created_at", "updated_at")
+        }
+        updates = {
+            field: Case(*whens, default=F(field), output_field=DateTimeField())
+            for field, whens in stamps.items()
+            if whens
+        }
+        if updates:
+            Article.objects.filter(id__in=[article.id for article in articles]).update(
+                **updates
+            )
+
+    def _add_tag_counts(self, tagged_items: List[TaggedItem]) -> None:
+        counts: Dict[int, int] = {}
+        for tagged_item in tagged_items:
+            counts[tagged_item.tag_id] = counts.get(tagged_item.tag_id, 0) + 1
+        if counts:
+            Tag.objects.filter(id__in=counts).update(
+                article_count=F("article_count")
+                + Case(
+                    *[When(id=tag_id, then=Value(n)) for tag_id, n in counts.items()],
+                    default=Value(0),
+                    output_field=PositiveIntegerField(),
+                )
+            )
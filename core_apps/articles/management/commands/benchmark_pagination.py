@@ -0,0 +1,75 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from core_apps.articles.models import Article
+from core_apps.common.pagination import keyset_filter
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare OFFSET and keyset page latency on the article table at "
+        "several depths."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--offsets", type=int, nargs="+", default=[0, 10_000, 1_000_000]
+        )
+        parser.add_argument("--page-size", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Insert this many filler articles before measuring.",
+        )
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            self.seed(options["seed"])
+
+        ordered = Article.objects.order_by("-created_at", "-id")
+        total = ordered.count()
+        page_size = options["page_size"]
+
+        self.stdout.write(f"{'offset':>10} {'OFFSET ms':>12} {'keyset ms':>12}")
+        for offset in options["offsets"]:
+            if offset >= total:
+                self.stdout.write(f"{offset:>10} skipped, only {total} articles")
+                continue
+
+            def offset_page():
+                # PageNumberPagination counts on every request as well
+                ordered.count()
+                return list(ordered[offset : offset + page_size])
+
+            # The cursor a client would hold after paging to `offset`
+            position = ordered.values_list("created_at", "id")[offset]
+
+            def keyset_page():
+                return list(ordered.filter(keyset_filter(position))[:page_size])
+
+            self.stdout.write(
+                f"{offset:>10} {self.measure(offset_page, options['repeat']):>12.2f}"
+                f" {self.measure(keyset_page, options['repeat']):>12.2f}"
+            )
+
+    def measure(self, fetch_page, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fetch_page()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def seed(self, count: int, batch_size: int = 10_000) -> None:
+        start = Article.objects.count()
+        for batch_start in range(start, start + count, batch_size):
+            batch_end = min(batch_start + batch_size, start + count)
+            Article.objects.bulk_create(
+                [
+                    Article(title=f"benchmark-{i}", slug=f"benchmark-{i}")
+                    for i in range(batch_start, batch_end)
+                ]
+            )
+        self.stdout.write(f"Seeded {count} articles")
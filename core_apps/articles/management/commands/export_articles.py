@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from core_apps.articles.bulk import DEFAULT_CHUNK_SIZE, export_articles_ndjson
+
+
+class Command(BaseCommand):
+    help = "Stream every article with its authors and tags as NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="File to write, defaults to stdout")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        lines = export_articles_ndjson(chunk_size=options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,29 @@
+import sys
+from django.core.management.base import BaseCommand
+from core_apps.articles.bulk import DEFAULT_CHUNK_SIZE, ArticleImporter
+
+
+class Command(BaseCommand):
+    help = "Bulk import articles, authors and tags from an NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file to read, or - for stdin")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        importer = ArticleImporter(chunk_size=options["chunk_size"])
+        if options["path"] == "-":
+            result = importer.run(sys.stdin)
+        else:
+            with open(options["path"], encoding="utf-8") as lines:
+                result = importer.run(lines)
+
+        for error in result["errors"]:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['created']} articles, "
+                f"skipped {result['skipped']} existing, "
+                f"rejected {len(result['errors'])} invalid"
+            )
+        )
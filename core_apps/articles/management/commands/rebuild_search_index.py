@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from core_apps.articles.models import Article
+from core_apps.articles.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Recompute the article search index, e.g. after a bulk load."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        batch_size = options["batch_size"]
+        article_ids = Article.objects.order_by("id").values_list("id", flat=True)
+
+        indexed, batch = 0, []
+        for article_id in article_ids.iterator(chunk_size=batch_size):
+            batch.append(article_id)
+            if len(batch) >= batch_size:
+                backend.index_articles(batch)
+                indexed, batch = indexed + len(batch), []
+        if batch:
+            backend.index_articles(batch)
+            indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} articles"))
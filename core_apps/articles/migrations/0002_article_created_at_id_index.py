@@ -0,0 +1,19 @@
+# Generated by Django 4.2.9 on 2026-10-18 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["created_at", "id"], name="article_created_f1af53_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.9 on 2026-10-18 16:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_count(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Comment = apps.get_model("comments", "Comment")
+    Article = apps.get_model("articles", "Article")
+    content_type = ContentType.objects.filter(
+        app_label="articles", model="article"
+    ).first()
+    if content_type is None:
+        # Fresh database: nothing has been commented on yet
+        return
+    counts = (
+        Comment.objects.filter(content_type=content_type, object_id=OuterRef("pk"))
+        .values("object_id")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Article.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0003_article_search_vector"),
+        ("comments", "0004_comment_comment_count_object_index"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.9 on 2026-10-18 18:02
+
+from django.db import migrations
+
+# SQLiteSearchBackend.table
+TABLE = "article_search"
+
+
+def create_search_table(apps, schema_editor):
+    # PostgreSQL searches Article.search_vector instead
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} "
+        "USING fts5(title, tags, body, tokenize='unicode61')"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0004_article_comment_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from core_apps.comments.models import Comment
@@ -8,7 +10,7 @@ from core_apps.common.models import CommentableMixin
 User = get_user_model()
 
 
-class Article(models.Model, CommentableMixin):
+class Article(CommentableMixin, models.Model):
     class Status(models.TextChoices):
         DRAFT = "draft", _("Draft")
         PUBLISHED = "published", _("Published")
@@ -34,6 +36,8 @@ class Article(models.Model, CommentableMixin):
     comments = GenericRelation(Comment)
     view_count = models.PositiveIntegerField(default=0)
     like_count = models.PositiveIntegerField(default=0)
+    # Maintained by core_apps.articles.search on save
+    search_vector = SearchVectorField(null=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -43,19 +47,39 @@ class Article(models.Model, CommentableMixin):
         verbose_name = _("Article")
         verbose_name_plural = _("Articles")
         ordering = ["-created_at"]
+        # Backs keyset pagination over (created_at, id)
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            GinIndex(fields=["search_vector"], name="article_search_vector_gin"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets a save tell whether it publishes or unpublishes the article
+        # (timelines.signals, tags.signals)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def save(self, *args, **kwargs) -> None:
+        super().save(*args, **kwargs)
+        # Every post_save receiver has seen the previous status by now
+        self._loaded_status = self.status
 
     def increment_view_count(self) -> None:
-        from django.db.models import F
+        # Buffered; flush_article_view_counts persists the pending views
+        from core_apps.articles import buffers
+
+        buffers.view_counts.increment(self.id)
 
-        Article.objects.filter(id=self.id).update(view_count=F("view_count") + 1)
-        self.refresh_from_db()
+    def get_view_count(self) -> int:
+        from core_apps.articles import buffers
 
-    def get_like_count(self):
-        from django.contrib.contenttypes.models import ContentType
-        from core_apps.reactions.models import Like
+        return self.view_count + buffers.view_counts.pending(self.id)
 
-        content_type = ContentType.objects.get_for_model(self)
-        return Like.objects.filter(content_type=content_type, object_id=self.id).count()
+    def get_like_count(self) -> int:
+        # Maintained by core_apps.reactions.repositories.LikeRepository
+        return self.like_count
 
     def __str__(self) -> str:
         return self.title
@@ -68,7 +92,7 @@ class Author(models.Model):
     article = models.ForeignKey(
         Article,
         on_delete=models.CASCADE,
-        related_name="authors",
+        related_name="authorships",
         verbose_name=_("Article"),
     )
 
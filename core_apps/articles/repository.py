@@ -1,24 +1,80 @@
-from typing import Optional, List, Dict, Any, QuerySet, Protocol
+from typing import Callable, Iterable, Optional, List, Dict, Any, Protocol
 from .models import Article
+from core_apps.comments.models import Comment
+from core_apps.common.cache_keys import cache_keys
+from core_apps.common.tiered_cache import TwoTierCache, invalidation_bus
+from core_apps.tags.models import TaggedItem
 from loguru import logger
+from django.db.models import (
+    Case,
+    F,
+    OuterRef,
+    PositiveIntegerField,
+    Prefetch,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Concat
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Number of comments embedded in an article detail response
+COMMENTS_PREVIEW_LIMIT = 20
+
+# Rows touched by a single bulk counter UPDATE
+COUNTER_UPDATE_BATCH_SIZE = 500
+
+# Article saves and view count flushes invalidate a detail entry; likes
+# and new comments show up once it expires
+ARTICLE_DETAIL_TIMEOUT = 60
+
+article_cache = TwoTierCache(
+    "articles", invalidation_bus, timeout=ARTICLE_DETAIL_TIMEOUT
+)
+
+
+def article_tag(article_id: int) -> str:
+    return f"article:{article_id}"
+
 
 class ArticleRepositoryProtocol(Protocol):
     def get_article_by_id(self) -> Optional[Article]: ...
 
     def get_author_profile(self) -> User: ...
 
+    def get_article_detail(
+        self, article_id: int, comments_limit: int = COMMENTS_PREVIEW_LIMIT
+    ) -> Optional[Article]: ...
+
+    def get_article_detail_data(
+        self, article_id: int, serialize: Callable[[Article], Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]: ...
+
+    def get_comments_preview(
+        self, article: Article, limit: int = COMMENTS_PREVIEW_LIMIT
+    ) -> List[Dict[str, Any]]: ...
+
     def create_article(self, data: Dict[str, Any], user: User) -> Article: ...
 
     def update_article(self, article: Article, data: Dict[str, Any]) -> Article: ...
 
     def list_articles(self, filters: Dict[str, Any] = None) -> QuerySet[Article]: ...
 
+    def list_articles_with_relations(
+        self, filters: Dict[str, Any] = None
+    ) -> QuerySet[Article]: ...
+
     def delete_article(self, article: Article) -> bool: ...
 
+    def add_view_counts(self, counts: Dict[int, int]) -> int: ...
+
+    def invalidate_articles(self, article_ids: Iterable[int]) -> None: ...
+
 
 class ArticleRepository:
     def get_article_by_id(self, article: Article) -> List[Article]:
@@ -31,6 +87,83 @@ class ArticleRepository:
     def get_author_profile(self) -> User:
         return
 
+    def get_article_detail_data(
+        self, article_id: int, serialize: Callable[[Article], Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cached `serialize(article)` output for the detail page, or None.
+
+        The cached `view_count` is the stored count: add the views still
+        pending in the buffer when serving it. Concurrent misses on a
+        popular article run the queries once; see TwoTierCache.get_or_set.
+        """
+
+        def load():
+            article = self.get_article_detail(article_id)
+            if article is None:
+                return None
+            return {**serialize(article), "view_count": article.view_count}
+
+        key = cache_keys.make_key(
+            "article_detail", article_id, tags=[article_tag(article_id)]
+        )
+        return article_cache.get_or_set(key, load)
+
+    def get_article_detail(
+        self, article_id: int, comments_limit: int = COMMENTS_PREVIEW_LIMIT
+    ) -> Optional[Article]:
+        """
+        Load an article for the detail page with bounded work.
+
+        Total comment likes are aggregated in the database (the comment
+        count is a stored column), authors and tags are prefetched, and only
+        the newest `comments_limit` comments are fetched as plain dicts.
+        """
+        article_comments = (
+            Comment.objects.filter(
+                content_type=ContentType.objects.get_for_model(Article),
+                object_id=OuterRef("pk"),
+            )
+            .order_by()
+            .values("object_id")
+        )
+        article = (
+            self.list_articles_with_relations({"id": article_id})
+            .annotate(
+                comments_likes=Coalesce(
+                    Subquery(
+                        article_comments.annotate(total=Sum("like_count")).values(
+                            "total"
+                        )
+                    ),
+                    0,
+                ),
+            )
+            .first()
+        )
+        if article is None:
+            logger.error(f"Article with id {article_id} does not exist")
+            return None
+
+        article.comments_preview = self.get_comments_preview(article, comments_limit)
+        return article
+
+    def get_comments_preview(
+        self, article: Article, limit: int = COMMENTS_PREVIEW_LIMIT
+    ) -> List[Dict[str, Any]]:
+        return list(
+            Comment.objects.filter(
+                content_type=ContentType.objects.get_for_model(Article),
+                object_id=article.id,
+            )
+            .annotate(
+                user_full_name=Concat("user__first_name", Value(" "), "user__last_name")
+            )
+            .values(
+                "id", "title", "body", "user_full_name", "created_at", "updated_at"
+            )[:limit]
+        )
+
     def create_article(self, data: Dict[str, Any], user: User) -> Optional[Article]:
         try:
             return Article.objects.create(**data)
@@ -52,6 +185,25 @@ class ArticleRepository:
     def list_articles(self, filters: Dict[str, Any] = None) -> QuerySet[Article]:
         return Article.objects.filter(**filters)
 
+    def list_articles_with_relations(
+        self, filters: Dict[str, Any] = None
+    ) -> QuerySet[Article]:
+        """
+        Article list queryset with authors and tags prefetched.
+
+        Costs three queries per page (articles, authors joined to users,
+        tagged items joined to tags) no matter how many rows are on it.
+        """
+        return Article.objects.filter(**(filters or {})).prefetch_related(
+            Prefetch("authors", queryset=User.objects.only("first_name", "last_name")),
+            Prefetch(
+                "tagged_items",
+                queryset=TaggedItem.objects.select_related("tag").only(
+                    "article_id", "tag__tag"
+                ),
+            ),
+        )
+
     def delete_article(self, article: Article) -> bool:
         try:
             article.delete()
@@ -61,3 +213,29 @@ class ArticleRepository:
                 f"Article deletion error: {e}"
             )  # Log the error message to the console
             return False
+
+    def add_view_counts(self, counts: Dict[int, int]) -> int:
+        """Add per-article view deltas with one UPDATE per batch of ids."""
+        items = list(counts.items())
+        updated = 0
+        for start in range(0, len(items), COUNTER_UPDATE_BATCH_SIZE):
+            batch = items[start : start + COUNTER_UPDATE_BATCH_SIZE]
+            updated += Article.objects.filter(
+                id__in=[article_id for article_id, _ in batch]
+            ).update(
+                view_count=F("view_count")
+                + Case(
+                    *[
+                        When(id=article_id, then=Value(delta))
+                        for article_id, delta in batch
+                    ],
+                    default=Value(0),
+                    output_field=PositiveIntegerField(),
+                )
+            )
+        # Cached details hold the old count while the buffer was drained
+        self.invalidate_articles(counts)
+        return updated
+
+    def invalidate_articles(self, article_ids: Iterable[int]) -> None:
+        cache_keys.invalidate(article_tag(article_id) for article_id in article_ids)
@@ -0,0 +1,209 @@
+from typing import Dict, Iterable, List, Protocol, Tuple
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+)
+from django.db import connection
+from django.db.models import Case, F, Func, Value, When
+from django.db.models.functions import Lower
+from core_apps.tags.models import TaggedItem
+from .models import Article
+from .repository import ArticleRepository
+
+# Postgres ships no Persian dictionary; "simple" only lowercases, which is
+# what we want once the text below has been normalized.
+SEARCH_CONFIG = "simple"
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<mark>", "</mark>"
+
+# Character folding applied to documents and queries alike: Arabic letter
+# forms to their Persian equivalents, Persian/Arabic digits to ASCII and
+# ZWNJ to a space so that compound words also match on their parts.
+_REPLACEMENTS = {
+    "ي": "ی",  # Arabic yeh -> Persian yeh
+    "ى": "ی",  # Alef maksura -> Persian yeh
+    "ك": "ک",  # Arabic kaf -> Persian keheh
+    "أ": "ا",  # Alef with hamza above -> alef
+    "إ": "ا",  # Alef with hamza below -> alef
+    "ؤ": "و",  # Waw with hamza -> waw
+    "ة": "ه",  # Teh marbuta -> heh
+    "\u200c": " ",  # Zero-width non-joiner
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+}
+# Harakat, superscript alef and tatweel carry no meaning for search
+_REMOVALS = "".join(chr(code) for code in range(0x064B, 0x0660)) + "\u0670\u0640"
+
+_TRANSLATION = str.maketrans({**_REPLACEMENTS, **dict.fromkeys(_REMOVALS)})
+
+
+def normalize_persian(text: str) -> str:
+    return " ".join(text.translate(_TRANSLATION).lower().split())
+
+
+def normalized_sql(expression) -> Func:
+    """Postgres translate() doing the same folding as normalize_persian()."""
+    return Lower(
+        Func(
+            expression,
+            Value("".join(_REPLACEMENTS) + _REMOVALS),
+            Value("".join(_REPLACEMENTS.values())),
+            function="translate",
+        )
+    )
+
+
+def get_documents(article_ids: Iterable[int]) -> Dict[int, Tuple[str, str, str]]:
+    """Normalized (title, tags, body) per article, in two queries."""
+    tags: Dict[int, List[str]] = {}
+    for article_id, tag in TaggedItem.objects.filter(
+        article_id__in=article_ids
+    ).values_list("article_id", "tag__tag"):
+        tags.setdefault(article_id, []).append(tag)
+
+    return {
+        article_id: (
+            normalize_persian(title),
+            normalize_persian(" ".join(tags.get(article_id, []))),
+            normalize_persian(body),
+        )
+        for article_id, title, body in Article.objects.filter(
+            id__in=article_ids
+        ).values_list("id", "title", "body")
+    }
+
+
+class SearchBackendProtocol(Protocol):
+    def index_articles(self, article_ids: Iterable[int]) -> None: ...
+
+    def remove_article(self, article_id: int) -> None: ...
+
+    def search(self, query: str, limit: int) -> List[Article]: ...
+
+
+class PostgresSearchBackend:
+    """
+    Ranked search over the precomputed, GIN-indexed Article.search_vector.
+
+    Title, tags and body are weighted A, B and C respectively.
+    """
+
+    def index_articles(self, article_ids: Iterable[int]) -> None:
+        documents = get_documents(list(article_ids))
+        if not documents:
+            return
+        Article.objects.filter(id__in=documents).update(
+            search_vector=Case(
+                *[
+                    When(
+                        id=article_id,
+                        then=SearchVector(
+                            Value(title), weight="A", config=SEARCH_CONFIG
+                        )
+                        + SearchVector(Value(tags), weight="B", config=SEARCH_CONFIG)
+                        + SearchVector(Value(body), weight="C", config=SEARCH_CONFIG),
+                    )
+                    for article_id, (title, tags, body) in documents.items()
+                ],
+                output_field=SearchVectorField(),
+            )
+        )
+
+    def remove_article(self, article_id: int) -> None:
+        # The vector lives on the article row and goes away with it
+        return None
+
+    def search(self, query: str, limit: int) -> List[Article]:
+        search_query = SearchQuery(
+            normalize_persian(query), config=SEARCH_CONFIG, search_type="websearch"
+        )
+        return list(
+            ArticleRepository()
+            .list_articles_with_relations({"status": Article.Status.PUBLISHED})
+            .filter(search_vector=search_query)
+            .annotate(
+                search_rank=SearchRank(F("search_vector"), search_query),
+                search_headline=SearchHeadline(
+                    normalized_sql("body"),
+                    search_query,
+                    config=SEARCH_CONFIG,
+                    start_sel=HIGHLIGHT_START,
+                    stop_sel=HIGHLIGHT_STOP,
+                    max_words=35,
+                ),
+            )
+            .order_by("-search_rank", "-id")[:limit]
+        )
+
+
+class SQLiteSearchBackend:
+    """
+    FTS5 fallback for local development and tests.
+
+    Documents live in an `article_search` virtual table whose rowid is the
+    article id; migration 0005 creates it on SQLite databases.
+    """
+
+    table = "article_search"
+
+    def index_articles(self, article_ids: Iterable[int]) -> None:
+        documents = get_documents(list(article_ids))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [(article_id,) for article_id in documents],
+            )
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, tags, body) "
+                "VALUES (%s, %s, %s, %s)",
+                [(article_id, *document) for article_id, document in documents.items()],
+            )
+
+    def remove_article(self, article_id: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [article_id])
+
+    def search(self, query: str, limit: int) -> List[Article]:
+        # Quote every term so user input is never parsed as FTS5 syntax
+        terms = normalize_persian(query).replace('"', " ").split()
+        if not terms:
+            return []
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, bm25({self.table}, 10.0, 5.0, 1.0), "
+                f"snippet({self.table}, 2, %s, %s, '...', 35) "
+                f"FROM {self.table} WHERE {self.table} MATCH %s "
+                f"ORDER BY bm25({self.table}, 10.0, 5.0, 1.0) LIMIT %s",
+                [
+                    HIGHLIGHT_START,
+                    HIGHLIGHT_STOP,
+                    " ".join(f'"{term}"' for term in terms),
+                    limit * 2,  # Leaves room for unpublished matches
+                ],
+            )
+            matches = cursor.fetchall()
+
+        articles = ArticleRepository().list_articles_with_relations(
+            {
+                "status": Article.Status.PUBLISHED,
+                "id__in": [article_id for article_id, _, _ in matches],
+            }
+        )
+        by_id = {article.id: article for article in articles}
+        results = []
+        for article_id, score, headline in matches:
+            if article_id in by_id:
+                article = by_id[article_id]
+                # bm25() is lower-is-better; flip it to match SearchRank
+                article.search_rank, article.search_headline = -score, headline
+                results.append(article)
+        return results[:limit]
+
+
+def get_search_backend() -> SearchBackendProtocol:
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return SQLiteSearchBackend()
@@ -1,9 +1,14 @@
 from rest_framework import serializers
 from django.db import transaction
+from django.db.models import Sum
 from core_apps.tags.models import Tag
+from core_apps.reactions.serializers import (
+    LikeStateListSerializer,
+    LikeStateSerializerMixin,
+)
 from django.utils.text import slugify
-from core_apps.comments.models import Comment
 from .models import Article, Author
+from .repository import ArticleRepository
 from django.contrib.auth import get_user_model
 from typing import Any, Dict, List
 
@@ -55,7 +60,7 @@ class ArticleUpdateSerializer(serializers.ModelSerializer):
         )
 
     def get_authors(self, obj: Article) -> List[str]:
-        return list(map(lambda author: author.user.full_name, obj.authors.all()))
+        return list(map(lambda user: user.full_name, obj.authors.all()))
 
     def update(self, instance: Article, validated_data):
         with transaction.atomic():
@@ -66,12 +71,14 @@ class ArticleUpdateSerializer(serializers.ModelSerializer):
             [setattr(instance, key, value) for key, value in validated_data.items()]
             # Dynamically update slug
             [
-                validated_data.update(
-                    {"slug": slugify(validated_data["title"], allow_unicode=True)}
+                (
+                    validated_data.update(
+                        {"slug": slugify(validated_data["title"], allow_unicode=True)}
+                    )
+                    if "title" in validated_data
+                    and validated_data["title"] != instance.title
+                    else None
                 )
-                if "title" in validated_data
-                and validated_data["title"] != instance.title
-                else None
             ]
             instance.save()
 
@@ -85,12 +92,13 @@ class ArticleUpdateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class ArticleListSerializer(serializers.ModelSerializer):
+class ArticleListSerializer(LikeStateSerializerMixin, serializers.ModelSerializer):
     tags = serializers.SerializerMethodField(read_only=True)
     authors = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Article
+        list_serializer_class = LikeStateListSerializer
         fields = (
             "id",
             "title",
@@ -98,21 +106,34 @@ class ArticleListSerializer(serializers.ModelSerializer):
             "authors",
             "status",
             "like_count",
+            "is_liked",
             "updated_at",
         )
 
-    def get_authors(self, obj: Article):
-        return obj.authors.values_list("user__full_name", flat=True)
+    # Read through .all() so rows from list_articles_with_relations() are
+    # served from the prefetch cache instead of one query per article.
+    def get_authors(self, obj: Article) -> List[str]:
+        return [user.full_name for user in obj.authors.all()]
+
+    def get_tags(self, obj: Article) -> List[str]:
+        return [tagged_item.tag.tag for tagged_item in obj.tagged_items.all()]
+
+
+class ArticleSearchSerializer(ArticleListSerializer):
+    search_rank = serializers.FloatField(read_only=True)
+    search_headline = serializers.CharField(read_only=True)
 
-    def get_tags(self, obj: Article):
-        return obj.tagged_items.values_list("tag__tag", flat=True)
+    class Meta(ArticleListSerializer.Meta):
+        fields = ArticleListSerializer.Meta.fields + ("search_rank", "search_headline")
 
 
 class ArticleDetailSerializer(serializers.ModelSerializer):
     tags = serializers.SerializerMethodField(read_only=True)
     authors = serializers.SerializerMethodField(read_only=True)
     comments = serializers.SerializerMethodField(read_only=True)
+    comments_count = serializers.IntegerField(source="comment_count", read_only=True)
     comments_likes = serializers.SerializerMethodField(read_only=True)
+    view_count = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Article
@@ -126,21 +147,51 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
             "status",
             "created_at",
             "comments",
+            "comments_count",
             "like_count",
             "comments_likes",
             "view_count",
         )
 
-    def get_authors(self, obj: Article):
-        return obj.authors.values_list("user__full_name", flat=True)
+    # Values below are precomputed by ArticleRepository.get_article_detail();
+    # the fallbacks keep the serializer usable with a plain Article instance.
+    def get_authors(self, obj: Article) -> List[str]:
+        return [user.full_name for user in obj.authors.all()]
 
-    def get_tags(self, obj: Article):
-        return obj.tagged_items.values_list("tag__tag", flat=True)
+    def get_tags(self, obj: Article) -> List[str]:
+        return [tagged_item.tag.tag for tagged_item in obj.tagged_items.all()]
 
-    def get_comments(self, obj: Article):
-        return obj.comments.values(
-            "id", "title", "body", "user__full_name", "created_at", "updated_at"
-        )
+    def get_comments(self, obj: Article) -> List[Dict[str, Any]]:
+        preview = getattr(obj, "comments_preview", None)
+        if preview is None:
+            preview = ArticleRepository().get_comments_preview(obj)
+        return preview
+
+    def get_comments_likes(self, obj: Article) -> int:
+        likes = getattr(obj, "comments_likes", None)
+        if likes is None:
+            likes = obj.comments.aggregate(total=Sum("like_count"))["total"] or 0
+        return likes
 
-    def get_comments_likes(self, obj: Comment):
-        return sum(comment.like_count for comment in obj.comments.all())
+    def get_view_count(self, obj: Article) -> int:
+        return obj.get_view_count()
+
+
+class ArticleImportRecordSerializer(serializers.Serializer):
+    """One NDJSON line of a bulk import; validated without touching the DB."""
+
+    title = serializers.CharField(max_length=255)
+    slug = serializers.SlugField(max_length=255, allow_unicode=True, required=False)
+    body = serializers.CharField(allow_blank=True, default="")
+    status = serializers.ChoiceField(
+        choices=Article.Status.choices, default=Article.Status.DRAFT
+    )
+    authors = serializers.ListField(
+        child=serializers.CharField(max_length=30), default=list
+    )
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=128), default=list
+    )
+    # Kept when present, e.g. in a file from export_articles
+    created_at = serializers.DateTimeField(required=False)
+    updated_at = serializers.DateTimeField(required=False)
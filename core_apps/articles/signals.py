@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core_apps.tags.models import TaggedItem
+from .models import Article
+from .repository import ArticleRepository
+from .search import get_search_backend
+
+SEARCHABLE_FIELDS = {"title", "body"}
+
+
+def invalidate_on_commit(article_id: int) -> None:
+    # Evicting before commit lets a concurrent read re-cache the old row
+    transaction.on_commit(lambda: ArticleRepository().invalidate_articles([article_id]))
+
+
+@receiver(post_save, sender=Article)
+def index_saved_article(sender, instance, update_fields=None, **kwargs):
+    article_id = instance.id
+    invalidate_on_commit(article_id)
+    if update_fields and not SEARCHABLE_FIELDS.intersection(update_fields):
+        return
+    transaction.on_commit(lambda: get_search_backend().index_articles([article_id]))
+
+
+@receiver(post_delete, sender=Article)
+def remove_deleted_article(sender, instance, **kwargs):
+    # Deletion clears instance.id before the transaction commits
+    article_id = instance.id
+    invalidate_on_commit(article_id)
+    transaction.on_commit(lambda: get_search_backend().remove_article(article_id))
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def reindex_tagged_article(sender, instance, **kwargs):
+    article_id = instance.article_id
+    invalidate_on_commit(article_id)
+    transaction.on_commit(lambda: get_search_backend().index_articles([article_id]))
@@ -0,0 +1,15 @@
+from celery import shared_task
+from loguru import logger
+from . import buffers
+from .repository import ArticleRepository
+
+
+@shared_task
+def flush_article_view_counts() -> int:
+    """Write buffered article views to the database in bulk UPDATEs."""
+    with buffers.view_counts.draining() as pending:
+        if pending:
+            ArticleRepository().add_view_counts(pending)
+    if pending:
+        logger.info(f"Flushed view counts for {len(pending)} articles")
+    return len(pending)
@@ -1,3 +1,306 @@
+import json
+from unittest import mock, skipUnless
+from django.core.cache import cache
 from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.test import APIClient
+from core_apps.comments.models import Comment
+from core_apps.common.buffers import LocalCounterBuffer
+from core_apps.tags.autocomplete import VERSION_CACHE_KEY
+from core_apps.tags.models import Tag, TaggedItem
+from core_apps.tags.repository import TagRepository
+from . import buffers
+from .bulk import ArticleImporter, export_articles_ndjson
+from .models import Article, Author
+from .repository import COMMENTS_PREVIEW_LIMIT, ArticleRepository, article_cache
+from .search import SQLiteSearchBackend, normalize_persian
+from .serializers import ArticleDetailSerializer, ArticleListSerializer
+from .tasks import flush_article_view_counts
 
-# Create your tests here.
+User = get_user_model()
+
+
+class ArticleListQueryCountTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            User.objects.create_user(
+                username=f"writer{i}",
+                email=f"writer{i}@example.com",
+                password="secret-pass-123",
+                first_name="Writer",
+                last_name=str(i),
+            )
+            for i in range(3)
+        ]
+        tags = Tag.objects.bulk_create([Tag(tag=f"tag-{i}") for i in range(4)])
+        articles = Article.objects.bulk_create(
+            [
+                Article(title=f"Article {i}", slug=f"article-{i}", body="body")
+                for i in range(60)
+            ]
+        )
+        Author.objects.bulk_create(
+            [
+                Author(article=article, user=user)
+                for article in articles
+                for user in users[:2]
+            ]
+        )
+        TaggedItem.objects.bulk_create(
+            [
+                TaggedItem(article=article, tag=tag)
+                for article in articles
+                for tag in tags
+            ]
+        )
+
+    def serialize_page(self, page_size: int) -> int:
+        queryset = ArticleRepository().list_articles_with_relations()[:page_size]
+        with CaptureQueriesContext(connection) as queries:
+            data = ArticleListSerializer(queryset, many=True).data
+        self.assertEqual(len(data), page_size)
+        self.assertEqual(len(data[0]["authors"]), 2)
+        self.assertEqual(len(data[0]["tags"]), 4)
+        return len(queries)
+
+    def test_query_count_is_constant_across_page_sizes(self):
+        small_page = self.serialize_page(5)
+        large_page = self.serialize_page(60)
+
+        self.assertEqual(small_page, 3)
+        self.assertEqual(small_page, large_page)
+
+
+class ArticleDetailQueryCountTest(TestCase):
+    COMMENTS = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="reader",
+            email="reader@example.com",
+            password="secret-pass-123",
+            first_name="Avid",
+            last_name="Reader",
+        )
+        cls.article = Article.objects.create(title="Detailed", slug="detailed")
+        Author.objects.create(article=cls.article, user=cls.user)
+        TaggedItem.objects.create(article=cls.article, tag=Tag.objects.create(tag="x"))
+        for i in range(cls.COMMENTS):
+            cls.article.add_comment(user=cls.user, title=f"Comment {i}", body="body")
+        Comment.objects.update(like_count=2)
+
+    def setUp(self):
+        patcher = mock.patch.object(buffers, "view_counts", LocalCounterBuffer())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Warm the content type cache so it does not count against the page
+        ContentType.objects.get_for_model(Article)
+
+    def test_detail_costs_a_fixed_number_of_queries(self):
+        # Article with aggregates, authors, tagged items, comments preview
+        with self.assertNumQueries(4):
+            article = ArticleRepository().get_article_detail(self.article.id)
+            data = ArticleDetailSerializer(article).data
+
+        self.assertEqual(len(data["comments"]), COMMENTS_PREVIEW_LIMIT)
+        self.assertEqual(data["comments_count"], self.COMMENTS)
+        self.assertEqual(data["comments_likes"], 2 * self.COMMENTS)
+        self.assertEqual(data["authors"], ["Avid Reader"])
+        self.assertEqual(data["comments"][0]["user_full_name"], "Avid Reader")
+
+    def test_comments_preview_is_one_bounded_query(self):
+        with self.assertNumQueries(1):
+            preview = ArticleRepository().get_comments_preview(self.article, limit=5)
+        self.assertEqual(len(preview), 5)
+
+
+class ViewCountBufferTest(TestCase):
+    VIEWS = 10_000
+
+    def setUp(self):
+        self.article = Article.objects.create(title="Busy", slug="busy")
+        patcher = mock.patch.object(buffers, "view_counts", LocalCounterBuffer())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_views_are_written_in_bulk(self):
+        # The previous UPDATE + refresh_from_db() path cost 2 * VIEWS queries
+        with CaptureQueriesContext(connection) as views:
+            for _ in range(self.VIEWS):
+                self.article.increment_view_count()
+        self.assertEqual(len(views), 0)
+        self.assertEqual(self.article.get_view_count(), self.VIEWS)
+
+        with CaptureQueriesContext(connection) as flush:
+            flush_article_view_counts()
+        writes = [
+            query
+            for query in flush.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(writes), 1)
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.view_count, self.VIEWS)
+        self.assertEqual(self.article.get_view_count(), self.VIEWS)
+
+
+class ArticleDetailCacheTest(TestCase):
+    def setUp(self):
+        # Rolled-back articles from other tests reuse these ids
+        cache.clear()
+        article_cache.local.clear()
+        self.article = Article.objects.create(
+            title="Cached", slug="cached", status=Article.Status.PUBLISHED
+        )
+        patcher = mock.patch.object(buffers, "view_counts", LocalCounterBuffer())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.url = f"/api/v1/articles/{self.article.id}/"
+
+    def test_hits_skip_queries_and_serialization(self):
+        first = self.client.get(self.url).json()
+        with self.assertNumQueries(0), mock.patch.object(
+            ArticleDetailSerializer, "to_representation"
+        ) as serialize:
+            second = self.client.get(self.url).json()
+        serialize.assert_not_called()
+
+        self.assertEqual(first["view_count"], 1)
+        self.assertEqual(second, {**first, "view_count": 2})
+
+    def test_non_numeric_pk_is_not_found(self):
+        self.assertEqual(self.client.get("/api/v1/articles/abc/").status_code, 404)
+
+    def test_padded_pk_shares_the_cached_detail(self):
+        padded = f"/api/v1/articles/0{self.article.id}/"
+        self.assertEqual(self.client.get(padded).status_code, 200)
+
+        self.article.status = Article.Status.DRAFT
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.save()
+
+        self.assertEqual(self.client.get(padded).status_code, 404)
+
+    def test_saves_and_view_flushes_invalidate_the_detail(self):
+        self.client.get(self.url)
+        self.article.title = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.save()
+            # Evicted only once the save has committed
+            self.assertEqual(self.client.get(self.url).json()["title"], "Cached")
+        self.assertEqual(self.client.get(self.url).json()["title"], "Renamed")
+
+        # Three stored views plus this one, still buffered
+        flush_article_view_counts()
+        self.assertEqual(self.client.get(self.url).json()["view_count"], 4)
+
+
+@skipUnless(connection.vendor == "sqlite", "Exercises the SQLite FTS5 backend")
+class ArticleSearchTest(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.match = Article.objects.create(
+                title="آموزش جنگو",
+                slug="django-intro",
+                body="راهنمای كامل برای يادگیری جنگو",  # Arabic kaf and yeh
+                status=Article.Status.PUBLISHED,
+            )
+            Article.objects.create(
+                title="Draft about Django",
+                slug="draft",
+                body="یادگیری",
+                status=Article.Status.DRAFT,
+            )
+
+    def test_normalize_persian_folds_arabic_forms_and_digits(self):
+        self.assertEqual(normalize_persian("كتابي\u200cها ۱۲"), "کتابی ها 12")
+
+    def test_search_matches_normalized_text_and_highlights(self):
+        results = SQLiteSearchBackend().search("یادگیری", limit=10)
+
+        self.assertEqual([article.id for article in results], [self.match.id])
+        self.assertIn("<mark>یادگیری</mark>", results[0].search_headline)
+
+
+class ArticleBulkTransferTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(
+            username="writer",
+            email="writer@example.com",
+            password="secret-pass-123",
+            first_name="Writer",
+            last_name="One",
+        )
+        Tag.objects.create(tag="python")
+        Article.objects.create(title="Existing", slug="existing")
+
+    def records(self, count: int):
+        for i in range(count):
+            yield json.dumps(
+                {
+                    "title": f"Imported {i}",
+                    "body": "body",
+                    "status": "published",
+                    "authors": ["writer"],
+                    "tags": ["python", f"tag-{i % 3}"],
+                }
+            )
+
+    def test_import_runs_a_fixed_number_of_queries_per_chunk(self):
+        ghost = json.dumps({"title": "Ghost", "authors": ["writer", "ghost"]})
+        lines = [*self.records(50), '{"title": "Existing"}', "not json", "{}", ghost]
+        with CaptureQueriesContext(connection) as queries:
+            result = ArticleImporter(chunk_size=100).run(lines)
+
+        self.assertEqual(result["created"], 50)
+        self.assertEqual(result["skipped"], 1)
+        self.assertEqual([e["line"] for e in result["errors"]], [52, 53, 54])
+        self.assertEqual(
+            result["errors"][2]["errors"], {"authors": ["Unknown users: ghost"]}
+        )
+        self.assertFalse(Article.objects.filter(title="Ghost").exists())
+        self.assertLess(len(queries), 15)
+        self.assertEqual(Author.objects.filter(user__username="writer").count(), 50)
+        counts = dict(Tag.objects.values_list("tag", "article_count"))
+        self.assertEqual(counts["python"], 50)
+        self.assertEqual(counts["tag-0"], 17)
+
+    def test_import_keeps_timestamps_and_refreshes_tag_caches(self):
+        record = {
+            "title": "Archived",
+            "tags": ["python"],
+            "created_at": "2020-01-02T03:04:05Z",
+            "updated_at": "2021-01-02T03:04:05Z",
+        }
+        suggestions_version = cache.get(VERSION_CACHE_KEY, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            ArticleImporter().run([json.dumps(record), *self.records(1)])
+
+        archived = Article.objects.get(title="Archived")
+        self.assertEqual(archived.created_at.isoformat(), "2020-01-02T03:04:05+00:00")
+        self.assertEqual(archived.updated_at.isoformat(), "2021-01-02T03:04:05+00:00")
+        self.assertGreater(
+            Article.objects.get(title="Imported 0").created_at, archived.updated_at
+        )
+        self.assertEqual(cache.get(VERSION_CACHE_KEY), suggestions_version + 1)
+        # The archived draft is tagged but not counted
+        self.assertEqual(
+            TagRepository().popular_tags(1), [{"tag": "python", "article_count": 1}]
+        )
+
+    def test_export_round_trips_authors_and_tags(self):
+        ArticleImporter().run(self.records(3))
+        exported = [json.loads(line) for line in export_articles_ndjson(chunk_size=2)]
+
+        self.assertEqual(len(exported), 4)
+        self.assertEqual(exported[1]["title"], "Imported 0")
+        self.assertEqual(exported[1]["authors"], ["writer"])
+        self.assertCountEqual(exported[1]["tags"], ["python", "tag-0"])
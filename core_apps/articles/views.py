@@ -1,3 +1,126 @@
-from django.shortcuts import render
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly
+from rest_framework.request import Request
+from rest_framework.response import Response
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from typing import Optional
+from core_apps.common.pagination import KeysetPagination
+from . import buffers
+from .bulk import ArticleImporter, export_articles_ndjson
+from .models import Article
+from .repository import ArticleRepository
+from .search import get_search_backend
+from .serializers import (
+    ArticleDetailSerializer,
+    ArticleListSerializer,
+    ArticleSearchSerializer,
+)
 
-# Create your views here.
+
+class ArticleViewSet(
+    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+    # Other pks 404 at routing instead of failing in the article id lookup
+    lookup_value_regex = r"\d+"
+    repository = ArticleRepository()
+
+    def get_queryset(self):
+        return self.repository.list_articles_with_relations(
+            {"status": Article.Status.PUBLISHED}
+        )
+
+    def get_serializer_class(self):
+        if self.action == "retrieve":
+            return ArticleDetailSerializer
+        if self.action == "search":
+            return ArticleSearchSerializer
+        return ArticleListSerializer
+
+    def retrieve(self, request: Request, pk: Optional[int] = None) -> Response:
+        """
+        Get a published article with its comment preview.
+
+        Args:
+            request: The request object
+            pk: The article ID
+
+        Returns:
+            Response: Article detail data
+        """
+        data = self.repository.get_article_detail_data(
+            int(pk), lambda article: self.get_serializer(article).data
+        )
+        if data is None or data["status"] != Article.Status.PUBLISHED:
+            raise NotFound(_("Article not found."))
+
+        buffers.view_counts.increment(data["id"])
+        pending = buffers.view_counts.pending(data["id"])
+        return Response({**data, "view_count": data["view_count"] + pending})
+
+    @action(methods=["GET"], detail=False)
+    def search(self, request: Request) -> Response:
+        """
+        Full-text search over published articles, best match first.
+
+        Args:
+            request: The request object with the `q` query param
+
+        Returns:
+            Response: Ranked articles with a highlighted body excerpt
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": _("This field is required.")})
+
+        articles = get_search_backend().search(
+            query, self.paginator.get_page_size(request)
+        )
+        serializer = self.get_serializer(articles, many=True)
+        return Response({"results": serializer.data})
+
+    @action(methods=["GET"], detail=False, permission_classes=[IsAdminUser])
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """
+        Stream every article with its authors and tags as NDJSON.
+
+        Args:
+            request: The request object
+
+        Returns:
+            StreamingHttpResponse: One JSON document per line
+        """
+        response = StreamingHttpResponse(
+            export_articles_ndjson(), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = 'attachment; filename="articles.ndjson"'
+        return response
+
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="import",
+        permission_classes=[IsAdminUser],
+        parser_classes=[MultiPartParser],
+    )
+    def import_articles(self, request: Request) -> Response:
+        """
+        Bulk import articles from an uploaded NDJSON file.
+
+        Args:
+            request: The request object with the file in `file`
+
+        Returns:
+            Response: Created and skipped counts with per-line errors
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": _("This field is required.")})
+
+        result = ArticleImporter().run(upload)
+        return Response(result, status=status.HTTP_201_CREATED)
@@ -1,8 +1,87 @@
 from rest_framework import serializers
+from django.contrib.contenttypes.models import ContentType
+from django.utils.translation import gettext_lazy as _
+from core_apps.reactions.serializers import (
+    LikeStateListSerializer,
+    LikeStateSerializerMixin,
+)
 from .models import Comment
+from .repository import get_commentable_models
+from .tree import MAX_DEPTH
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(LikeStateSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Comment
-        fields = ["id", "author", "text", "created_at", "updated_at"]
+        list_serializer_class = LikeStateListSerializer
+        fields = [
+            "id",
+            "user",
+            "title",
+            "body",
+            "parent",
+            "depth",
+            "like_count",
+            "is_liked",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class CommentTargetSerializer(serializers.Serializer):
+    """Resolves `target` (a model label) and `object_id` to the commented object."""
+
+    target = serializers.ChoiceField(choices=[])
+    object_id = serializers.IntegerField(min_value=1)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["target"].choices = list(get_commentable_models())
+
+    def validate(self, attrs):
+        model = get_commentable_models()[attrs["target"]]
+        obj = model._default_manager.filter(pk=attrs["object_id"]).only("pk").first()
+        if obj is None:
+            raise serializers.ValidationError({"object_id": _("Object not found.")})
+        attrs["content_object"] = obj
+        return attrs
+
+
+class ThreadLimitsSerializer(serializers.Serializer):
+    replies_limit = serializers.IntegerField(min_value=1, max_value=100, required=False)
+    max_depth = serializers.IntegerField(
+        min_value=0, max_value=MAX_DEPTH, required=False
+    )
+
+
+class CommentThreadQuerySerializer(CommentTargetSerializer, ThreadLimitsSerializer):
+    pass
+
+
+class CommentCreateSerializer(CommentTargetSerializer):
+    title = serializers.CharField(max_length=200)
+    body = serializers.CharField()
+    parent = serializers.PrimaryKeyRelatedField(
+        queryset=Comment.objects.only(
+            "id", "content_type", "object_id", "path", "depth"
+        ),
+        required=False,
+        allow_null=True,
+    )
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        parent = attrs.get("parent")
+        if parent is None:
+            return attrs
+        obj = attrs["content_object"]
+        content_type = ContentType.objects.get_for_model(obj)
+        if (parent.content_type_id, parent.object_id) != (content_type.id, obj.pk):
+            raise serializers.ValidationError(
+                {"parent": _("Replies must be posted on the parent's object.")}
+            )
+        if parent.depth >= MAX_DEPTH:
+            raise serializers.ValidationError(
+                {"parent": _("This thread cannot be nested any deeper.")}
+            )
+        return attrs
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.9 on 2026-10-18 16:36
+
+from django.db import migrations, models
+
+from core_apps.comments.tree import make_path
+
+
+def backfill_paths(apps, schema_editor):
+    Comment = apps.get_model("comments", "Comment")
+    # Replies always have a larger id than their parent, so walking by id
+    # sees every parent first
+    seen = {}
+    batch = []
+    for comment in Comment.objects.only("id", "parent_id").order_by("id").iterator():
+        parent_path, parent_depth = seen.get(comment.parent_id, (None, -1))
+        comment.path = make_path(parent_path, comment.id)
+        comment.depth = parent_depth + 1
+        seen[comment.id] = (comment.path, comment.depth)
+        batch.append(comment)
+        if len(batch) == 1000:
+            Comment.objects.bulk_update(batch, ["path", "depth"])
+            batch = []
+    Comment.objects.bulk_update(batch, ["path", "depth"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0002_comment_created_at_id_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["path"],
+                name="comment_path_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+    ]
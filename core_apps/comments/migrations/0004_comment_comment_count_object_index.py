@@ -0,0 +1,51 @@
+# Generated by Django 4.2.9 on 2026-10-18 16:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_count(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Comment = apps.get_model("comments", "Comment")
+    content_type = ContentType.objects.filter(
+        app_label="comments", model="comment"
+    ).first()
+    if content_type is None:
+        # Fresh database: no replies exist yet
+        return
+    counts = (
+        Comment.objects.filter(content_type=content_type, object_id=OuterRef("pk"))
+        .values("object_id")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Comment.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0003_comment_path_depth"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="comment",
+            name="comment_content_3076b0_idx",
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["content_type", "object_id", "created_at", "id"],
+                name="comment_content_489d0a_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,16 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 from core_apps.common.models import CommentableMixin
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from .tree import MAX_DEPTH, PATH_MAX_LENGTH, make_path
 
 User = get_user_model()
 
 
-class Comment(models.Model, CommentableMixin):
+class Comment(CommentableMixin, models.Model):
     title = models.CharField(max_length=200)
     body = models.TextField(editable=True)
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
@@ -22,6 +24,9 @@ class Comment(models.Model, CommentableMixin):
     parent = models.ForeignKey(
         "self", on_delete=models.CASCADE, null=True, blank=True, related_name="replies"
     )
+    # Materialized path of zero-padded ancestor ids, see comments.tree
+    path = models.CharField(max_length=PATH_MAX_LENGTH, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     like_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -31,14 +36,41 @@ class Comment(models.Model, CommentableMixin):
         verbose_name = _("Comment")
         verbose_name_plural = _("Comments")
         ordering = ["-created_at"]
-        indexes = models.Index(fields=["content_type", "object_id"])
+        indexes = [
+            # Backs per-object listing newest first, see CommentViewSet
+            models.Index(fields=["content_type", "object_id", "created_at", "id"]),
+            # Backs keyset pagination over (created_at, id)
+            models.Index(fields=["created_at", "id"]),
+            # Subtree lookups are prefix matches on path
+            models.Index(
+                fields=["path"],
+                name="comment_path_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
 
-    def get_like_count(self):
-        from django.contrib.contenttypes.models import ContentType
-        from core_apps.reactions.models import Like
+    def save(self, *args, **kwargs) -> None:
+        if self.pk is not None:
+            return super().save(*args, **kwargs)
 
-        content_type = ContentType.objects.get_for_model(self)
-        return Like.objects.filter(content_type=content_type, object_id=self.id).count()
+        parent_path = None
+        if self.parent_id is not None:
+            parent_path, self.depth = self.parent.path, self.parent.depth + 1
+            if self.depth > MAX_DEPTH:
+                raise ValidationError(
+                    _("Replies cannot be nested more than %(max)d levels deep."),
+                    params={"max": MAX_DEPTH},
+                )
+
+        # The path ends with our own id, which only exists after the insert
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.path = make_path(parent_path, self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
+
+    def get_like_count(self) -> int:
+        # Maintained by core_apps.reactions.repositories.LikeRepository
+        return self.like_count
 
     def __str__(self) -> str:
         return f"Comment by {self.author.username} on {self.article.title}"
@@ -1,10 +1,47 @@
-from typing import Optional, List, Dict, Any, QuerySet, Protocol
+from typing import Optional, List, Dict, Any, Protocol, Type
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import (
+    BigIntegerField,
+    Count,
+    F,
+    Model,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Value,
+    Window,
+)
+from django.db.models.functions import Coalesce, Concat, RowNumber
 from .models import Comment
+from .tree import build_tree
 from loguru import logger
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+THREAD_FIELDS = (
+    "id",
+    "parent_id",
+    "depth",
+    "title",
+    "body",
+    "user_id",
+    "user_full_name",
+    "like_count",
+    "reply_count",
+    "created_at",
+    "updated_at",
+)
+
+
+def get_commentable_models() -> Dict[str, Type[Model]]:
+    """Models comments can be posted on, keyed by label (`articles.article`)."""
+    return {
+        model._meta.label_lower: model
+        for model in (apps.get_model("articles", "Article"),)
+    }
+
 
 class CommentRepositoryProtocol(Protocol):
     def get_author_profile(self) -> User: ...
@@ -17,13 +54,29 @@ class CommentRepositoryProtocol(Protocol):
 
     def delete_article(self, article: Comment) -> bool: ...
 
+    def list_for_object(self, obj: Model) -> QuerySet[Comment]: ...
+
+    def get_thread(
+        self,
+        obj: Model,
+        replies_limit: Optional[int] = None,
+        max_depth: Optional[int] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    def get_subtree(
+        self,
+        comment: Comment,
+        replies_limit: Optional[int] = None,
+        max_depth: Optional[int] = None,
+    ) -> List[Dict[str, Any]]: ...
+
 
 class CommentRepository:
     def get_author_profile(self, user: User) -> User:
         return Comment.objects.get(user=user)
 
     def create_comment(self, data: Dict[str, Any], user: User) -> Comment:
-        return Comment.objects.create(**data)
+        return Comment.objects.create(user=user, **data)
 
     def update_comment(self, article: Comment, data: Dict[str, Any]) -> Comment:
         try:
@@ -52,3 +105,73 @@ class CommentRepository:
                 f"Article delete error: {e}"
             )  # Log the error message to the console
             return False
+
+    def list_for_object(self, obj: Model) -> QuerySet[Comment]:
+        # Stays within the (content_type, object_id, created_at, id) index
+        return Comment.objects.filter(
+            content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk
+        )
+
+    def get_thread(
+        self,
+        obj: Model,
+        replies_limit: Optional[int] = None,
+        max_depth: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Every comment on `obj` as nested dicts, fetched in one query.
+
+        `replies_limit` keeps the oldest N replies under each comment and
+        `max_depth` cuts the tree below that depth; every node still reports
+        its full `reply_count` so clients can fetch the rest as a subtree.
+        """
+        comments = self.list_for_object(obj)
+        if max_depth is not None:
+            comments = comments.filter(depth__lte=max_depth)
+        return self._fetch_tree(comments, replies_limit)
+
+    def get_subtree(
+        self,
+        comment: Comment,
+        replies_limit: Optional[int] = None,
+        max_depth: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """`comment` and its descendants as a one-element nested list."""
+        comments = Comment.objects.filter(path__startswith=comment.path)
+        if max_depth is not None:
+            comments = comments.filter(depth__lte=comment.depth + max_depth)
+        return self._fetch_tree(comments, replies_limit)
+
+    def _fetch_tree(
+        self, comments: QuerySet[Comment], replies_limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        comments = comments.annotate(
+            user_full_name=Concat("user__first_name", Value(" "), "user__last_name"),
+            reply_count=Coalesce(
+                Subquery(
+                    Comment.objects.filter(parent=OuterRef("pk"))
+                    .order_by()
+                    .values("parent")
+                    .annotate(count=Count("id"))
+                    .values("count")
+                ),
+                0,
+            ),
+        )
+        if replies_limit is not None:
+            comments = comments.annotate(
+                reply_rank=Window(
+                    RowNumber(),
+                    # Roots get a partition of their own so only replies are cut
+                    partition_by=[
+                        Coalesce(
+                            "parent_id",
+                            Value(0) - F("id"),
+                            output_field=BigIntegerField(),
+                        )
+                    ],
+                    order_by=[F("created_at").asc(), F("id").asc()],
+                )
+            ).filter(reply_rank__lte=replies_limit)
+
+        return build_tree(comments.order_by("path").values(*THREAD_FIELDS))
@@ -0,0 +1,28 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core_apps.common.models import CommentableMixin
+from .models import Comment
+
+
+def _commented_objects(comment: Comment):
+    # get_for_id() is served from the content type cache
+    model = ContentType.objects.get_for_id(comment.content_type_id).model_class()
+    if model is None or not issubclass(model, CommentableMixin):
+        return None
+    return model._default_manager.filter(pk=comment.object_id)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    objects = _commented_objects(instance) if created else None
+    if objects is not None:
+        objects.update(comment_count=F("comment_count") + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    objects = _commented_objects(instance)
+    if objects is not None:
+        objects.filter(comment_count__gt=0).update(comment_count=F("comment_count") - 1)
@@ -1,3 +1,155 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from rest_framework.test import APIClient
+from core_apps.articles.models import Article
+from .models import Comment
+from .repository import CommentRepository
+from .tree import MAX_DEPTH
 
-# Create your tests here.
+User = get_user_model()
+
+
+class CommentTreeTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="reader",
+            email="reader@example.com",
+            password="secret-pass-123",
+            first_name="Avid",
+            last_name="Reader",
+        )
+        cls.article = Article.objects.create(title="Threads", slug="threads")
+
+        def reply(parent=None, title="comment"):
+            return cls.article.add_comment(cls.user, title, "body", parent=parent)
+
+        cls.first = reply(title="first")
+        cls.second = reply(title="second")
+        cls.replies = [reply(cls.first, f"reply {i}") for i in range(4)]
+        cls.nested = reply(cls.replies[0], "nested")
+        cls.deeper = reply(cls.nested, "deeper")
+
+    def titles(self, nodes):
+        return [(node["title"], self.titles(node["replies"])) for node in nodes]
+
+    def test_path_and_depth_follow_the_parent(self):
+        self.deeper.refresh_from_db()
+        self.assertEqual(self.deeper.depth, 3)
+        self.assertTrue(self.deeper.path.startswith(self.nested.path))
+        self.assertTrue(self.nested.path.startswith(self.first.path))
+
+    def test_thread_is_fetched_in_one_query_and_nested(self):
+        # The content type is already cached by add_comment()
+        with self.assertNumQueries(1):
+            thread = CommentRepository().get_thread(self.article)
+
+        self.assertEqual(
+            self.titles(thread),
+            [
+                (
+                    "first",
+                    [
+                        ("reply 0", [("nested", [("deeper", [])])]),
+                        ("reply 1", []),
+                        ("reply 2", []),
+                        ("reply 3", []),
+                    ],
+                ),
+                ("second", []),
+            ],
+        )
+        self.assertEqual(thread[0]["user_full_name"], "Avid Reader")
+
+    def test_replies_limit_and_max_depth_keep_full_reply_counts(self):
+        thread = CommentRepository().get_thread(
+            self.article, replies_limit=2, max_depth=1
+        )
+
+        self.assertEqual(
+            self.titles(thread),
+            [("first", [("reply 0", []), ("reply 1", [])]), ("second", [])],
+        )
+        self.assertEqual(thread[0]["reply_count"], 4)
+        self.assertEqual(thread[0]["replies"][0]["reply_count"], 1)
+
+    def test_subtree_starts_at_the_given_comment(self):
+        subtree = CommentRepository().get_subtree(self.replies[0])
+        self.assertEqual(
+            self.titles(subtree), [("reply 0", [("nested", [("deeper", [])])])]
+        )
+
+    def test_nesting_is_capped(self):
+        comment = self.deeper
+        for _ in range(MAX_DEPTH - comment.depth):
+            comment = self.article.add_comment(self.user, "deep", "body", comment)
+        with self.assertRaises(ValidationError):
+            self.article.add_comment(self.user, "too deep", "body", comment)
+
+
+class CommentApiTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="writer",
+            email="writer@example.com",
+            password="secret-pass-123",
+        )
+        cls.article = Article.objects.create(title="Counted", slug="counted")
+        cls.other = Article.objects.create(title="Other", slug="other")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.target = {"target": "articles.article", "object_id": self.article.id}
+
+    def post(self, **data):
+        self.client.force_authenticate(self.user)
+        return self.client.post(
+            "/api/v1/comments/",
+            {**self.target, "title": "t", "body": "b", **data},
+            format="json",
+        )
+
+    def test_comment_count_follows_creates_and_deletes(self):
+        first = self.post().json()
+        self.post(parent=first["id"])
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comment_count, 2)
+
+        Comment.objects.get(id=first["id"]).delete()  # Cascades to the reply
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comment_count, 0)
+
+    def test_listing_is_cursor_paginated_per_object(self):
+        for _ in range(5):
+            self.post()
+        self.other.add_comment(self.user, "elsewhere", "body")
+
+        first = self.client.get(
+            "/api/v1/comments/", {**self.target, "page_size": 3}
+        ).json()
+        second = self.client.get(first["next"]).json()
+
+        ids = [c["id"] for c in first["results"] + second["results"]]
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertIsNone(second["next"])
+
+    def test_replies_must_stay_on_the_parent_object(self):
+        parent = self.other.add_comment(self.user, "elsewhere", "body")
+        response = self.post(parent=parent.id)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("parent", response.json())
+
+    def test_thread_and_replies_endpoints_nest_comments(self):
+        root = self.post().json()
+        self.post(parent=root["id"])
+
+        thread = self.client.get("/api/v1/comments/thread/", self.target).json()
+        self.assertEqual(len(thread["results"]), 1)
+        self.assertEqual(thread["results"][0]["reply_count"], 1)
+
+        subtree = self.client.get(f"/api/v1/comments/{root['id']}/replies/").json()
+        self.assertEqual(subtree["id"], root["id"])
+        self.assertEqual(len(subtree["replies"]), 1)
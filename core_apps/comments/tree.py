@@ -0,0 +1,37 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+# Each level of Comment.path is the comment id, zero-padded to PATH_STEP
+# digits, so sorting by path yields a depth-first walk with replies in
+# creation order.
+PATH_STEP = 12
+PATH_MAX_LENGTH = 255
+MAX_DEPTH = PATH_MAX_LENGTH // PATH_STEP - 1
+
+
+def make_path(parent_path: Optional[str], comment_id: int) -> str:
+    return (parent_path or "") + str(comment_id).zfill(PATH_STEP)
+
+
+def build_tree(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Nest comment dicts ordered by path into `replies` lists in one pass.
+
+    Rows whose parent is not in the result (cut by a depth or reply limit)
+    are dropped together with their descendants; the shallowest rows left
+    become the roots.
+    """
+    nodes: Dict[int, Dict[str, Any]] = {}
+    roots: List[Dict[str, Any]] = []
+    root_depth = None
+    for row in rows:
+        row["replies"] = []
+        if root_depth is None:
+            root_depth = row["depth"]
+        if row["depth"] == root_depth:
+            roots.append(row)
+        elif row["parent_id"] in nodes:
+            nodes[row["parent_id"]]["replies"].append(row)
+        else:
+            continue
+        nodes[row["id"]] = row
+    return roots
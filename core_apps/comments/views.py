@@ -1,3 +1,116 @@
-from django.shortcuts import render
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.request import Request
+from rest_framework.response import Response
+from typing import Optional
+from core_apps.common.pagination import KeysetPagination
+from .models import Comment
+from .repository import CommentRepository
+from .Serializers import (
+    CommentCreateSerializer,
+    CommentSerializer,
+    CommentTargetSerializer,
+    CommentThreadQuerySerializer,
+    ThreadLimitsSerializer,
+)
 
-# Create your views here.
+
+class CommentViewSet(viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+    serializer_class = CommentSerializer
+    repository = CommentRepository()
+
+    def get_queryset(self):
+        return Comment.objects.all()
+
+    def list(self, request: Request) -> Response:
+        """
+        List the comments on an object, newest first.
+
+        Args:
+            request: The request object with `target` (e.g. `articles.article`)
+                and `object_id` query params
+
+        Returns:
+            Response: A page of comments and the cursor link to the next one
+        """
+        target = CommentTargetSerializer(data=request.query_params)
+        target.is_valid(raise_exception=True)
+        comments = self.repository.list_for_object(
+            target.validated_data["content_object"]
+        )
+        page = self.paginate_queryset(comments)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    def create(self, request: Request) -> Response:
+        """
+        Comment on an object or reply to one of its comments.
+
+        Args:
+            request: The request object with `target`, `object_id`, `title`,
+                `body` and an optional `parent`
+
+        Returns:
+            Response: The created comment
+        """
+        serializer = CommentCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        comment = self.repository.create_comment(
+            {
+                "content_object": data["content_object"],
+                "title": data["title"],
+                "body": data["body"],
+                "parent": data.get("parent"),
+            },
+            request.user,
+        )
+        return Response(
+            self.get_serializer(comment).data, status=status.HTTP_201_CREATED
+        )
+
+    @action(methods=["GET"], detail=False)
+    def thread(self, request: Request) -> Response:
+        """
+        Get every comment on an object as a nested tree.
+
+        Args:
+            request: The request object with `target` and `object_id`, plus
+                optional `replies_limit` and `max_depth` query params
+
+        Returns:
+            Response: Top-level comments with their nested `replies`
+        """
+        query = CommentThreadQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        thread = self.repository.get_thread(
+            query.validated_data["content_object"],
+            replies_limit=query.validated_data.get("replies_limit"),
+            max_depth=query.validated_data.get("max_depth"),
+        )
+        return Response({"results": thread})
+
+    @action(methods=["GET"], detail=True)
+    def replies(self, request: Request, pk: Optional[int] = None) -> Response:
+        """
+        Get a comment and its replies as a nested tree.
+
+        Args:
+            request: The request object with optional `replies_limit` and
+                `max_depth` query params
+            pk: The comment ID
+
+        Returns:
+            Response: The comment with its nested `replies`
+        """
+        query = ThreadLimitsSerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        comment = self.get_object()
+        subtree = self.repository.get_subtree(
+            comment,
+            replies_limit=query.validated_data.get("replies_limit"),
+            max_depth=query.validated_data.get("max_depth"),
+        )
+        return Response(subtree[0])
@@ -0,0 +1,249 @@
+import threading
+from abc import ABC, abstractmethod
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Protocol
+from django.conf import settings
+from django.core.cache import cache
+from loguru import logger
+
+
+class CounterBufferProtocol(Protocol):
+    def increment(self, object_id: int, amount: int = 1) -> None: ...
+
+    def pending(self, object_id: int) -> int: ...
+
+    def pending_many(self, object_ids: Iterable[int]) -> Dict[int, int]: ...
+
+    def draining(self) -> Iterator[Dict[int, int]]: ...
+
+
+class TimestampBufferProtocol(Protocol):
+    def record(self, object_id: int, timestamp: float) -> None: ...
+
+    def pending(self, object_id: int) -> float: ...
+
+    def draining(self) -> Iterator[Dict[int, float]]: ...
+
+
+class LocalCounterBuffer:
+    """Per-process buffer, used when the default cache is not Redis."""
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def increment(self, object_id: int, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[object_id] += amount
+
+    def pending(self, object_id: int) -> int:
+        return self._counts.get(object_id, 0)
+
+    def pending_many(self, object_ids: Iterable[int]) -> Dict[int, int]:
+        return {object_id: self._counts.get(object_id, 0) for object_id in object_ids}
+
+    @contextmanager
+    def draining(self) -> Iterator[Dict[int, int]]:
+        with self._lock:
+            drained, self._counts = dict(self._counts), Counter()
+        try:
+            yield drained
+        except Exception:
+            # Put the increments back so the next flush retries them
+            with self._lock:
+                self._counts.update(drained)
+            raise
+
+
+class LocalTimestampBuffer:
+    """
+    Per-process buffer of the latest timestamp per object, used when the
+    default cache is not Redis.
+    """
+
+    def __init__(self):
+        self._stamps: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, object_id: int, timestamp: float) -> None:
+        with self._lock:
+            self._stamps[object_id] = max(timestamp, self._stamps.get(object_id, 0))
+
+    def pending(self, object_id: int) -> float:
+        return self._stamps.get(object_id, 0.0)
+
+    @contextmanager
+    def draining(self) -> Iterator[Dict[int, float]]:
+        with self._lock:
+            drained, self._stamps = self._stamps, {}
+        try:
+            yield drained
+        except Exception:
+            # Put them back, unless a newer timestamp came in meanwhile
+            with self._lock:
+                for object_id, timestamp in drained.items():
+                    self._stamps[object_id] = max(
+                        timestamp, self._stamps.get(object_id, 0)
+                    )
+            raise
+
+
+# A flush lock outliving its holder (a crashed worker) expires after this
+FLUSH_LOCK_TIMEOUT = 60
+
+# Read and delete a hash in one step, so each buffered value is handed to
+# exactly one flush
+TAKE_HASH_SCRIPT = """
+local values = redis.call("HGETALL", KEYS[1])
+redis.call("DEL", KEYS[1])
+return values
+"""
+
+
+class RedisHashBuffer(ABC):
+    """
+    Buffer kept in a Redis hash, shared by every worker.
+
+    A flush takes the hash atomically, so new writes start a fresh one and
+    a value can never be applied twice; if the caller's bulk write raises,
+    the values are put back. A worker killed mid-flush loses its batch.
+    Flushes hold a lock, so only one runs at a time.
+    """
+
+    def __init__(self, name: str, parse: Callable[[bytes], float]):
+        self.key = cache.make_key(f"buffer:{name}")
+        self.lock_key = f"buffer:{name}:flush_lock"
+        self.parse = parse
+        self._take_script = None
+
+    @property
+    def connection(self):
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    def take(self) -> Dict[int, float]:
+        if self._take_script is None:
+            self._take_script = self.connection.register_script(TAKE_HASH_SCRIPT)
+        values = self._take_script(keys=[self.key])
+        return {
+            int(values[i]): self.parse(values[i + 1]) for i in range(0, len(values), 2)
+        }
+
+    @abstractmethod
+    def restore(self, drained: Dict[int, float]) -> None:
+        """Put back values taken by a flush whose write failed."""
+
+    @contextmanager
+    def draining(self) -> Iterator[Dict[int, float]]:
+        token = uuid.uuid4().hex
+        if not cache.add(self.lock_key, token, timeout=FLUSH_LOCK_TIMEOUT):
+            logger.info(f"Skipping flush of {self.key}: another one is running")
+            yield {}
+            return
+        try:
+            drained = self.take()
+            try:
+                yield drained
+            except Exception:
+                if drained:
+                    self.restore(drained)
+                raise
+        finally:
+            # Only drop our own lock; it may have expired and been retaken
+            if cache.get(self.lock_key) == token:
+                cache.delete(self.lock_key)
+
+
+class RedisCounterBuffer(RedisHashBuffer):
+    """
+    Increments are a single HINCRBY. Values being flushed are in neither
+    Redis nor the database for the length of the bulk write, so pending()
+    briefly undercounts rather than counting them twice.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name, int)
+
+    def increment(self, object_id: int, amount: int = 1) -> None:
+        from redis.exceptions import RedisError
+
+        # A lost increment beats failing the request that made it
+        try:
+            self.connection.hincrby(self.key, object_id, amount)
+        except RedisError as error:
+            logger.error(f"Could not buffer increment for {object_id}: {error}")
+
+    def pending(self, object_id: int) -> int:
+        return self.pending_many([object_id])[object_id]
+
+    def pending_many(self, object_ids: Iterable[int]) -> Dict[int, int]:
+        from redis.exceptions import RedisError
+
+        object_ids = list(object_ids)
+        if not object_ids:
+            return {}
+        try:
+            values = self.connection.hmget(self.key, object_ids)
+        except RedisError as error:
+            logger.error(f"Could not read buffered counts: {error}")
+            values = [None] * len(object_ids)
+        return {
+            object_id: int(value or 0) for object_id, value in zip(object_ids, values)
+        }
+
+    def restore(self, drained: Dict[int, int]) -> None:
+        pipe = self.connection.pipeline(transaction=False)
+        for object_id, amount in drained.items():
+            pipe.hincrby(self.key, object_id, amount)
+        pipe.execute()
+
+
+class RedisTimestampBuffer(RedisHashBuffer):
+    """
+    Records are a single HSET, so repeated records for an object between
+    flushes coalesce into one field holding the latest timestamp.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name, float)
+
+    def record(self, object_id: int, timestamp: float) -> None:
+        from redis.exceptions import RedisError
+
+        try:
+            self.connection.hset(self.key, object_id, repr(timestamp))
+        except RedisError as error:
+            logger.error(f"Could not buffer timestamp for {object_id}: {error}")
+
+    def pending(self, object_id: int) -> float:
+        from redis.exceptions import RedisError
+
+        try:
+            return float(self.connection.hget(self.key, object_id) or 0)
+        except RedisError as error:
+            logger.error(f"Could not read buffered timestamp: {error}")
+            return 0.0
+
+    def restore(self, drained: Dict[int, float]) -> None:
+        # Anything recorded since the take is newer, so it is kept
+        pipe = self.connection.pipeline(transaction=False)
+        for object_id, timestamp in drained.items():
+            pipe.hsetnx(self.key, object_id, repr(timestamp))
+        pipe.execute()
+
+
+def get_counter_buffer(name: str) -> CounterBufferProtocol:
+    if settings.CACHES["default"]["BACKEND"].startswith("django_redis"):
+        return RedisCounterBuffer(name)
+    logger.warning(f"Counter buffer {name} is process-local; use Redis in production")
+    return LocalCounterBuffer()
+
+
+def get_timestamp_buffer(name: str) -> TimestampBufferProtocol:
+    if settings.CACHES["default"]["BACKEND"].startswith("django_redis"):
+        return RedisTimestampBuffer(name)
+    logger.warning(f"Timestamp buffer {name} is process-local; use Redis in production")
+    return LocalTimestampBuffer()
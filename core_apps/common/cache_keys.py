@@ -0,0 +1,44 @@
+import time
+from typing import Any, Iterable, Sequence
+from .tiered_cache import TwoTierCache, invalidation_bus
+
+
+class CacheKeyRegistry:
+    """
+    Builds cache keys that embed the current version of every tag they
+    depend on, e.g. `user_with_profile:42@1718000000000000000`.
+
+    Invalidating a tag drops its version counter, so every key derived
+    from it stops being reachable at once: O(1) per tag and no key scans.
+    Orphaned entries simply expire. Versions are read through a
+    TwoTierCache, so building a key is normally a local lookup and an
+    invalidation reaches every worker over the same pub/sub channel.
+    """
+
+    def __init__(self, versions: TwoTierCache):
+        self.versions = versions
+
+    def version_key(self, tag: str) -> str:
+        return f"cache_version:{tag}"
+
+    def version(self, tag: str) -> Any:
+        key = self.version_key(tag)
+
+        def start_version():
+            # Nanosecond clock rather than 1: a counter that restarts after
+            # being dropped must never reuse an old version
+            return self.versions.add(key, time.time_ns())
+
+        return self.versions.get_or_set(key, start_version)
+
+    def make_key(self, name: str, *parts: Any, tags: Sequence[str]) -> str:
+        versions = ".".join(str(self.version(tag)) for tag in tags)
+        return ":".join([name, *map(str, parts)]) + f"@{versions}"
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        self.versions.delete(*(self.version_key(tag) for tag in tags))
+
+
+cache_keys = CacheKeyRegistry(
+    TwoTierCache("cache_versions", invalidation_bus, timeout=None)
+)
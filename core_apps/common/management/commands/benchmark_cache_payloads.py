@@ -0,0 +1,112 @@
+import pickle
+import statistics
+import time
+import zlib
+from typing import Any, Callable, List, Tuple
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from core_apps.articles.models import Article
+from core_apps.articles.repository import ArticleRepository
+from core_apps.articles.serializers import ArticleDetailSerializer
+from core_apps.common import payloads
+from core_apps.users.serializers import UserProfileSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare pickled model instances (what the cache used to hold) with "
+        "the JSON payloads TwoTierCache stores: size and cost of a cache hit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--samples", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        samples = options["samples"]
+        users = list(User.objects.select_related("profile")[:samples])
+        repository = ArticleRepository()
+        articles = [
+            repository.get_article_detail(article_id)
+            for article_id in Article.objects.values_list("id", flat=True)[:samples]
+        ]
+        self.stdout.write(f"payload encoder: {'orjson' if payloads.orjson else 'json'}")
+        self.stdout.write(
+            f"{'value':>8} {'format':>8} {'bytes':>8} {'zlib':>8}"
+            f" {'hit p50 us':>11} {'hit p99 us':>11}"
+        )
+        self.compare(
+            "user", users, lambda user: UserProfileSerializer(user).data, options
+        )
+        self.compare(
+            "article",
+            articles,
+            lambda article: ArticleDetailSerializer(article).data,
+            options,
+        )
+
+    def compare(
+        self,
+        name: str,
+        instances: List[Any],
+        serialize: Callable[[Any], Any],
+        options: dict,
+    ) -> None:
+        if not instances:
+            self.stdout.write(f"{name:>8} skipped, nothing to sample")
+            return
+
+        pickled = [zlib.compress(pickle.dumps(instance)) for instance in instances]
+        encoded = [payloads.dumps(serialize(instance)) for instance in instances]
+
+        def pickled_hit(blob: bytes):
+            # Unpickle the instance, then serialize it for the response
+            return serialize(pickle.loads(zlib.decompress(blob)))
+
+        self.report(
+            name,
+            "pickle",
+            self.sizes(pickled, compressed=True),
+            self.measure(pickled_hit, pickled, options["repeat"]),
+        )
+        self.report(
+            name,
+            "payload",
+            self.sizes(encoded, compressed=False),
+            self.measure(payloads.loads, encoded, options["repeat"]),
+        )
+
+    def sizes(self, blobs: List[bytes], compressed: bool) -> Tuple[float, float]:
+        if compressed:
+            raw = [len(zlib.decompress(blob)) for blob in blobs]
+            packed = [len(blob) for blob in blobs]
+        else:
+            raw = [len(blob) for blob in blobs]
+            packed = [len(zlib.compress(blob)) for blob in blobs]
+        return statistics.mean(raw), statistics.mean(packed)
+
+    def measure(
+        self, hit: Callable[[bytes], Any], blobs: List[bytes], repeat: int
+    ) -> List[float]:
+        timings = []
+        for _ in range(repeat):
+            for blob in blobs:
+                started = time.perf_counter()
+                hit(blob)
+                timings.append(time.perf_counter() - started)
+        return timings
+
+    def report(
+        self,
+        name: str,
+        fmt: str,
+        sizes: Tuple[float, float],
+        timings: List[float],
+    ) -> None:
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"{name:>8} {fmt:>8} {sizes[0]:>8.0f} {sizes[1]:>8.0f}"
+            f" {percentiles[49] * 1e6:>11.1f} {percentiles[98] * 1e6:>11.1f}"
+        )
@@ -1,8 +1,8 @@
 from django.db import models
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from core_apps.comments.models import Comment
 
 User = get_user_model()
 
@@ -16,16 +16,51 @@ class BaseTimeStampModel(models.Model):
 
 
 class CommentableMixin(models.Model):
-    comments = GenericRelation(Comment)
+    # Lazy reference: comments.models imports this module
+    comments = GenericRelation("comments.Comment")
+    # Maintained by core_apps.comments.signals
+    comment_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         abstract = True
 
     def add_comment(self, user: User, title: str, body: str, parent=None):
-        return Comment.objects.create(
-            user=user,
-            title=title,
-            body=body,
-            parent=parent,
-            content_object=self,
-        )
+        return self.comments.create(user=user, title=title, body=body, parent=parent)
+
+
+class OutboxEmail(models.Model):
+    """
+    An outgoing email, written in the request and sent later in batches by
+    core_apps.common.tasks.send_outbox_emails (see common.outbox).
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    # Enqueueing a key that is already in the outbox is a no-op
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    to = models.JSONField(default=list)
+    from_email = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "outbox_email"
+        verbose_name = _("Outbox Email")
+        verbose_name_plural = _("Outbox Emails")
+        # Backs the dispatcher's "due pending emails" scan
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.subject} -> {', '.join(self.to)}"
@@ -0,0 +1,186 @@
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.template.loader import get_template
+from django.utils import timezone
+from django.utils.html import strip_tags
+from loguru import logger
+from .models import OutboxEmail
+
+# Emails claimed, and sent over one mail connection, at a time
+OUTBOX_BATCH_SIZE = 100
+
+# How long a claimed email is hidden from other dispatchers while it is
+# being sent. A worker dying mid-batch means those emails are sent again.
+SEND_LEASE = timedelta(minutes=5)
+
+# Failed sends are retried after 1, 2, 4, ... minutes, at most an hour
+# apart, and given up on after OUTBOX_MAX_ATTEMPTS
+RETRY_BASE_DELAY = timedelta(minutes=1)
+RETRY_MAX_DELAY = timedelta(hours=1)
+OUTBOX_MAX_ATTEMPTS = 6
+
+# Sent and given-up emails (and their idempotency keys) are kept this long
+OUTBOX_RETENTION = timedelta(days=7)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+
+def render_email(template_name: str, context: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Render an HTML email template into (text body, HTML body).
+
+    get_template() goes through Django's cached template loader, so each
+    template is parsed once per process and only rendered per email.
+    """
+    html_body = get_template(template_name).render(context)
+    return strip_tags(html_body).strip(), html_body
+
+
+class EmailOutbox:
+    """
+    Outgoing email queued in the database.
+
+    Enqueueing happens inside the caller's transaction and sending after it
+    commits, in batches that share one connection to the mail server
+    instead of one connection (and one task) per email.
+    """
+
+    def enqueue(
+        self,
+        subject: str,
+        body: str,
+        to: Sequence[str],
+        *,
+        html_body: str = "",
+        from_email: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Tuple[OutboxEmail, bool]:
+        """
+        Queue an email, unless one with the same idempotency key is already
+        queued or was sent recently. Without a key every call queues a new
+        email, since identical content can legitimately be sent twice.
+        """
+        to = list(to)
+        if idempotency_key is None:
+            idempotency_key = f"uuid:{uuid.uuid4().hex}"
+
+        email, created = OutboxEmail.objects.get_or_create(
+            idempotency_key=idempotency_key,
+            defaults={
+                "to": to,
+                "from_email": from_email or settings.DEFAULT_FROM_EMAIL or "",
+                "subject": subject,
+                "body": body,
+                "html_body": html_body,
+            },
+        )
+        if created:
+            from .tasks import send_outbox_emails
+
+            transaction.on_commit(lambda: send_outbox_emails.delay())
+        return email, created
+
+    def enqueue_template(
+        self,
+        template_name: str,
+        context: Dict[str, Any],
+        subject: str,
+        to: Sequence[str],
+        **kwargs,
+    ) -> Tuple[OutboxEmail, bool]:
+        body, html_body = render_email(template_name, context)
+        return self.enqueue(subject, body, to, html_body=html_body, **kwargs)
+
+    def claim(self, batch_size: int = OUTBOX_BATCH_SIZE) -> List[OutboxEmail]:
+        """Take due emails off the queue for SEND_LEASE."""
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .filter(status=OutboxEmail.Status.PENDING, next_attempt_at__lte=now)
+                .order_by("next_attempt_at", "id")[:batch_size]
+            )
+            OutboxEmail.objects.filter(id__in=[email.id for email in batch]).update(
+                attempts=F("attempts") + 1, next_attempt_at=now + SEND_LEASE
+            )
+        for email in batch:
+            email.attempts += 1
+        return batch
+
+    def send_batch(self, batch: List[OutboxEmail]) -> int:
+        """Send claimed emails over one connection; returns how many went out."""
+        sent, failed = [], []
+        try:
+            with get_connection() as connection:
+                for email in batch:
+                    message = EmailMultiAlternatives(
+                        subject=email.subject,
+                        body=email.body,
+                        from_email=email.from_email or None,
+                        to=email.to,
+                        connection=connection,
+                    )
+                    if email.html_body:
+                        message.attach_alternative(email.html_body, "text/html")
+                    try:
+                        message.send()
+                    except Exception as error:
+                        failed.append((email, error))
+                    else:
+                        sent.append(email.id)
+        except Exception as error:
+            # Could not reach the mail server: the whole batch is retried
+            unsent = set(sent) | {email.id for email, _ in failed}
+            failed += [(email, error) for email in batch if email.id not in unsent]
+
+        OutboxEmail.objects.filter(id__in=sent).update(
+            status=OutboxEmail.Status.SENT, sent_at=timezone.now(), last_error=""
+        )
+        if failed:
+            self.retry_later(failed)
+        return len(sent)
+
+    def retry_later(self, failed: List[Tuple[OutboxEmail, Exception]]) -> None:
+        now = timezone.now()
+        for email, error in failed:
+            email.last_error = repr(error)
+            if email.attempts >= OUTBOX_MAX_ATTEMPTS:
+                email.status = OutboxEmail.Status.FAILED
+            else:
+                email.next_attempt_at = now + retry_delay(email.attempts)
+        OutboxEmail.objects.bulk_update(
+            [email for email, _ in failed], ["status", "next_attempt_at", "last_error"]
+        )
+        logger.warning(f"Failed to send {len(failed)} outbox emails")
+
+    def dispatch(self, batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+        """Send every due email, a batch at a time."""
+        sent = 0
+        while True:
+            batch = self.claim(batch_size)
+            if batch:
+                sent += self.send_batch(batch)
+            if len(batch) < batch_size:
+                return sent
+
+    def purge(self, older_than: timedelta = OUTBOX_RETENTION) -> int:
+        """
+        Delete sent and given-up emails, releasing their idempotency keys.
+        A failed email's next_attempt_at is when its last attempt started.
+        """
+        cutoff = timezone.now() - older_than
+        deleted, _ = OutboxEmail.objects.filter(
+            Q(status=OutboxEmail.Status.SENT, sent_at__lt=cutoff)
+            | Q(status=OutboxEmail.Status.FAILED, next_attempt_at__lt=cutoff)
+        ).delete()
+        return deleted
+
+
+outbox = EmailOutbox()
@@ -0,0 +1,108 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+Position = Tuple[datetime, int]
+
+
+def encode_cursor(position: Position) -> str:
+    created_at, pk = position
+    payload = json.dumps([created_at.isoformat(), pk]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor: str) -> Optional[Position]:
+    try:
+        created_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        position = parse_datetime(created_at), int(pk)
+    except (TypeError, ValueError):
+        return None
+    return position if position[0] is not None else None
+
+
+def keyset_filter(
+    position: Position, fields: Tuple[str, str] = ("created_at", "id")
+) -> Q:
+    """Rows strictly after `position` in (-created_at, -id) order."""
+    created_at, pk = position
+    time_field, pk_field = fields
+    return Q(**{f"{time_field}__lt": created_at}) | Q(
+        **{time_field: created_at, f"{pk_field}__lt": pk}
+    )
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in cursor pagination keyed on (created_at, id), newest first.
+
+    Each page is a range scan on a (created_at, id) index, so deep pages
+    cost the same as the first one and no COUNT(*) is issued. Only a
+    `next` link is returned.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE or 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering_fields = ("created_at", "id")
+
+    def get_page_size(self, request) -> int:
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(requested, 1), self.max_page_size)
+
+    def get_position(self, item: Any) -> Position:
+        if isinstance(item, dict):
+            return tuple(item[field] for field in self.ordering_fields)
+        return tuple(getattr(item, field) for field in self.ordering_fields)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*(f"-{field}" for field in self.ordering_fields))
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            position = decode_cursor(cursor)
+            if position is None:
+                raise NotFound(_("Invalid cursor"))
+            queryset = queryset.filter(keyset_filter(position, self.ordering_fields))
+
+        rows = list(queryset[: page_size + 1])
+        page = rows[:page_size]
+        self.next_position = (
+            self.get_position(page[-1]) if len(rows) > page_size else None
+        )
+        return page
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            encode_cursor(self.next_position),
+        )
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
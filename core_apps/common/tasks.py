@@ -0,0 +1,17 @@
+from celery import shared_task
+from loguru import logger
+from .outbox import outbox
+
+
+@shared_task
+def send_outbox_emails() -> int:
+    """Send due outbox emails in batches over one mail connection each."""
+    sent = outbox.dispatch()
+    if sent:
+        logger.info(f"Sent {sent} outbox emails")
+    return sent
+
+
+@shared_task
+def purge_outbox_emails() -> int:
+    return outbox.purge()
@@ -1,3 +1,423 @@
-from django.test import TestCase
+import base64
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from smtplib import SMTPException
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from core_apps.articles.models import Article
+from .buffers import RedisCounterBuffer
+from .models import OutboxEmail
+from .pagination import KeysetPagination, decode_cursor, encode_cursor, keyset_filter
+from .outbox import OUTBOX_MAX_ATTEMPTS, OUTBOX_RETENTION, outbox
+from .tasks import purge_outbox_emails, send_outbox_emails
+from .throttling import (
+    AnonSlidingWindowThrottle,
+    LocalRateCounter,
+    RedisRateCounter,
+)
+from .tiered_cache import (
+    LocalInvalidationBus,
+    LocalLRU,
+    RedisInvalidationBus,
+    TwoTierCache,
+)
 
-# Create your tests here.
+
+class LocalLRUTest(SimpleTestCase):
+    def test_evicts_least_recently_used_beyond_capacity(self):
+        lru = LocalLRU(max_entries=2, ttl=60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        self.assertEqual(lru.get("a"), 1)
+        self.assertEqual(lru.get("c"), 3)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.evictions, 1)
+
+    def test_entries_expire_after_ttl(self):
+        lru = LocalLRU(max_entries=10, ttl=5)
+        with mock.patch("core_apps.common.tiered_cache.time.monotonic") as now:
+            now.return_value = 100.0
+            lru.set("a", 1)
+            now.return_value = 106.0
+            self.assertIsNone(lru.get("a"))
+        self.assertEqual(lru.expirations, 1)
+
+
+class TwoTierCacheTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.tier = TwoTierCache("test", LocalInvalidationBus(), 10, 60, 60)
+
+    def test_read_through_fills_both_tiers(self):
+        loader = mock.Mock(return_value={"id": 1})
+
+        self.assertEqual(self.tier.get_or_set("user_1", loader), {"id": 1})
+        self.assertEqual(self.tier.get_or_set("user_1", loader), {"id": 1})
+        loader.assert_called_once()
+        self.assertIsInstance(cache.get("user_1"), bytes)  # JSON, not a pickle
+
+        self.tier.clear_local()  # Another worker: served by the shared tier
+        self.tier.get_or_set("user_1", loader)
+        metrics = self.tier.metrics()
+        self.assertEqual(
+            (metrics["misses"], metrics["local_hits"], metrics["remote_hits"]),
+            (1, 1, 1),
+        )
+
+    def test_delete_evicts_both_tiers(self):
+        self.tier.set("user_1", {"id": 1})
+        self.tier.delete("user_1")
+
+        self.assertIsNone(self.tier.get("user_1"))
+        self.assertIsNone(cache.get("user_1"))
+
+    def test_invalidation_messages_evict_other_workers(self):
+        bus = RedisInvalidationBus()
+        other_worker = TwoTierCache("test", bus, 10, 60, 60)
+        other_worker.local.set("user_1", {"id": 1})
+
+        # What the subscriber thread does with a published message
+        bus._dispatch("test", ["user_1"])
+        self.assertEqual(len(other_worker.local), 0)
+
+    def test_values_round_trip_as_json(self):
+        value = {"id": 1, "joined": datetime(2024, 1, 2, tzinfo=timezone.utc)}
+
+        self.assertEqual(
+            self.tier.get_or_set("user_1", lambda: value),
+            {"id": 1, "joined": "2024-01-02T00:00:00Z"},
+        )
+        self.tier.clear_local()
+        self.assertEqual(self.tier.get("user_1")["joined"], "2024-01-02T00:00:00Z")
+
+    def test_entries_of_another_version_are_misses(self):
+        self.tier.set("user_1", {"id": 1})
+        upgraded = TwoTierCache(
+            "upgraded", LocalInvalidationBus(), 10, 60, 60, version=2
+        )
+
+        self.assertIsNone(upgraded.get("user_1"))
+        self.assertEqual(upgraded.get_or_set("user_1", lambda: {"id": 2}), {"id": 2})
+
+    def test_expired_entry_is_served_while_another_worker_refreshes(self):
+        stored_at = time.time() - 90  # Stale, but inside the grace period
+        with mock.patch("core_apps.common.tiered_cache.time.time") as now:
+            now.return_value = stored_at
+            self.tier.set("user_1", {"id": 1})
+        loader = mock.Mock(return_value={"id": 1, "fresh": True})
+
+        self.assertTrue(cache.add("user_1:refresh_lock", "other-worker"))
+        self.assertEqual(self.tier.get_or_set("user_1", loader), {"id": 1})
+        loader.assert_not_called()
+
+        cache.delete("user_1:refresh_lock")
+        self.assertEqual(self.tier.get_or_set("user_1", loader)["fresh"], True)
+        self.assertEqual(self.tier.metrics()["stale_hits"], 1)
+
+    def test_entries_near_expiry_are_refreshed_early(self):
+        self.tier.set("user_1", {"id": 1}, compute_time=2.0)
+        loader = mock.Mock(return_value={"id": 1})
+        almost_stale = time.time() + 59
+
+        with mock.patch("core_apps.common.tiered_cache.time.time") as now:
+            now.return_value = almost_stale
+            # A high roll is a long jitter: ~4.6s for a 2s loader
+            with mock.patch("core_apps.common.tiered_cache.random.random") as roll:
+                roll.return_value = 0.9
+                self.tier.get_or_set("user_1", loader)
+                loader.assert_called_once()
+
+
+class StampedeProtectionTest(TransactionTestCase):
+    THREADS = 8
+
+    def test_concurrent_misses_run_one_query(self):
+        user = get_user_model().objects.create_user(
+            username="hot", email="hot@example.com", password="secret-pass-123"
+        )
+        cache.clear()
+        tier = TwoTierCache("stampede", LocalInvalidationBus(), 10, 60, 60)
+        barrier = threading.Barrier(self.THREADS)
+        queries = []
+        results = []
+
+        def loader():
+            queries.append(1)
+            time.sleep(0.05)  # Keep the other readers waiting on the lock
+            return (
+                get_user_model()
+                .objects.filter(id=user.id)
+                .values("id", "username")
+                .first()
+            )
+
+        def read():
+            try:
+                barrier.wait()
+                results.append(tier.get_or_set(f"user_{user.id}", loader))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=read) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(results, [{"id": user.id, "username": "hot"}] * self.THREADS)
+        self.assertEqual(tier.metrics()["waits"], self.THREADS - 1)
+
+
+class RedisCounterBufferTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.redis = mock.MagicMock()
+        self.redis.register_script.return_value = mock.Mock(
+            return_value=[b"1", b"3", b"2", b"5"]
+        )
+        patcher = mock.patch.object(
+            RedisCounterBuffer,
+            "connection",
+            new_callable=mock.PropertyMock,
+            return_value=self.redis,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.buffer = RedisCounterBuffer("views")
+
+    def test_overlapping_flushes_do_not_share_values(self):
+        with self.buffer.draining() as first:
+            with self.buffer.draining() as second:
+                self.assertEqual(second, {})
+        self.assertEqual(first, {1: 3, 2: 5})
+        self.redis.register_script.return_value.assert_called_once()
+
+    def test_failed_write_puts_values_back_and_releases_the_lock(self):
+        with self.assertRaises(RuntimeError):
+            with self.buffer.draining():
+                raise RuntimeError("database down")
+        pipe = self.redis.pipeline.return_value
+        pipe.hincrby.assert_has_calls(
+            [mock.call(self.buffer.key, 1, 3), mock.call(self.buffer.key, 2, 5)]
+        )
+
+        with self.buffer.draining() as retried:
+            self.assertEqual(retried, {1: 3, 2: 5})
+
+    def test_redis_errors_are_logged_not_raised(self):
+        self.redis.hincrby.side_effect = RedisConnectionError
+        self.redis.hmget.side_effect = RedisConnectionError
+
+        self.buffer.increment(1)
+        self.assertEqual(self.buffer.pending_many([1, 2]), {1: 0, 2: 0})
+
+
+class KeysetPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Article.objects.bulk_create(
+            [Article(title=f"Article {i}", slug=f"article-{i}") for i in range(5)]
+        )
+        # Same timestamp for all rows: the order rests on id alone
+        cls.created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        Article.objects.update(created_at=cls.created_at)
+        cls.ids = sorted(Article.objects.values_list("id", flat=True), reverse=True)
+
+    def paginate(self, url: str, page_size: int = 2):
+        paginator = KeysetPagination()
+        paginator.page_size = page_size
+        request = Request(APIRequestFactory().get(url))
+        page = paginator.paginate_queryset(Article.objects.all(), request)
+        return [article.id for article in page], paginator.get_next_link()
+
+    def test_pages_walk_rows_with_equal_created_at_by_id(self):
+        seen, url = [], "/articles/"
+        while url:
+            ids, url = self.paginate(url)
+            seen += ids
+        self.assertEqual(seen, self.ids)
+
+    def test_full_last_page_has_no_next_link(self):
+        ids, next_link = self.paginate("/articles/", page_size=5)
+        self.assertEqual(ids, self.ids)
+        self.assertIsNone(next_link)
+
+    def test_keyset_filter_excludes_the_position_itself(self):
+        position = (self.created_at, self.ids[2])
+        rows = Article.objects.filter(keyset_filter(position))
+        self.assertEqual(
+            sorted(rows.values_list("id", flat=True), reverse=True), self.ids[3:]
+        )
+
+    def test_tampered_cursors_are_not_found(self):
+        valid = encode_cursor((self.created_at, self.ids[0]))
+        self.assertEqual(decode_cursor(valid), (self.created_at, self.ids[0]))
+
+        for cursor in (
+            "not-base64!",
+            valid[:-4],
+            base64.urlsafe_b64encode(b'["yesterday", 1]').decode(),
+            base64.urlsafe_b64encode(b'{"a": 1}').decode(),
+            base64.urlsafe_b64encode(b"[1, 2, 3]").decode(),
+        ):
+            with self.subTest(cursor=cursor), self.assertRaises(NotFound):
+                self.paginate(f"/articles/?cursor={cursor}")
+
+
+class SlidingWindowTest(SimpleTestCase):
+    def test_previous_window_is_weighted_by_its_overlap(self):
+        counter = LocalRateCounter()
+        with mock.patch("core_apps.common.throttling.time.time") as now:
+            now.return_value = 6000.0
+            for _ in range(10):
+                counter.hit("client", 60)
+            now.return_value = 6090.0  # Halfway through the next window
+            count = counter.hit("client", 60)
+
+        self.assertEqual((count.current, count.previous), (1, 10))
+        self.assertEqual(count.estimate, 6.0)
+        # 10 * (1 - t / 60) + 1 < 4 from 18s into the window
+        self.assertAlmostEqual(count.retry_after(4), 12.0)
+        self.assertEqual(count.retry_after(7), 0.0)
+
+    def test_keys_hold_two_counters_whatever_the_rate(self):
+        counter = LocalRateCounter(max_keys=2)
+        for key in ("a", "b", "a", "c"):
+            counter.hit(key, 60)
+
+        self.assertEqual(list(counter._windows), ["a", "c"])
+        self.assertEqual(counter._windows["a"][1], 2)
+
+    def test_throttle_rejects_beyond_the_rate(self):
+        class TwoPerMinute(AnonSlidingWindowThrottle):
+            rate = "2/min"
+
+        request = APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+        request.user = mock.Mock(is_authenticated=False)
+        counter = LocalRateCounter()
+
+        with mock.patch("core_apps.common.throttling.rate_counter", counter):
+            allowed = [TwoPerMinute().allow_request(request, None) for _ in range(2)]
+            throttle = TwoPerMinute()
+            self.assertEqual(allowed, [True, True])
+            self.assertFalse(throttle.allow_request(request, None))
+        self.assertGreater(throttle.wait(), 0)
+
+    def test_redis_errors_fail_open(self):
+        redis = mock.MagicMock()
+        redis.register_script.return_value.side_effect = RedisConnectionError
+        redis.delete.side_effect = RedisConnectionError
+        counter = RedisRateCounter()
+
+        with mock.patch.object(
+            RedisRateCounter,
+            "connection",
+            new_callable=mock.PropertyMock,
+            return_value=redis,
+        ):
+            count = counter.hit("client", 60)
+            counter.reset("client", 60)
+
+        self.assertEqual(count.estimate, 0)
+        self.assertEqual(count.retry_after(1), 0.0)
+
+
+class EmailOutboxTest(TestCase):
+    def enqueue(self, n: int, **kwargs):
+        return outbox.enqueue(
+            f"Notice {n}", f"Body {n}", [f"reader{n}@example.com"], **kwargs
+        )
+
+    def test_batch_is_sent_over_one_connection(self):
+        for n in range(5):
+            with self.captureOnCommitCallbacks() as callbacks:
+                self.enqueue(n)
+        self.assertEqual(len(callbacks), 1)
+
+        with mock.patch(
+            "core_apps.common.outbox.get_connection", wraps=mail.get_connection
+        ) as get_connection:
+            self.assertEqual(send_outbox_emails(), 5)
+        get_connection.assert_called_once()
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(
+            OutboxEmail.objects.exclude(status=OutboxEmail.Status.SENT).exists()
+        )
+        self.assertEqual(send_outbox_emails(), 0)
+
+    def test_duplicates_are_sent_once(self):
+        _, created = self.enqueue(1, idempotency_key="welcome:1")
+        self.assertTrue(created)
+        _, created = self.enqueue(2, idempotency_key="welcome:1")
+        self.assertFalse(created)
+        # Without a key, identical emails are both sent
+        self.enqueue(3)
+        self.enqueue(3)
+
+        send_outbox_emails()
+        self.assertEqual(
+            sorted(message.subject for message in mail.outbox),
+            ["Notice 1", "Notice 3", "Notice 3"],
+        )
+
+    def test_failed_sends_back_off_then_give_up(self):
+        email, _ = self.enqueue(1)
+        with mock.patch.object(
+            EmailBackend, "send_messages", side_effect=SMTPException("down")
+        ):
+            self.assertEqual(send_outbox_emails(), 0)
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertIn("down", email.last_error)
+            self.assertGreater(email.next_attempt_at, email.created_at)
+            # Not due yet
+            self.assertEqual(send_outbox_emails(), 0)
+            self.assertEqual(OutboxEmail.objects.get().attempts, 1)
+
+            for _ in range(OUTBOX_MAX_ATTEMPTS - 1):
+                OutboxEmail.objects.update(
+                    next_attempt_at=email.created_at - timedelta(seconds=1)
+                )
+                send_outbox_emails()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxEmail.Status.FAILED)
+        self.assertEqual(email.attempts, OUTBOX_MAX_ATTEMPTS)
+        self.assertEqual(mail.outbox, [])
+
+    def test_purge_releases_sent_and_failed_keys(self):
+        sent, _ = self.enqueue(1, idempotency_key="welcome:1")
+        failed, _ = self.enqueue(2, idempotency_key="welcome:2")
+        pending, _ = self.enqueue(3, idempotency_key="welcome:3")
+        long_ago = datetime.now(timezone.utc) - OUTBOX_RETENTION - timedelta(minutes=1)
+        OutboxEmail.objects.filter(pk=sent.pk).update(
+            status=OutboxEmail.Status.SENT, sent_at=long_ago
+        )
+        OutboxEmail.objects.filter(pk__in=[failed.pk, pending.pk]).update(
+            next_attempt_at=long_ago
+        )
+        OutboxEmail.objects.filter(pk=failed.pk).update(
+            status=OutboxEmail.Status.FAILED
+        )
+
+        self.assertEqual(purge_outbox_emails(), 2)
+        self.assertEqual(
+            list(OutboxEmail.objects.values_list("pk", flat=True)), [pending.pk]
+        )
+        for n in (1, 2):
+            _, created = self.enqueue(n, idempotency_key=f"welcome:{n}")
+            self.assertTrue(created)
@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Protocol
+from django.conf import settings
+from django.core.cache import cache
+from loguru import logger
+from rest_framework import throttling
+
+# Keys remembered by LocalRateCounter before the least recently hit is dropped
+LOCAL_MAX_KEYS = 100_000
+
+# One round trip: count the hit in the current window (starting its expiry
+# on the first hit) and read the previous window
+SLIDING_WINDOW_SCRIPT = """
+local current = redis.call("INCRBY", KEYS[1], ARGV[1])
+if current == tonumber(ARGV[1]) then
+    redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+return {current, tonumber(redis.call("GET", KEYS[2]) or "0")}
+"""
+
+
+class WindowCount(NamedTuple):
+    """
+    Hits of a sliding window, estimated from two fixed windows: all of the
+    current one plus the previous one weighted by how much of it still
+    overlaps the sliding window.
+    """
+
+    current: int
+    previous: int
+    # Seconds since the current fixed window started
+    elapsed: float
+    window: float
+
+    @property
+    def estimate(self) -> float:
+        return self.previous * (1 - self.elapsed / self.window) + self.current
+
+    def retry_after(self, limit: float) -> float:
+        """Seconds until the estimate drops below `limit`, absent new hits."""
+        if self.estimate < limit:
+            return 0.0
+        if self.current < limit:
+            # The previous window's share decays enough within this window
+            decayed_at = self.window * (1 - (limit - self.current) / self.previous)
+            return max(decayed_at - self.elapsed, 0.0)
+        return self.window - self.elapsed + self.window * (1 - limit / self.current)
+
+
+class RateCounterProtocol(Protocol):
+    def hit(self, key: str, window: float, amount: int = 1) -> WindowCount: ...
+
+    def reset(self, key: str, window: float) -> None: ...
+
+
+def _window(window: float):
+    now = time.time()
+    index = int(now // window)
+    return index, now - index * window
+
+
+class LocalRateCounter:
+    """Per-process counters, used when the default cache is not Redis."""
+
+    def __init__(self, max_keys: int = LOCAL_MAX_KEYS):
+        self.max_keys = max_keys
+        # key -> [window index, current hits, previous hits]
+        self._windows: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, window: float, amount: int = 1) -> WindowCount:
+        index, elapsed = _window(window)
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None or entry[0] < index - 1:
+                entry = [index, 0, 0]
+            elif entry[0] == index - 1:
+                entry = [index, 0, entry[1]]
+            entry[1] += amount
+            self._windows[key] = entry
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+        return WindowCount(entry[1], entry[2], elapsed, window)
+
+    def reset(self, key: str, window: float) -> None:
+        with self._lock:
+            self._windows.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+
+class RedisRateCounter:
+    """
+    Counters in Redis shared by every worker: one EVAL per hit, and two
+    small keys per counted key whatever the rate.
+    """
+
+    def __init__(self):
+        self._script = None
+
+    @property
+    def connection(self):
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    def keys(self, key: str, window: float, index: int):
+        # The hash tag keeps both windows in one cluster slot
+        prefix = cache.make_key(f"ratelimit:{{{key}}}:{int(window)}")
+        return f"{prefix}:{index}", f"{prefix}:{index - 1}"
+
+    def hit(self, key: str, window: float, amount: int = 1) -> WindowCount:
+        from redis.exceptions import RedisError
+
+        index, elapsed = _window(window)
+        # Limits fail open: an unreachable Redis must not fail every request
+        try:
+            if self._script is None:
+                self._script = self.connection.register_script(SLIDING_WINDOW_SCRIPT)
+            current, previous = self._script(
+                keys=self.keys(key, window, index),
+                # Kept through the next window, which still reads it
+                args=[amount, int(window * 2) + 1],
+            )
+        except RedisError as error:
+            logger.error(f"Could not count hit for {key}: {error}")
+            return WindowCount(0, 0, elapsed, window)
+        return WindowCount(int(current), int(previous), elapsed, window)
+
+    def reset(self, key: str, window: float) -> None:
+        from redis.exceptions import RedisError
+
+        index, _ = _window(window)
+        try:
+            self.connection.delete(*self.keys(key, window, index))
+        except RedisError as error:
+            logger.error(f"Could not reset count for {key}: {error}")
+
+
+def get_rate_counter() -> RateCounterProtocol:
+    if settings.CACHES["default"]["BACKEND"].startswith("django_redis"):
+        return RedisRateCounter()
+    logger.warning("Rate limits are process-local; use Redis in production")
+    return LocalRateCounter()
+
+
+rate_counter = get_rate_counter()
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Replaces SimpleRateThrottle's per-key timestamp list (read, trimmed and
+    written back on every request) with one atomic counter update.
+
+    Rejected requests are counted as well, so a client hammering the API
+    stays throttled until it slows down.
+    """
+
+    def allow_request(self, request, view) -> bool:
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.count = rate_counter.hit(self.key, self.duration)
+        return self.count.estimate <= self.num_requests
+
+    def wait(self) -> float:
+        return self.count.retry_after(self.num_requests)
+
+
+class AnonSlidingWindowThrottle(
+    SlidingWindowThrottleMixin, throttling.AnonRateThrottle
+):
+    pass
+
+
+class UserSlidingWindowThrottle(
+    SlidingWindowThrottleMixin, throttling.UserRateThrottle
+):
+    pass
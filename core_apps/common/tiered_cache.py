@@ -0,0 +1,424 @@
+import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Protocol
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from loguru import logger
+from . import payloads
+
+INVALIDATION_CHANNEL = "tiered_cache:invalidate"
+# Wait between reconnect attempts of the invalidation subscriber
+RESUBSCRIBE_DELAY = 1.0
+
+# A refresh lock outliving its holder (a crashed worker) expires after this
+REFRESH_LOCK_TIMEOUT = 10
+# How long callers wait on another worker's refresh before loading themselves
+REFRESH_WAIT = 5.0
+REFRESH_POLL_INTERVAL = 0.01
+# XFetch beta: above 1 favours refreshing earlier, below 1 later
+EARLY_EXPIRY_BETA = 1.0
+
+_MISSING = object()
+
+
+class CacheEntry(NamedTuple):
+    """A cached value plus what is needed to refresh it."""
+
+    value: Any
+    # Wall clock, as the shared tier is read by every worker; None never
+    # goes stale
+    fresh_until: Optional[float]
+    # Seconds the loader took, which scales early expiry
+    compute_time: float
+
+    def is_stale(self) -> bool:
+        return self.fresh_until is not None and time.time() >= self.fresh_until
+
+    def should_refresh(self) -> bool:
+        """
+        Probabilistic early expiry (XFetch): the closer the entry is to
+        going stale and the slower it is to compute, the likelier a
+        reader refreshes it ahead of time, so readers rarely all meet an
+        expired entry at once.
+        """
+        if self.fresh_until is None:
+            return False
+        jitter = (
+            -self.compute_time * EARLY_EXPIRY_BETA * math.log(1.0 - random.random())
+        )
+        return time.time() + jitter >= self.fresh_until
+
+
+class LocalLRU:
+    """
+    Bounded, thread-safe LRU whose entries also expire after `ttl` seconds.
+
+    The TTL caps how stale an entry can get if an invalidation message is
+    lost, e.g. while the subscriber reconnects.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class InvalidationBusProtocol(Protocol):
+    def register(self, tier: "TwoTierCache") -> None: ...
+
+    def ensure_subscribed(self) -> None: ...
+
+    def publish(self, name: str, keys: List[str]) -> None: ...
+
+
+class LocalInvalidationBus:
+    """Evicts in this process only, used when the default cache is not Redis."""
+
+    def __init__(self):
+        self._tiers: Dict[str, "TwoTierCache"] = {}
+
+    def register(self, tier: "TwoTierCache") -> None:
+        self._tiers[tier.name] = tier
+
+    def ensure_subscribed(self) -> None:
+        return None
+
+    def publish(self, name: str, keys: List[str]) -> None:
+        if name in self._tiers:
+            self._tiers[name].evict_local(keys)
+
+
+class RedisInvalidationBus:
+    """
+    Broadcasts evicted keys over Redis pub/sub so every worker drops them
+    from its local tier.
+
+    Each process runs one daemon subscriber thread, started on first use
+    (after any fork). If the subscription drops, local tiers are cleared
+    since messages may have been missed while disconnected.
+    """
+
+    def __init__(self):
+        self._tiers: Dict[str, "TwoTierCache"] = {}
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+    @property
+    def connection(self):
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    @property
+    def channel(self) -> str:
+        return cache.make_key(INVALIDATION_CHANNEL)
+
+    def register(self, tier: "TwoTierCache") -> None:
+        self._tiers[tier.name] = tier
+
+    def publish(self, name: str, keys: List[str]) -> None:
+        self._dispatch(name, keys)
+        try:
+            self.connection.publish(
+                self.channel, json.dumps({"cache": name, "keys": keys})
+            )
+        except Exception as e:
+            # Other workers fall back to their local TTL
+            logger.error(f"Cache invalidation publish failed: {e}")
+
+    def ensure_subscribed(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                threading.Thread(
+                    target=self._listen, name="tiered-cache-invalidation", daemon=True
+                ).start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.connection.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message["type"] == "message":
+                        payload = json.loads(message["data"])
+                        self._dispatch(payload["cache"], payload["keys"])
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscriber lost: {e}")
+            for tier in self._tiers.values():
+                tier.clear_local()
+            time.sleep(RESUBSCRIBE_DELAY)
+
+    def _dispatch(self, name: str, keys: List[str]) -> None:
+        if name in self._tiers:
+            self._tiers[name].evict_local(keys)
+
+
+class TwoTierCache:
+    """
+    Read-through cache: a per-process LocalLRU in front of the shared
+    Django cache (Redis in production).
+
+    get_or_set() guards loaders against stampedes. Only the worker that
+    takes a key's refresh lock runs the loader; the others serve the
+    stale value during the `stale_ttl` grace period after `timeout`, or
+    wait for the refresh on a cold miss. Entries are also refreshed
+    early at random as they near expiry.
+
+    Values must be plain JSON data, such as serializer output: the shared
+    tier stores them as compact JSON tagged with `version`, so a hit never
+    unpickles model instances and entries written for another `version`
+    (an older deployment) read as misses. Bump it whenever the shape of
+    the cached values changes.
+
+    Values served from the local tier are shared between threads and
+    must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        bus: InvalidationBusProtocol,
+        max_entries: Optional[int] = None,
+        local_ttl: Optional[float] = None,
+        timeout: Optional[int] = DEFAULT_TIMEOUT,
+        stale_ttl: Optional[int] = None,
+        version: int = 1,
+    ):
+        self.name = name
+        self.version = version
+        self.bus = bus
+        self.local = LocalLRU(
+            max_entries or settings.LOCAL_CACHE_MAX_ENTRIES,
+            local_ttl or settings.LOCAL_CACHE_TTL,
+        )
+        # None keeps entries in the shared tier until they are deleted
+        self.timeout = settings.CACHE_TTL if timeout is DEFAULT_TIMEOUT else timeout
+        self.stale_ttl = settings.CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.waits = 0
+        self.invalidations = 0
+        # Refresh lock tokens held by this process; one holder per key
+        self._tokens: Dict[str, str] = {}
+        bus.register(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value, even if stale, without refreshing it."""
+        entry = self._lookup(key)
+        return default if entry is None else entry.value
+
+    def set(self, key: str, value: Any, compute_time: float = 0.0) -> Any:
+        """Store `value` and return it as a cache hit would (decoded JSON)."""
+        payload = self._encode(value, compute_time)
+        cache.set(key, payload, timeout=self._remote_timeout())
+        entry = self._decode(payload)
+        self.local.set(key, entry)
+        return entry.value
+
+    def add(self, key: str, value: Any) -> Any:
+        """Store `value` unless the shared tier already holds the key.
+
+        Returns the value that ends up stored, so racing workers agree.
+        """
+        payload = self._encode(value, 0.0)
+        if cache.add(key, payload, timeout=self._remote_timeout()):
+            entry = self._decode(payload)
+        else:
+            entry = self._decode(cache.get(key))
+            if entry is None:
+                return self.set(key, value)
+        self.local.set(key, entry)
+        return entry.value
+
+    def get_or_set(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value, loading and storing it on a miss.
+
+        A loader result of None is cached as well, so lookups of missing
+        rows are not stampedes either.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            if not entry.should_refresh():
+                return entry.value
+            if not self._acquire(key):
+                # Another worker is refreshing it
+                self.stale_hits += 1
+                return entry.value
+            return self._refresh(key, loader)
+
+        if self._acquire(key):
+            return self._refresh(key, loader)
+
+        self.waits += 1
+        deadline = time.monotonic() + REFRESH_WAIT
+        delay = REFRESH_POLL_INTERVAL
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+            entry = self._decode(cache.get(key))
+            if entry is not None:
+                self.local.set(key, entry)
+                return entry.value
+            if cache.get(self._lock_key(key)) is None:
+                break  # The holder gave up without storing a value
+
+        # Slower than REFRESH_WAIT or failed: load without the lock
+        # rather than failing the request
+        return self._load(key, loader)
+
+    def delete(self, *keys: str) -> None:
+        cache.delete_many(keys)
+        self.invalidations += len(keys)
+        self.bus.publish(self.name, list(keys))
+
+    def evict_local(self, keys: Iterable[str]) -> None:
+        self.local.delete_many(keys)
+
+    def clear_local(self) -> None:
+        self.local.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.remote_hits + self.misses
+        return {
+            "name": self.name,
+            "local_entries": len(self.local),
+            "local_hits": self.local_hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "hit_ratio": (
+                (self.local_hits + self.remote_hits) / lookups if lookups else 0.0
+            ),
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "waits": self.waits,
+            "evictions": self.local.evictions,
+            "expirations": self.local.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _lookup(self, key: str) -> Optional[CacheEntry]:
+        self.bus.ensure_subscribed()
+        local = self.local.get(key)
+        if local is not None and not local.is_stale():
+            self.local_hits += 1
+            return local
+
+        # Stale locally: another worker may have refreshed it already
+        entry = self._decode(cache.get(key))
+        if entry is not None:
+            self.remote_hits += 1
+            self.local.set(key, entry)
+            return entry
+        if local is not None:
+            self.local_hits += 1
+            return local
+        self.misses += 1
+        return None
+
+    def _refresh(self, key: str, loader: Callable[[], Any]) -> Any:
+        try:
+            self.refreshes += 1
+            return self._load(key, loader)
+        finally:
+            self._release(key)
+
+    def _load(self, key: str, loader: Callable[[], Any]) -> Any:
+        started = time.monotonic()
+        value = loader()
+        # Hand back the decoded copy, so misses and hits look the same
+        return self.set(key, value, compute_time=time.monotonic() - started)
+
+    def _lock_key(self, key: str) -> str:
+        return f"{key}:refresh_lock"
+
+    def _acquire(self, key: str) -> bool:
+        token = uuid.uuid4().hex
+        if cache.add(self._lock_key(key), token, timeout=REFRESH_LOCK_TIMEOUT):
+            self._tokens[key] = token
+            return True
+        return False
+
+    def _release(self, key: str) -> None:
+        # Only drop our own lock; it may have expired and been retaken
+        token = self._tokens.pop(key, None)
+        if token is not None and cache.get(self._lock_key(key)) == token:
+            cache.delete(self._lock_key(key))
+
+    def _encode(self, value: Any, compute_time: float) -> bytes:
+        fresh_until = None if self.timeout is None else time.time() + self.timeout
+        return payloads.dumps(
+            [self.version, fresh_until, round(compute_time, 6), value]
+        )
+
+    def _decode(self, payload: Any) -> Optional[CacheEntry]:
+        if not isinstance(payload, bytes):
+            return None  # Absent, or pickled by older code
+        try:
+            version, fresh_until, compute_time, value = payloads.loads(payload)
+        except (TypeError, ValueError):
+            return None
+        if version != self.version:
+            return None
+        return CacheEntry(value, fresh_until, compute_time)
+
+    def _remote_timeout(self) -> Optional[int]:
+        return None if self.timeout is None else self.timeout + self.stale_ttl
+
+
+def get_invalidation_bus() -> InvalidationBusProtocol:
+    if settings.CACHES["default"]["BACKEND"].startswith("django_redis"):
+        return RedisInvalidationBus()
+    logger.warning("Cache invalidation is process-local; use Redis in production")
+    return LocalInvalidationBus()
+
+
+invalidation_bus = get_invalidation_bus()
@@ -0,0 +1,72 @@
+# Generated by Django 4.2.9 on 2026-10-18 16:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("profiles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="profile",
+            name="followers",
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="follower_count",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Number of Followers"
+            ),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="gender",
+            field=models.CharField(
+                choices=[("male", "Male"), ("female", "Female")],
+                default="male",
+                max_length=10,
+                verbose_name="Gender",
+            ),
+        ),
+        migrations.CreateModel(
+            name="Follow",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "followed",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="followers",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "follower",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="following",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "follow",
+                "unique_together": {("follower", "followed")},
+            },
+        ),
+    ]
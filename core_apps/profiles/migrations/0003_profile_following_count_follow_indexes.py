@@ -0,0 +1,34 @@
+# Generated by Django 4.2.9 on 2026-10-18 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0002_follow_profile_gender_follower_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="following_count",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Number of Followed Users"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="follow",
+            index=models.Index(
+                fields=["followed", "created_at", "id"],
+                name="follow_followe_b90d77_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="follow",
+            index=models.Index(
+                fields=["follower", "created_at", "id"],
+                name="follow_followe_d6fb99_idx",
+            ),
+        ),
+    ]
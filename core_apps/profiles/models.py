@@ -26,9 +26,13 @@ class Profile(BaseTimeStampModel):
         verbose_name=_("Gender"),
     )
     user = models.OneToOneField(User, on_delete=models.CASCADE)
+    # Maintained by FollowRepository in the same transaction as the Follow row
     follower_count = models.PositiveIntegerField(
         verbose_name=_("Number of Followers"), default=0
     )
+    following_count = models.PositiveIntegerField(
+        verbose_name=_("Number of Followed Users"), default=0
+    )
 
     class Meta:
         db_table = "profile"
@@ -49,6 +53,11 @@ class Follow(models.Model):
     class Meta:
         unique_together = ("follower", "followed")
         db_table = "follow"
+        # Back keyset-paginated follower and following lists
+        indexes = [
+            models.Index(fields=["followed", "created_at", "id"]),
+            models.Index(fields=["follower", "created_at", "id"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.follower.username} follows {self.followed.username}"
@@ -1,6 +1,9 @@
-from django.db import DatabaseError
-from typing import Tuple, Optional, Protocol
+from django.db import DatabaseError, transaction
+from django.db.models import F, QuerySet
+from django.db.models.functions import Greatest
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple, Optional, Protocol
 from django.contrib.auth import get_user_model
+from core_apps.users.repositories import UserRepository
 from .models import Profile, Follow
 from loguru import logger
 
@@ -10,11 +13,31 @@ User = get_user_model()
 class ProfileRepositoryProtocol(Protocol):
     def get_by_user(self, user) -> Profile: ...
 
+    def get_profile_data(
+        self, user_id: int, serialize: Callable[[Profile], Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]: ...
+
 
 class ProfileRepository:
     def get_by_user(self, user) -> Profile:
         return Profile.objects.get(user=user)
 
+    def get_profile_data(
+        self, user_id: int, serialize: Callable[[Profile], Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cached `serialize(profile)` output, or None if there is no profile.
+
+        Cached with the user's entries, so UserRepository.invalidate_user()
+        (called on profile updates and follow changes) retires it.
+        """
+
+        def load():
+            profile = Profile.objects.filter(user_id=user_id).first()
+            return None if profile is None else serialize(profile)
+
+        return UserRepository().cached("profile", user_id, load)
+
     def create_profile(self, profile: Profile) -> bool:
         try:
             profile.objects.create(profile)
@@ -25,25 +48,61 @@ class ProfileRepository:
 
 
 class FollowRepositoryProtocol(Protocol):
-    def follow(self, follower: User, followed: User) -> Tuple[bool, Optional(str)]: ...  # type: ignore
+    def follow(self, follower: User, followed: User) -> Tuple[bool, Optional[str]]: ...  # type: ignore
 
     def unfollow(
         self,
         follower: User,  # type: ignore
         followed: User,  # type: ignore
-    ) -> Tuple[bool, Optional(str)]: ...  # type: ignore
+    ) -> Tuple[bool, Optional[str]]: ...  # type: ignore
+
+    def bulk_follow(self, follower: User, followed_ids: Iterable[int]) -> List[int]: ...  # type: ignore
+
+    def bulk_unfollow(self, follower: User, followed_ids: Iterable[int]) -> List[int]: ...  # type: ignore
+
+    def following_ids(self, follower: User, user_ids: Iterable[int]) -> Set[int]: ...  # type: ignore
+
+    def list_followers(self, user_id: int) -> QuerySet[Follow]: ...
+
+    def list_following(self, user_id: int) -> QuerySet[Follow]: ...
 
 
 class FollowRepository:
-    def follow(self, follower: User, followed: User) -> Tuple[bool, Optional(str)]:  # type: ignore
+    @staticmethod
+    def _lock_profiles(user_ids: Iterable[int]) -> None:
+        # Serializes follow changes touching these users, so the counter
+        # deltas below always match the rows that were really inserted or
+        # deleted. Locking in id order keeps two users following each other
+        # at once from deadlocking.
+        list(
+            Profile.objects.select_for_update()
+            .filter(user_id__in=set(user_ids))
+            .order_by("id")
+            .values("id")
+        )
+
+    def follow(self, follower: User, followed: User) -> Tuple[bool, Optional[str]]:  # type: ignore
         try:
             if follower == followed:
                 return False
-            follow, created = Follow.objects.get_or_create(
-                follower=follower, followed=followed
-            )
-            if not created:
-                return False, "already following"
+            with transaction.atomic():
+                self._lock_profiles([follower.id, followed.id])
+                follow, created = Follow.objects.get_or_create(
+                    follower=follower, followed=followed
+                )
+                if not created:
+                    return False, "already following"
+                Profile.objects.filter(user=followed).update(
+                    follower_count=F("follower_count") + 1
+                )
+                Profile.objects.filter(user=follower).update(
+                    following_count=F("following_count") + 1
+                )
+                transaction.on_commit(
+                    lambda: UserRepository().invalidate_users(
+                        [follower.id, followed.id]
+                    )
+                )
             return True
 
         except DatabaseError as e:
@@ -51,16 +110,123 @@ class FollowRepository:
         except Exception as e:
             return False, f"{e}"
 
-    def unfollow(self, follower: User, followed: User) -> Tuple[bool, Optional(str)]:  # type: ignore
+    def unfollow(self, follower: User, followed: User) -> Tuple[bool, Optional[str]]:  # type: ignore
         try:
-            delete, _ = Follow.objects.filter(
-                follower=follower, followed=followed
-            ).delete()
-            if not delete:
-                return False
+            with transaction.atomic():
+                self._lock_profiles([follower.id, followed.id])
+                delete, _ = Follow.objects.filter(
+                    follower=follower, followed=followed
+                ).delete()
+                if not delete:
+                    return False
+                Profile.objects.filter(user=followed, follower_count__gt=0).update(
+                    follower_count=F("follower_count") - 1
+                )
+                Profile.objects.filter(user=follower, following_count__gt=0).update(
+                    following_count=F("following_count") - 1
+                )
+                transaction.on_commit(
+                    lambda: UserRepository().invalidate_users(
+                        [follower.id, followed.id]
+                    )
+                )
             return True, "Successfully unfollowed user"
 
         except DatabaseError as e:
             return False, f"{e}"
         except Exception as e:
             return False, f"{e}"
+
+    def bulk_follow(self, follower: User, followed_ids: Iterable[int]) -> List[int]:  # type: ignore
+        """
+        Follow many users at once; returns the ids that were newly followed,
+        or none if the database refused the change.
+        """
+        followed_ids = set(followed_ids) - {follower.id}
+        try:
+            with transaction.atomic():
+                self._lock_profiles([follower.id, *followed_ids])
+                candidates = followed_ids - self.following_ids(follower, followed_ids)
+                new_ids = sorted(
+                    User.objects.filter(id__in=candidates).values_list("id", flat=True)
+                )
+                if not new_ids:
+                    return []
+
+                Follow.objects.bulk_create(
+                    [
+                        Follow(follower=follower, followed_id=user_id)
+                        for user_id in new_ids
+                    ],
+                    ignore_conflicts=True,
+                )
+                Profile.objects.filter(user_id__in=new_ids).update(
+                    follower_count=F("follower_count") + 1
+                )
+                Profile.objects.filter(user=follower).update(
+                    following_count=F("following_count") + len(new_ids)
+                )
+                transaction.on_commit(
+                    lambda: UserRepository().invalidate_users([follower.id, *new_ids])
+                )
+            return new_ids
+        except DatabaseError as e:
+            logger.error(f"Bulk follow by {follower.id} failed: {e}")
+            return []
+
+    def bulk_unfollow(self, follower: User, followed_ids: Iterable[int]) -> List[int]:  # type: ignore
+        """
+        Unfollow many users at once; returns the ids that were unfollowed,
+        or none if the database refused the change.
+        """
+        followed_ids = set(followed_ids)
+        try:
+            with transaction.atomic():
+                self._lock_profiles([follower.id, *followed_ids])
+                removed_ids = sorted(self.following_ids(follower, followed_ids))
+                if not removed_ids:
+                    return []
+
+                Follow.objects.filter(
+                    follower=follower, followed_id__in=removed_ids
+                ).delete()
+                Profile.objects.filter(
+                    user_id__in=removed_ids, follower_count__gt=0
+                ).update(follower_count=F("follower_count") - 1)
+                Profile.objects.filter(user=follower).update(
+                    following_count=Greatest(F("following_count") - len(removed_ids), 0)
+                )
+                transaction.on_commit(
+                    lambda: UserRepository().invalidate_users(
+                        [follower.id, *removed_ids]
+                    )
+                )
+            return removed_ids
+        except DatabaseError as e:
+            logger.error(f"Bulk unfollow by {follower.id} failed: {e}")
+            return []
+
+    def following_ids(self, follower: User, user_ids: Iterable[int]) -> Set[int]:  # type: ignore
+        """Ids among `user_ids` that `follower` follows, in one query."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return set()
+        return set(
+            Follow.objects.filter(
+                follower=follower, followed_id__in=user_ids
+            ).values_list("followed_id", flat=True)
+        )
+
+    def list_followers(self, user_id: int) -> QuerySet[Follow]:
+        return (
+            Follow.objects.filter(followed_id=user_id)
+            .select_related("follower")
+            .only("id", "created_at", "follower__username")
+        )
+
+    def list_following(self, user_id: int) -> QuerySet[Follow]:
+        return (
+            Follow.objects.filter(follower_id=user_id)
+            .select_related("followed")
+            .only("id", "created_at", "followed__username")
+        )
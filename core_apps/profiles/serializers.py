@@ -8,14 +8,19 @@ User = get_user_model()
 
 class ProfileSerializer(serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(read_only=True)
-    followers_count = serializers.SerializerMethodField()
+    followers_count = serializers.IntegerField(source="follower_count", read_only=True)
+    following_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Profile
-        fields = ("user", "phone_number", "gender", "avatar", "followers_count")
-
-    def get_followers_count(self, obj: Profile) -> int:
-        return obj.user.follower.count()
+        fields = (
+            "user",
+            "phone_number",
+            "gender",
+            "avatar",
+            "followers_count",
+            "following_count",
+        )
 
 
 class FollowSerializer(serializers.ModelSerializer):
@@ -29,3 +34,29 @@ class FollowSerializer(serializers.ModelSerializer):
             "followed",
         )
         extra_kwargs = {"created_at": {"read_only": True}}
+
+
+class FollowerSerializer(serializers.ModelSerializer):
+    user_id = serializers.IntegerField(source="follower_id", read_only=True)
+    username = serializers.CharField(source="follower.username", read_only=True)
+
+    class Meta:
+        model = Follow
+        fields = ("user_id", "username", "created_at")
+
+
+class FollowingSerializer(serializers.ModelSerializer):
+    user_id = serializers.IntegerField(source="followed_id", read_only=True)
+    username = serializers.CharField(source="followed.username", read_only=True)
+
+    class Meta:
+        model = Follow
+        fields = ("user_id", "username", "created_at")
+
+
+class UserIdsSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=100,
+    )
@@ -1,3 +1,190 @@
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
 from django.test import TestCase
+from rest_framework.test import APIClient
+from .models import Follow, Profile
+from .repositories import FollowRepository
 
-# Create your tests here.
+User = get_user_model()
+
+
+class FollowTestCase(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="secret-pass-123",
+            )
+            for i in range(4)
+        ]
+        self.repository = FollowRepository()
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def counts(self, user):
+        profile = Profile.objects.get(user=user)
+        return profile.follower_count, profile.following_count
+
+
+class FollowRepositoryTest(FollowTestCase):
+    def test_follow_and_unfollow_keep_both_counters(self):
+        follower, followed = self.users[:2]
+        self.assertTrue(self.repository.follow(follower, followed))
+        self.assertEqual(self.repository.follow(follower, followed)[0], False)
+        self.assertEqual(self.counts(follower), (0, 1))
+        self.assertEqual(self.counts(followed), (1, 0))
+
+        self.assertTrue(self.repository.unfollow(follower, followed)[0])
+        self.assertFalse(self.repository.unfollow(follower, followed))
+        self.assertEqual(self.counts(follower), (0, 0))
+        self.assertEqual(self.counts(followed), (0, 0))
+
+    def test_cached_profiles_are_evicted_on_commit(self):
+        follower, followed = self.users[:2]
+        url = f"/api/v1/profiles/{followed.id}/"
+        self.assertEqual(self.client.get(url).json()["followers_count"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.repository.follow(follower, followed)
+            self.assertEqual(self.client.get(url).json()["followers_count"], 0)
+
+        self.assertEqual(self.client.get(url).json()["followers_count"], 1)
+
+    def test_both_profiles_are_locked(self):
+        follower, followed = self.users[:2]
+        with mock.patch.object(
+            FollowRepository, "_lock_profiles", wraps=FollowRepository._lock_profiles
+        ) as lock:
+            self.repository.follow(follower, followed)
+            self.repository.unfollow(follower, followed)
+
+        for call in lock.call_args_list:
+            self.assertEqual(sorted(call.args[0]), [follower.id, followed.id])
+
+    def test_self_follow_is_refused(self):
+        self.assertFalse(self.repository.follow(self.users[0], self.users[0]))
+        self.assertEqual(self.counts(self.users[0]), (0, 0))
+
+
+class FollowListViewTest(FollowTestCase):
+    def setUp(self):
+        super().setUp()
+        self.star = self.users[0]
+        for follower in self.users[1:]:
+            self.repository.follow(follower, self.star)
+
+    def test_followers_are_paged_newest_first(self):
+        url = f"/api/v1/profiles/{self.star.id}/followers/?page_size=2"
+        first = self.client.get(url).json()
+        second = self.client.get(first["next"]).json()
+
+        usernames = [row["username"] for row in first["results"] + second["results"]]
+        self.assertEqual(usernames, ["user3", "user2", "user1"])
+        self.assertIsNone(second["next"])
+
+    def test_following_lists_followed_users(self):
+        response = self.client.get(f"/api/v1/profiles/{self.users[1].id}/following/")
+
+        self.assertEqual(
+            [row["user_id"] for row in response.json()["results"]], [self.star.id]
+        )
+
+    def test_profile_reports_stored_counters(self):
+        data = self.client.get(f"/api/v1/profiles/{self.star.id}/").json()
+
+        self.assertEqual((data["followers_count"], data["following_count"]), (3, 0))
+        self.assertEqual(Follow.objects.filter(followed=self.star).count(), 3)
+
+    def test_non_numeric_pk_is_not_found(self):
+        for suffix in ("", "followers/", "following/"):
+            with self.subTest(suffix=suffix):
+                response = self.client.get(f"/api/v1/profiles/abc/{suffix}")
+                self.assertEqual(response.status_code, 404)
+
+
+class BulkFollowTest(FollowTestCase):
+    def test_bulk_follow_skips_self_duplicates_and_unknown_ids(self):
+        me, *others = self.users
+        self.repository.follow(me, others[0])
+
+        followed = self.repository.bulk_follow(
+            me, [me.id, others[0].id, others[1].id, others[1].id, 999_999]
+        )
+
+        self.assertEqual(followed, [others[1].id])
+        self.assertEqual(self.counts(me), (0, 2))
+        self.assertEqual(self.counts(others[1]), (1, 0))
+        self.assertEqual(Follow.objects.filter(follower=me).count(), 2)
+
+    def test_bulk_unfollow_counts_only_removed_rows(self):
+        me, *others = self.users
+        self.repository.bulk_follow(me, [user.id for user in others])
+
+        unfollowed = self.repository.bulk_unfollow(me, [others[0].id, 999_999])
+
+        self.assertEqual(unfollowed, [others[0].id])
+        self.assertEqual(self.counts(me), (0, 2))
+        self.assertEqual(self.counts(others[0]), (0, 0))
+        self.assertEqual(self.repository.bulk_unfollow(me, [others[0].id]), [])
+
+    def test_every_affected_profile_is_locked(self):
+        me, *others = self.users
+        with mock.patch.object(
+            FollowRepository, "_lock_profiles", wraps=FollowRepository._lock_profiles
+        ) as lock:
+            self.repository.bulk_follow(me, [others[0].id, others[1].id])
+            self.repository.unfollow(me, others[0])
+
+        self.assertEqual(
+            [sorted(call.args[0]) for call in lock.call_args_list],
+            [[me.id, others[0].id, others[1].id], [me.id, others[0].id]],
+        )
+
+    def test_database_errors_change_nothing(self):
+        me, *others = self.users
+        with mock.patch.object(
+            Follow.objects, "bulk_create", side_effect=DatabaseError("deadlock")
+        ):
+            self.assertEqual(self.repository.bulk_follow(me, [others[0].id]), [])
+
+        self.assertEqual(self.counts(me), (0, 0))
+        self.assertEqual(self.counts(others[0]), (0, 0))
+
+    def test_following_ids_is_one_query(self):
+        me, *others = self.users
+        self.repository.bulk_follow(me, [others[0].id, others[2].id])
+
+        with self.assertNumQueries(1):
+            following = self.repository.following_ids(me, [user.id for user in others])
+        self.assertEqual(following, {others[0].id, others[2].id})
+
+    def test_bulk_views_report_changed_ids(self):
+        me, *others = self.users
+        ids = [user.id for user in others]
+
+        response = self.client.post(
+            "/api/v1/profiles/bulk_follow/", {"user_ids": [me.id, *ids]}, format="json"
+        )
+        self.assertEqual(response.json(), {"followed": ids})
+
+        query = "&".join(f"user_ids={user_id}" for user_id in [me.id, ids[0]])
+        response = self.client.get(f"/api/v1/profiles/is_following/?{query}")
+        self.assertEqual(response.json(), {str(me.id): False, str(ids[0]): True})
+
+        response = self.client.post(
+            "/api/v1/profiles/bulk_unfollow/", {"user_ids": ids[:2]}, format="json"
+        )
+        self.assertEqual(response.json(), {"unfollowed": ids[:2]})
+        self.assertEqual(self.counts(me), (0, 1))
+
+    def test_views_validate_user_ids(self):
+        for user_ids in ([], ["abc"], list(range(1, 102))):
+            with self.subTest(count=len(user_ids)):
+                response = self.client.post(
+                    "/api/v1/profiles/bulk_follow/",
+                    {"user_ids": user_ids},
+                    format="json",
+                )
+                self.assertEqual(response.status_code, 400)
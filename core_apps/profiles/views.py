@@ -1,3 +1,127 @@
-from django.shortcuts import render
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from django.utils.translation import gettext_lazy as _
+from typing import Optional
+from core_apps.common.pagination import KeysetPagination
+from .repositories import FollowRepository, ProfileRepository
+from .serializers import (
+    FollowerSerializer,
+    FollowingSerializer,
+    ProfileSerializer,
+    UserIdsSerializer,
+)
 
-# Create your views here.
+
+class ProfileViewSet(viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    serializer_class = ProfileSerializer
+    # Other pks 404 at routing instead of failing in the user id lookup
+    lookup_value_regex = r"\d+"
+    repository = ProfileRepository()
+    follow_repository = FollowRepository()
+
+    def retrieve(self, request: Request, pk: Optional[int] = None) -> Response:
+        """
+        Get a user's profile with its stored follower counters.
+
+        Args:
+            request: The request object
+            pk: The user ID
+
+        Returns:
+            Response: Profile data
+        """
+        data = self.repository.get_profile_data(
+            int(pk), lambda profile: self.get_serializer(profile).data
+        )
+        if data is None:
+            raise NotFound(_("Profile not found."))
+        return Response(data)
+
+    @action(methods=["GET"], detail=True)
+    def followers(self, request: Request, pk: Optional[int] = None) -> Response:
+        """
+        List the users following a user, newest first.
+
+        Args:
+            request: The request object
+            pk: The user ID
+
+        Returns:
+            Response: A page of followers and the cursor link to the next one
+        """
+        page = self.paginate_queryset(self.follow_repository.list_followers(int(pk)))
+        return self.get_paginated_response(FollowerSerializer(page, many=True).data)
+
+    @action(methods=["GET"], detail=True)
+    def following(self, request: Request, pk: Optional[int] = None) -> Response:
+        """
+        List the users a user follows, newest first.
+
+        Args:
+            request: The request object
+            pk: The user ID
+
+        Returns:
+            Response: A page of followed users and the cursor link to the next one
+        """
+        page = self.paginate_queryset(self.follow_repository.list_following(int(pk)))
+        return self.get_paginated_response(FollowingSerializer(page, many=True).data)
+
+    @action(methods=["POST"], detail=False)
+    def bulk_follow(self, request: Request) -> Response:
+        """
+        Follow up to 100 users in one request.
+
+        Args:
+            request: The request object with a `user_ids` list
+
+        Returns:
+            Response: The ids that were newly followed
+        """
+        serializer = UserIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        followed = self.follow_repository.bulk_follow(
+            request.user, serializer.validated_data["user_ids"]
+        )
+        return Response({"followed": followed})
+
+    @action(methods=["POST"], detail=False)
+    def bulk_unfollow(self, request: Request) -> Response:
+        """
+        Unfollow up to 100 users in one request.
+
+        Args:
+            request: The request object with a `user_ids` list
+
+        Returns:
+            Response: The ids that were unfollowed
+        """
+        serializer = UserIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        unfollowed = self.follow_repository.bulk_unfollow(
+            request.user, serializer.validated_data["user_ids"]
+        )
+        return Response({"unfollowed": unfollowed})
+
+    @action(methods=["GET"], detail=False)
+    def is_following(self, request: Request) -> Response:
+        """
+        Check which of up to 100 users the current user follows.
+
+        Args:
+            request: The request object with repeated `user_ids` query params
+
+        Returns:
+            Response: A mapping of user id to following state
+        """
+        serializer = UserIdsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        user_ids = serializer.validated_data["user_ids"]
+        following = self.follow_repository.following_ids(request.user, user_ids)
+        return Response({str(user_id): user_id in following for user_id in user_ids})
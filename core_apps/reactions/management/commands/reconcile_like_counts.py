@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from core_apps.reactions.repositories import LikeRepository, get_likeable_models
+
+
+class Command(BaseCommand):
+    help = "Recompute like_count columns that drifted from the like table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows written per bulk UPDATE.",
+        )
+
+    def handle(self, *args, **options):
+        repository = LikeRepository()
+        for model in get_likeable_models():
+            fixed = repository.reconcile_like_counts(model, options["batch_size"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{model._meta.label}: fixed {fixed} drifted like counts"
+                )
+            )
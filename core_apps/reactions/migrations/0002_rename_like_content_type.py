@@ -0,0 +1,25 @@
+# Generated by Django 4.2.9 on 2026-10-18 16:30
+
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("reactions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="like",
+            old_name="ContentType",
+            new_name="content_type",
+        ),
+        migrations.AlterUniqueTogether(
+            name="like",
+            unique_together={("content_type", "object_id", "user")},
+        ),
+    ]
@@ -9,13 +9,15 @@ User = get_user_model()
 
 class Like(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=False)
-    ContentType = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
-    content_object = GenericForeignKey("ContentType", "object_id")
+    content_object = GenericForeignKey("content_type", "object_id")
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "like"
         verbose_name = _("Like")
         verbose_name_plural = _("Likes")
-        unique_together = ["ContentType", "object_id", "user"]
+        # Its index also backs "which of these objects did this user like"
+        # page lookups: content_type, object_id IN (...), user
+        unique_together = ["content_type", "object_id", "user"]
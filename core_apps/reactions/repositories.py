@@ -0,0 +1,114 @@
+from typing import Iterable, List, Protocol, Set, Type
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from .models import Like
+
+User = get_user_model()
+
+
+def get_likeable_models() -> List[Type[models.Model]]:
+    """Models that carry a denormalized `like_count` column."""
+    return [
+        apps.get_model("articles", "Article"),
+        apps.get_model("comments", "Comment"),
+    ]
+
+
+class LikeRepositoryProtocol(Protocol):
+    def like(self, user: User, obj: models.Model) -> bool: ...  # type: ignore
+
+    def unlike(self, user: User, obj: models.Model) -> bool: ...  # type: ignore
+
+    def liked_object_ids(
+        self,
+        user: User,  # type: ignore
+        model: Type[models.Model],
+        object_ids: Iterable[int],
+    ) -> Set[int]: ...
+
+    def reconcile_like_counts(
+        self, model: Type[models.Model], batch_size: int = 1000
+    ) -> int: ...
+
+
+class LikeRepository:
+    def like(self, user: User, obj: models.Model) -> bool:  # type: ignore
+        with transaction.atomic():
+            _, created = Like.objects.get_or_create(
+                user=user,
+                content_type=ContentType.objects.get_for_model(obj),
+                object_id=obj.pk,
+            )
+            if created:
+                type(obj).objects.filter(pk=obj.pk).update(
+                    like_count=F("like_count") + 1
+                )
+        return created
+
+    def unlike(self, user: User, obj: models.Model) -> bool:  # type: ignore
+        with transaction.atomic():
+            deleted, _ = Like.objects.filter(
+                user=user,
+                content_type=ContentType.objects.get_for_model(obj),
+                object_id=obj.pk,
+            ).delete()
+            if deleted:
+                type(obj).objects.filter(pk=obj.pk, like_count__gt=0).update(
+                    like_count=F("like_count") - 1
+                )
+        return bool(deleted)
+
+    def liked_object_ids(
+        self,
+        user: User,  # type: ignore
+        model: Type[models.Model],
+        object_ids: Iterable[int],
+    ) -> Set[int]:
+        """Ids among `object_ids` that `user` liked, in one indexed query."""
+        object_ids = list(object_ids)
+        if not object_ids or not getattr(user, "is_authenticated", False):
+            return set()
+        return set(
+            Like.objects.filter(
+                user=user,
+                content_type=ContentType.objects.get_for_model(model),
+                object_id__in=object_ids,
+            ).values_list("object_id", flat=True)
+        )
+
+    def reconcile_like_counts(
+        self, model: Type[models.Model], batch_size: int = 1000
+    ) -> int:
+        """Rewrite `like_count` for rows that drifted from the like table."""
+        actual_like_count = Coalesce(
+            Subquery(
+                Like.objects.filter(
+                    content_type=ContentType.objects.get_for_model(model),
+                    object_id=OuterRef("pk"),
+                )
+                .order_by()
+                .values("object_id")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+        drifted = (
+            model.objects.annotate(actual_like_count=actual_like_count)
+            .exclude(like_count=F("actual_like_count"))
+            .values_list("pk", "actual_like_count")
+        )
+
+        fixed, batch = 0, []
+        for pk, like_count in drifted.iterator(chunk_size=batch_size):
+            batch.append(model(pk=pk, like_count=like_count))
+            if len(batch) >= batch_size:
+                fixed += model.objects.bulk_update(batch, ["like_count"])
+                batch = []
+        if batch:
+            fixed += model.objects.bulk_update(batch, ["like_count"])
+        return fixed
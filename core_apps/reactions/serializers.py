@@ -0,0 +1,37 @@
+from rest_framework import serializers
+from django.db import models
+from .repositories import LikeRepository
+
+
+class LikeStateListSerializer(serializers.ListSerializer):
+    """
+    Resolves whether the requesting user liked each item of a page with a
+    single query and shares the result with the child serializer.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.Manager) else data)
+        request = self.context.get("request")
+        model = self.child.Meta.model
+        self.context.setdefault("liked_ids", {})[
+            model._meta.label
+        ] = LikeRepository().liked_object_ids(
+            getattr(request, "user", None), model, [item.pk for item in items]
+        )
+        return super().to_representation(items)
+
+
+class LikeStateSerializerMixin(serializers.Serializer):
+    """Adds `is_liked`; pair with `list_serializer_class = LikeStateListSerializer`."""
+
+    is_liked = serializers.SerializerMethodField(read_only=True)
+
+    def get_is_liked(self, obj: models.Model) -> bool:
+        liked_ids = self.context.get("liked_ids", {}).get(obj._meta.label)
+        if liked_ids is None:
+            # Serialized on its own rather than as part of a page
+            request = self.context.get("request")
+            liked_ids = LikeRepository().liked_object_ids(
+                getattr(request, "user", None), type(obj), [obj.pk]
+            )
+        return obj.pk in liked_ids
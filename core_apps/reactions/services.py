@@ -0,0 +1,20 @@
+from .repositories import LikeRepositoryProtocol
+from django.db import models
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class LikeService:
+    def __init__(self, like_repo: LikeRepositoryProtocol):
+        self.like_repo = like_repo
+
+    def like(self, user: User, obj: models.Model):  # type: ignore
+        if not self.like_repo.like(user=user, obj=obj):
+            return False, "already liked"
+        return True, "Successful."
+
+    def unlike(self, user: User, obj: models.Model):  # type: ignore
+        if not self.like_repo.unlike(user=user, obj=obj):
+            return False, "not liked"
+        return True, "Successful."
@@ -1,3 +1,98 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from core_apps.articles.models import Article
+from core_apps.articles.repository import ArticleRepository
+from core_apps.articles.serializers import ArticleListSerializer
+from .repositories import LikeRepository
 
-# Create your tests here.
+User = get_user_model()
+
+
+class LikeCountTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f"fan{i}",
+                email=f"fan{i}@example.com",
+                password="secret-pass-123",
+            )
+            for i in range(2)
+        ]
+        self.article = Article.objects.create(title="Liked", slug="liked")
+        self.repository = LikeRepository()
+
+    def like_count(self) -> int:
+        self.article.refresh_from_db(fields=["like_count"])
+        return self.article.like_count
+
+    def test_double_like_counts_once(self):
+        self.assertTrue(self.repository.like(self.users[0], self.article))
+        self.assertFalse(self.repository.like(self.users[0], self.article))
+        self.assertTrue(self.repository.like(self.users[1], self.article))
+
+        self.assertEqual(self.like_count(), 2)
+
+    def test_double_unlike_uncounts_once(self):
+        for user in self.users:
+            self.repository.like(user, self.article)
+
+        self.assertTrue(self.repository.unlike(self.users[0], self.article))
+        self.assertFalse(self.repository.unlike(self.users[0], self.article))
+        self.assertEqual(self.like_count(), 1)
+
+        self.repository.unlike(self.users[1], self.article)
+        self.assertFalse(self.repository.unlike(self.users[1], self.article))
+        self.assertEqual(self.like_count(), 0)
+
+    def test_reconcile_repairs_drifted_counts(self):
+        self.repository.like(self.users[0], self.article)
+        untouched = Article.objects.create(title="Unliked", slug="unliked")
+        Article.objects.filter(pk=self.article.pk).update(like_count=7)
+
+        self.assertEqual(self.repository.reconcile_like_counts(Article), 1)
+        self.assertEqual(self.like_count(), 1)
+        untouched.refresh_from_db(fields=["like_count"])
+        self.assertEqual(untouched.like_count, 0)
+        # Nothing left to fix
+        self.assertEqual(self.repository.reconcile_like_counts(Article), 0)
+
+    def test_reconcile_command_covers_every_likeable_model(self):
+        Article.objects.filter(pk=self.article.pk).update(like_count=3)
+        out = StringIO()
+        call_command("reconcile_like_counts", stdout=out)
+
+        self.assertIn("articles.Article: fixed 1 drifted like counts", out.getvalue())
+        self.assertIn("comments.Comment: fixed 0", out.getvalue())
+        self.assertEqual(self.like_count(), 0)
+
+
+class LikeStateQueryCountTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="reader",
+            email="reader@example.com",
+            password="secret-pass-123",
+        )
+        cls.articles = Article.objects.bulk_create(
+            [Article(title=f"Article {i}", slug=f"article-{i}") for i in range(20)]
+        )
+        for article in cls.articles[::2]:
+            LikeRepository().like(cls.user, article)
+
+    def test_page_resolves_is_liked_in_one_query(self):
+        request = APIRequestFactory().get("/")
+        request.user = self.user
+        # Authors and tags are prefetched with the page; only likes are left
+        page = list(ArticleRepository().list_articles_with_relations())
+
+        with self.assertNumQueries(1):
+            data = ArticleListSerializer(
+                page, many=True, context={"request": request}
+            ).data
+
+        liked = {item["id"] for item in data if item["is_liked"]}
+        self.assertEqual(liked, {article.pk for article in self.articles[::2]})
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TagsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_apps.tags"
+
+    def ready(self):
+        from core_apps.tags import signals
@@ -0,0 +1,165 @@
+import bisect
+import heapq
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.core.cache import cache
+from django.db import connection
+from loguru import logger
+from core_apps.articles.search import normalize_persian
+from .models import Tag
+
+# Prefix ranges up to this size are ranked on every call; wider ones (short
+# prefixes such as a single letter) are ranked once and memoized.
+SCAN_LIMIT = 256
+MAX_SUGGESTIONS = 20
+
+VERSION_CACHE_KEY = "tag_suggester_version"
+# How often a worker asks the shared cache whether its copy is stale
+VERSION_CHECK_INTERVAL = 5.0
+# Article counts change with every tagging; reload at most this often
+MIN_REBUILD_INTERVAL = 30.0
+
+_PREFIX_END = "\U0010ffff"
+
+
+class TagSuggester:
+    """
+    Prefix index over tag names: parallel arrays sorted by normalized name,
+    searched with bisect and ranked by article count.
+    """
+
+    def __init__(self, tags: Iterable[Tuple[str, int]]):
+        entries = sorted((normalize_persian(tag), tag, count) for tag, count in tags)
+        self._keys = [key for key, _, _ in entries]
+        self._tags = [tag for _, tag, _ in entries]
+        self._counts = [count for _, _, count in entries]
+        self._ranked: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, tag: str, article_count: int = 0) -> None:
+        key = normalize_persian(tag)
+        with self._lock:
+            index = bisect.bisect_left(self._keys, key)
+            if index < len(self._keys) and self._tags[index] == tag:
+                return
+            self._keys.insert(index, key)
+            self._tags.insert(index, tag)
+            self._counts.insert(index, article_count)
+            # Memoized rankings hold array positions, which just shifted
+            self._ranked.clear()
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        key = normalize_persian(prefix)
+        if not key:
+            return []
+        limit = min(limit, MAX_SUGGESTIONS)
+
+        with self._lock:
+            ranked = self._ranked.get(key)
+            if ranked is None:
+                low = bisect.bisect_left(self._keys, key)
+                high = bisect.bisect_left(self._keys, key + _PREFIX_END, lo=low)
+                ranked = heapq.nsmallest(
+                    MAX_SUGGESTIONS,
+                    range(low, high),
+                    key=lambda index: (-self._counts[index], self._keys[index]),
+                )
+                if high - low > SCAN_LIMIT:
+                    self._ranked[key] = ranked
+            return [self._tags[index] for index in ranked[:limit]]
+
+
+class TagSuggestions:
+    """
+    Per-process TagSuggester that follows a version counter in the shared
+    cache. Creating a tag or changing an article count bumps the counter;
+    other workers then rebuild their copy in a background thread and keep
+    serving the old one meanwhile, so no request waits on a full reload.
+    """
+
+    def __init__(self):
+        self._suggester: Optional[TagSuggester] = None
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._rebuilt_at = 0.0
+        self._rebuild_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> TagSuggester:
+        if self._suggester is None:
+            with self._lock:
+                if self._suggester is None:
+                    # Nothing to serve yet, so the first request loads inline
+                    self._version = cache.get(VERSION_CACHE_KEY, 0)
+                    self._suggester = self._build()
+                    self._rebuilt_at = time.monotonic()
+            return self._suggester
+
+        now = time.monotonic()
+        if (
+            now - self._checked_at > VERSION_CHECK_INTERVAL
+            and now - self._rebuilt_at > MIN_REBUILD_INTERVAL
+        ):
+            self._checked_at = now
+            version = cache.get(VERSION_CACHE_KEY, 0)
+            with self._lock:
+                rebuilding = (
+                    self._rebuild_thread is not None and self._rebuild_thread.is_alive()
+                )
+                if version != self._version and not rebuilding:
+                    self._rebuilt_at = now
+                    self._rebuild_thread = threading.Thread(
+                        target=self._rebuild, args=(version,), daemon=True
+                    )
+                    self._rebuild_thread.start()
+        return self._suggester
+
+    def tag_created(self, tag: Tag) -> None:
+        if self._suggester is not None:
+            self._suggester.add(tag.tag, tag.article_count)
+
+        version = self._bump()
+        # Skip our own reload unless another worker bumped the version too
+        if self._version is not None and version == self._version + 1:
+            self._version = version
+
+    def counts_changed(self) -> None:
+        self._bump()
+
+    def _bump(self) -> Optional[int]:
+        cache.add(VERSION_CACHE_KEY, 0)
+        try:
+            return cache.incr(VERSION_CACHE_KEY)
+        except ValueError:  # Evicted between add() and incr()
+            return None
+
+    def _rebuild(self, version: int) -> None:
+        try:
+            suggester = self._build()
+        except Exception as error:
+            # Left at the old version, so a later check retries
+            logger.error(f"Could not reload tags for autocomplete: {error}")
+            return
+        finally:
+            # This thread's own database connection
+            connection.close()
+        with self._lock:
+            self._suggester, self._version = suggester, version
+
+    def _build(self) -> TagSuggester:
+        started = time.perf_counter()
+        suggester = TagSuggester(
+            Tag.objects.values_list("tag", "article_count").iterator(chunk_size=10_000)
+        )
+        logger.info(
+            f"Loaded {len(suggester)} tags for autocomplete in "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        return suggester
+
+
+tag_suggestions = TagSuggestions()
@@ -0,0 +1,68 @@
+import random
+import statistics
+import time
+from typing import Callable, List
+from django.core.management.base import BaseCommand
+from core_apps.tags.autocomplete import TagSuggester
+
+# Latin and Persian letters, so prefixes exercise normalize_persian too
+ALPHABET = "abcdefghijklmnopqrstuvwxyz" + "ابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure TagSuggester build time and prefix lookups over synthetic "
+        "tags, without touching the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tags", type=int, default=100_000)
+        parser.add_argument("--lookups", type=int, default=20_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        tags = {
+            "".join(rng.choices(ALPHABET, k=rng.randint(3, 12))): rng.randint(0, 5000)
+            for _ in range(options["tags"])
+        }
+
+        started = time.perf_counter()
+        suggester = TagSuggester(tags.items())
+        self.stdout.write(
+            f"Built {len(suggester)} tags in "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+        # A cold one-letter prefix ranks its whole range once, then is memoized
+        letter = rng.choice(ALPHABET)
+        started = time.perf_counter()
+        suggester.suggest(letter)
+        self.stdout.write(
+            f"Cold single-letter prefix: {(time.perf_counter() - started) * 1e6:.0f} us"
+        )
+
+        names = list(tags)
+        prefixes = [
+            name[: rng.randint(1, 4)]
+            for name in rng.choices(names, k=options["lookups"])
+        ]
+        self.stdout.write(
+            f"{'lookups':>12} {'p50 us':>10} {'p99 us':>10} {'ops/s':>10}"
+        )
+        self.report("warm", self.measure(suggester.suggest, prefixes))
+
+    def measure(self, suggest: Callable[[str], object], prefixes: List[str]):
+        timings = []
+        for prefix in prefixes:
+            started = time.perf_counter()
+            suggest(prefix)
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def report(self, name: str, timings: List[float]) -> None:
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"{name:>12} {percentiles[49] * 1e6:>10.1f} {percentiles[98] * 1e6:>10.1f}"
+            f" {len(timings) / sum(timings):>10.0f}"
+        )
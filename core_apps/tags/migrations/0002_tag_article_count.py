@@ -0,0 +1,43 @@
+# Generated by Django 4.2.9 on 2026-10-18 16:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_article_count(apps, schema_editor):
+    Tag = apps.get_model("tags", "Tag")
+    TaggedItem = apps.get_model("tags", "TaggedItem")
+    counts = (
+        TaggedItem.objects.filter(tag=OuterRef("pk"), article__status="published")
+        .values("tag")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Tag.objects.update(article_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tags", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tag",
+            name="article_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_article_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(fields=["article_count"], name="tag_article_84039d_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="taggeditem",
+            index=models.Index(
+                fields=["tag", "article"], name="tagged_item_tag_id_cfecb1_idx"
+            ),
+        ),
+    ]
@@ -7,12 +7,16 @@ class Tag(models.Model):
     tag: str = models.CharField(
         max_length=128, verbose_name=_("Tag"), unique=True, null=False
     )
+    # Published articles carrying the tag; maintained by core_apps.tags.signals
+    # as tagged items come and go and articles are published or unpublished
+    article_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "tag"
         verbose_name = _("Tag")
         verbose_name_plural = _("Tags")
+        indexes = [models.Index(fields=["article_count"])]
 
     def __str__(self) -> str:
         return self.tag
@@ -29,3 +33,5 @@ class TaggedItem(models.Model):
         verbose_name = _("Tagged Item")
         verbose_name_plural = _("Tagged Items")
         unique_together = ["article", "tag"]
+        # unique_together covers lookups by article; this one serves by-tag
+        indexes = [models.Index(fields=["tag", "article"])]
@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Protocol
+from django.core.cache import cache
+from django.db.models import QuerySet
+from core_apps.articles.models import Article
+from core_apps.articles.repository import ArticleRepository
+from core_apps.common.cache_keys import cache_keys
+from .models import Tag, TaggedItem
+
+# Cache tag shared by the popular tags lists of every limit
+POPULAR_TAGS = "popular_tags"
+
+
+class TagRepositoryProtocol(Protocol):
+    def popular_tags(self, limit: int) -> List[Dict[str, Any]]: ...
+
+    def articles_with_tags(self, tag_names: List[str]) -> QuerySet[Article]: ...
+
+    def invalidate_popular_tags(self) -> None: ...
+
+
+class TagRepository:
+    def popular_tags(self, limit: int) -> List[Dict[str, Any]]:
+        cache_key = cache_keys.make_key("popular_tags", limit, tags=[POPULAR_TAGS])
+        tags = cache.get(cache_key)
+
+        if tags is None:
+            tags = list(
+                Tag.objects.filter(article_count__gt=0)
+                .order_by("-article_count", "tag")
+                .values("tag", "article_count")[:limit]
+            )
+            cache.set(cache_key, tags, timeout=60 * 5)  # Cache for 5 min
+        return tags
+
+    def articles_with_tags(self, tag_names: List[str]) -> QuerySet[Article]:
+        """Published articles carrying every one of `tag_names`."""
+        tag_names = set(tag_names)
+        tag_ids = list(
+            Tag.objects.filter(tag__in=tag_names).values_list("id", flat=True)
+        )
+        if not tag_ids or len(tag_ids) != len(tag_names):
+            return Article.objects.none()
+
+        articles = ArticleRepository().list_articles_with_relations(
+            {"status": Article.Status.PUBLISHED}
+        )
+        # One semi-join per tag, each served by the (tag, article) index
+        for tag_id in tag_ids:
+            articles = articles.filter(
+                id__in=TaggedItem.objects.filter(tag_id=tag_id).values("article_id")
+            )
+        return articles
+
+    def invalidate_popular_tags(self) -> None:
+        cache_keys.invalidate([POPULAR_TAGS])
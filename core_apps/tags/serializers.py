@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+
+class PopularTagSerializer(serializers.Serializer):
+    tag = serializers.CharField(read_only=True)
+    article_count = serializers.IntegerField(read_only=True)
+
+
+class TagFilterSerializer(serializers.Serializer):
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=128), allow_empty=False, max_length=5
+    )
+
+
+class TagSuggestQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=128)
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=10)
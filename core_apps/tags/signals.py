@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models import Exists, F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core_apps.articles.models import Article
+from .autocomplete import tag_suggestions
+from .models import Tag, TaggedItem
+from .repository import TagRepository
+
+
+@receiver(post_save, sender=Tag)
+def add_tag_to_suggestions(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: tag_suggestions.tag_created(instance))
+
+
+def tag_counts_changed() -> None:
+    TagRepository().invalidate_popular_tags()
+    tag_suggestions.counts_changed()
+
+
+def is_published(article_id: int) -> Exists:
+    return Exists(
+        Article.objects.filter(id=article_id, status=Article.Status.PUBLISHED)
+    )
+
+
+@receiver(post_save, sender=TaggedItem)
+def increment_tag_article_count(sender, instance, created, **kwargs):
+    if created and Tag.objects.filter(
+        is_published(instance.article_id), id=instance.tag_id
+    ).update(article_count=F("article_count") + 1):
+        transaction.on_commit(tag_counts_changed)
+
+
+@receiver(post_delete, sender=TaggedItem)
+def decrement_tag_article_count(sender, instance, **kwargs):
+    # Deleting an article removes its tagged items while it still exists
+    if Tag.objects.filter(
+        is_published(instance.article_id), id=instance.tag_id, article_count__gt=0
+    ).update(article_count=F("article_count") - 1):
+        transaction.on_commit(tag_counts_changed)
+
+
+@receiver(post_save, sender=Article)
+def recount_tags_on_publication(sender, instance, created, **kwargs):
+    # Article.from_db() records the loaded status; new articles have no tags
+    # yet and an unknown status cannot tell whether the count changed
+    loaded_status = getattr(instance, "_loaded_status", None)
+    if created or loaded_status is None:
+        return
+    was_published = loaded_status == Article.Status.PUBLISHED
+    published = instance.status == Article.Status.PUBLISHED
+    if published == was_published:
+        return
+
+    tags = Tag.objects.filter(items__article_id=instance.id)
+    if published:
+        changed = tags.update(article_count=F("article_count") + 1)
+    else:
+        changed = tags.filter(article_count__gt=0).update(
+            article_count=F("article_count") - 1
+        )
+    if changed:
+        transaction.on_commit(tag_counts_changed)
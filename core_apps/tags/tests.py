@@ -1,3 +1,177 @@
-from django.test import TestCase
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+from core_apps.articles.models import Article
+from .autocomplete import MIN_REBUILD_INTERVAL, TagSuggester, TagSuggestions
+from .models import Tag, TaggedItem
+from .repository import TagRepository
 
-# Create your tests here.
+
+class TagSuggesterTest(SimpleTestCase):
+    def setUp(self):
+        self.suggester = TagSuggester(
+            [("python", 5), ("pytest", 9), ("django", 7), ("pyramid", 1)]
+        )
+
+    def test_suggest_ranks_prefix_matches_by_usage(self):
+        self.assertEqual(self.suggester.suggest("py"), ["pytest", "python", "pyramid"])
+        self.assertEqual(self.suggester.suggest("py", limit=1), ["pytest"])
+        self.assertEqual(self.suggester.suggest("rails"), [])
+
+    def test_suggest_normalizes_persian_input(self):
+        self.suggester.add("یادگیری", 3)
+        self.assertEqual(self.suggester.suggest("يادگ"), ["یادگیری"])
+
+    def test_added_tags_are_visible_immediately(self):
+        self.suggester.add("pydantic", 20)
+        self.assertEqual(self.suggester.suggest("pyd"), ["pydantic"])
+        self.assertEqual(self.suggester.suggest("py")[0], "pydantic")
+
+
+class TagCounterTest(TestCase):
+    def setUp(self):
+        self.python, self.django = Tag.objects.bulk_create(
+            [Tag(tag="python"), Tag(tag="django")]
+        )
+        self.articles = [
+            Article.objects.create(
+                title=f"Article {i}", slug=f"article-{i}", status=status
+            )
+            for i, status in enumerate(
+                [Article.Status.PUBLISHED] * 3 + [Article.Status.DRAFT]
+            )
+        ]
+        self.repository = TagRepository()
+
+    def tag(self, article, *tags):
+        with self.captureOnCommitCallbacks(execute=True):
+            for tag in tags:
+                TaggedItem.objects.create(article=article, tag=tag)
+
+    def counts(self):
+        return dict(Tag.objects.values_list("tag", "article_count"))
+
+    def test_counts_follow_tagging_untagging_and_deletes(self):
+        for article in self.articles:
+            self.tag(article, self.python)
+        self.tag(self.articles[0], self.django)
+        # The draft is not counted
+        self.assertEqual(self.counts(), {"python": 3, "django": 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TaggedItem.objects.filter(article=self.articles[1]).delete()
+            self.articles[0].delete()
+            self.articles[3].delete()
+        self.assertEqual(self.counts(), {"python": 1, "django": 0})
+
+    def test_counts_follow_publishing_and_unpublishing(self):
+        draft = self.articles[3]
+        self.tag(draft, self.python, self.django)
+        self.assertEqual(self.counts(), {"python": 0, "django": 0})
+
+        draft = Article.objects.get(pk=draft.pk)
+        draft.status = Article.Status.PUBLISHED
+        # Publishing also queues the timeline fan-out, which needs a broker
+        patcher = mock.patch("core_apps.timelines.signals.queue_fan_out")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.save()
+            draft.save()  # Already published: counted once
+        self.assertEqual(self.counts(), {"python": 1, "django": 1})
+        self.assertEqual(self.repository.popular_tags(1)[0]["article_count"], 1)
+
+        draft.status = Article.Status.DRAFT
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.save()
+        self.assertEqual(self.counts(), {"python": 0, "django": 0})
+        self.assertEqual(self.repository.popular_tags(10), [])
+
+    def test_popular_tags_are_cached_until_counts_change(self):
+        self.tag(self.articles[0], self.python)
+        self.assertEqual(
+            self.repository.popular_tags(10), [{"tag": "python", "article_count": 1}]
+        )
+        with self.assertNumQueries(0):
+            self.repository.popular_tags(10)
+
+        self.tag(self.articles[1], self.django)
+        self.tag(self.articles[2], self.django)
+        self.assertEqual(
+            [tag["tag"] for tag in self.repository.popular_tags(10)],
+            ["django", "python"],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TaggedItem.objects.filter(tag=self.python).delete()
+        self.assertEqual(
+            self.repository.popular_tags(10), [{"tag": "django", "article_count": 2}]
+        )
+
+    def test_articles_with_tags_requires_every_tag(self):
+        for article in self.articles:
+            self.tag(article, self.python)
+        self.tag(self.articles[1], self.django)
+        self.tag(self.articles[3], self.django)  # A draft
+
+        def ids(names):
+            return [a.id for a in self.repository.articles_with_tags(names)]
+
+        self.assertEqual(ids(["python", "django"]), [self.articles[1].id])
+        self.assertEqual(len(ids(["python"])), 3)
+        self.assertEqual(ids(["python", "rails"]), [])
+
+        response = APIClient().get("/api/v1/tags/articles/?tags=python&tags=django")
+        self.assertEqual(
+            [row["id"] for row in response.json()["results"]], [self.articles[1].id]
+        )
+
+
+class TagSuggestionsTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.python, self.pytest = Tag.objects.bulk_create(
+            [Tag(tag="python"), Tag(tag="pytest")]
+        )
+        self.articles = Article.objects.bulk_create(
+            [
+                Article(
+                    title=f"Article {i}",
+                    slug=f"article-{i}",
+                    status=Article.Status.PUBLISHED,
+                )
+                for i in range(2)
+            ]
+        )
+        TaggedItem.objects.create(article=self.articles[0], tag=self.python)
+        patcher = mock.patch("core_apps.tags.autocomplete.time.monotonic")
+        self.now = patcher.start()
+        self.now.return_value = 1000.0
+        self.addCleanup(patcher.stop)
+
+    def test_count_changes_reload_in_the_background(self):
+        suggestions = TagSuggestions()
+        self.assertEqual(suggestions.get().suggest("py"), ["python", "pytest"])
+
+        for article in self.articles:
+            TaggedItem.objects.create(article=article, tag=self.pytest)
+        self.now.return_value += MIN_REBUILD_INTERVAL + 1
+
+        with mock.patch.object(
+            suggestions, "_build", wraps=suggestions._build
+        ) as build:
+            # The stale copy is served while the reload runs
+            self.assertEqual(suggestions.get().suggest("py"), ["python", "pytest"])
+            suggestions._rebuild_thread.join()
+        build.assert_called_once()
+        self.assertEqual(suggestions.get().suggest("py"), ["pytest", "python"])
+
+    def test_reloads_are_rate_limited(self):
+        suggestions = TagSuggestions()
+        suggestions.get()
+        TaggedItem.objects.create(article=self.articles[1], tag=self.pytest)
+
+        self.now.return_value += MIN_REBUILD_INTERVAL / 2
+        suggestions.get()
+        self.assertIsNone(suggestions._rebuild_thread)
@@ -1,3 +1,77 @@
-from django.shortcuts import render
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.request import Request
+from rest_framework.response import Response
+from core_apps.articles.serializers import ArticleListSerializer
+from core_apps.common.pagination import KeysetPagination
+from .autocomplete import tag_suggestions
+from .repository import TagRepository
+from .serializers import (
+    PopularTagSerializer,
+    TagFilterSerializer,
+    TagSuggestQuerySerializer,
+)
 
-# Create your views here.
+POPULAR_TAGS_MAX_LIMIT = 100
+
+
+class TagViewSet(viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+    serializer_class = ArticleListSerializer
+    repository = TagRepository()
+
+    @action(methods=["GET"], detail=False)
+    def popular(self, request: Request) -> Response:
+        """
+        Get the most used tags.
+
+        Args:
+            request: The request object with an optional `limit` query param
+
+        Returns:
+            Response: Tags with their article counts, most used first
+        """
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            limit = 10
+        limit = min(max(limit, 1), POPULAR_TAGS_MAX_LIMIT)
+        tags = self.repository.popular_tags(limit)
+        return Response(PopularTagSerializer(tags, many=True).data)
+
+    @action(methods=["GET"], detail=False)
+    def articles(self, request: Request) -> Response:
+        """
+        List published articles carrying all the given tags, newest first.
+
+        Args:
+            request: The request object with repeated `tags` query params
+
+        Returns:
+            Response: A page of articles and the cursor link to the next one
+        """
+        serializer = TagFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        articles = self.repository.articles_with_tags(serializer.validated_data["tags"])
+        page = self.paginate_queryset(articles)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(methods=["GET"], detail=False)
+    def suggest(self, request: Request) -> Response:
+        """
+        Autocomplete tag names by prefix, most used first.
+
+        Args:
+            request: The request object with `q` and optional `limit` params
+
+        Returns:
+            Response: Matching tag names
+        """
+        serializer = TagSuggestQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        suggestions = tag_suggestions.get().suggest(
+            serializer.validated_data["q"], serializer.validated_data["limit"]
+        )
+        return Response(suggestions)
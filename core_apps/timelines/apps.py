@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class TimelinesConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core_apps.timelines"
+    verbose_name = _("Timelines")
+
+    def ready(self):
+        from core_apps.timelines import signals
@@ -0,0 +1,118 @@
+import heapq
+from typing import List, Optional, Protocol, Tuple
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from loguru import logger
+from core_apps.articles.models import Article, Author
+from core_apps.articles.repository import ArticleRepository
+from core_apps.common.pagination import Position, keyset_filter
+from core_apps.profiles.models import Follow, Profile
+from . import store
+
+User = get_user_model()
+
+
+class TimelineRepositoryProtocol(Protocol):
+    def fan_out_article(self, article_id: int) -> int: ...
+
+    def get_page(
+        self, user: User, before: Optional[Position], limit: int  # type: ignore
+    ) -> Tuple[List[Article], Optional[Position]]: ...
+
+
+class TimelineRepository:
+    def fan_out_article(self, article_id: int) -> int:
+        """
+        Push a published article onto its authors' followers' timelines.
+
+        Authors with TIMELINE_FANOUT_FOLLOWER_LIMIT followers or more are
+        skipped here; their articles are pulled at read time instead.
+        """
+        article = (
+            Article.objects.filter(id=article_id, status=Article.Status.PUBLISHED)
+            .only("id", "created_at")
+            .first()
+        )
+        if article is None:
+            return 0
+
+        author_ids = Author.objects.filter(article_id=article_id).values("user_id")
+        fan_out_author_ids = Profile.objects.filter(
+            user_id__in=author_ids,
+            follower_count__lt=settings.TIMELINE_FANOUT_FOLLOWER_LIMIT,
+        ).values("user_id")
+        follower_ids = (
+            Follow.objects.filter(followed_id__in=fan_out_author_ids)
+            .order_by("follower_id")
+            .values_list("follower_id", flat=True)
+            .distinct()
+        )
+
+        pushed, batch = 0, []
+        batch_size = settings.TIMELINE_FANOUT_BATCH_SIZE
+        for follower_id in follower_ids.iterator(chunk_size=batch_size):
+            batch.append(follower_id)
+            if len(batch) >= batch_size:
+                store.timeline_store.push(batch, article.id, article.created_at)
+                pushed, batch = pushed + len(batch), []
+        if batch:
+            store.timeline_store.push(batch, article.id, article.created_at)
+            pushed += len(batch)
+
+        logger.info(f"Fanned out article {article_id} to {pushed} timelines")
+        return pushed
+
+    def get_page(
+        self, user: User, before: Optional[Position], limit: int  # type: ignore
+    ) -> Tuple[List[Article], Optional[Position]]:
+        """
+        Merge the user's stored timeline with recent articles from
+        followed high-follower authors, newest first.
+
+        Both sources are read with `limit + 1` rows past the cursor, so
+        the cost depends on the page size, not on timeline length.
+        """
+        pushed = store.timeline_store.page(user.id, before, limit + 1)
+        pulled = self._pull_high_follower_articles(user, before, limit + 1)
+
+        positions, seen = [], set()
+        for position in heapq.merge(pushed, pulled, reverse=True):
+            if position[1] not in seen:
+                seen.add(position[1])
+                positions.append(position)
+            if len(positions) > limit:
+                break
+
+        page = positions[:limit]
+        next_position = page[-1] if len(positions) > limit else None
+
+        articles = ArticleRepository().list_articles_with_relations(
+            {
+                "id__in": [article_id for _, article_id in page],
+                "status": Article.Status.PUBLISHED,
+            }
+        )
+        by_id = {article.id: article for article in articles}
+        # Articles unpublished or deleted since fan-out are simply dropped
+        return [by_id[a_id] for _, a_id in page if a_id in by_id], next_position
+
+    def _pull_high_follower_articles(
+        self, user: User, before: Optional[Position], limit: int  # type: ignore
+    ) -> List[Position]:
+        followed_ids = Follow.objects.filter(
+            follower=user,
+            followed__profile__follower_count__gte=(
+                settings.TIMELINE_FANOUT_FOLLOWER_LIMIT
+            ),
+        ).values("followed_id")
+        articles = Article.objects.filter(
+            status=Article.Status.PUBLISHED,
+            id__in=Author.objects.filter(user_id__in=followed_ids).values("article_id"),
+        )
+        if before is not None:
+            articles = articles.filter(keyset_filter(before))
+        return list(
+            articles.order_by("-created_at", "-id").values_list("created_at", "id")[
+                :limit
+            ]
+        )
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from kombu.exceptions import OperationalError
+from loguru import logger
+from core_apps.articles.models import Article
+from .tasks import fan_out_article
+
+
+@receiver(post_save, sender=Article)
+def fan_out_published_article(sender, instance, created, **kwargs):
+    published = instance.status == Article.Status.PUBLISHED
+    # Article.from_db() records the loaded status; unknown counts as changed
+    loaded_status = getattr(instance, "_loaded_status", None)
+    if published and (created or loaded_status != instance.status):
+        transaction.on_commit(lambda: queue_fan_out(instance.id))
+
+
+def queue_fan_out(article_id: int) -> None:
+    # The article is already committed; a broker outage must not fail the
+    # request that published it
+    try:
+        fan_out_article.delay(article_id)
+    except OperationalError as error:
+        logger.error(f"Could not queue fan-out for article {article_id}: {error}")
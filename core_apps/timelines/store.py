@@ -0,0 +1,132 @@
+import bisect
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from loguru import logger
+from core_apps.common.pagination import Position
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Sorted-set members are article ids zero-padded to this width. Redis
+# orders members sharing a score as strings, so padding makes that order
+# numeric, matching the (created_at, id) order of everything else.
+MEMBER_WIDTH = 20
+
+
+def to_member(article_id: int) -> str:
+    return str(article_id).zfill(MEMBER_WIDTH)
+
+
+def to_score(created_at: datetime) -> int:
+    # Whole microseconds stay exact in a float64 sorted-set score
+    return (created_at - EPOCH) // timedelta(microseconds=1)
+
+
+def from_score(score: float) -> datetime:
+    return EPOCH + timedelta(microseconds=int(score))
+
+
+def _before(entries: List[Position], before: Optional[Position]) -> List[Position]:
+    if before is None:
+        return entries
+    return [entry for entry in entries if entry < before]
+
+
+class TimelineStoreProtocol(Protocol):
+    def push(
+        self, user_ids: Iterable[int], article_id: int, created_at: datetime
+    ) -> None: ...
+
+    def page(
+        self, user_id: int, before: Optional[Position], limit: int
+    ) -> List[Position]: ...
+
+
+class LocalTimelineStore:
+    """Per-process timelines, used when the default cache is not Redis."""
+
+    def __init__(self, max_length: int):
+        self.max_length = max_length
+        self._timelines: Dict[int, List[Tuple[int, int]]] = {}
+        self._lock = threading.Lock()
+
+    def push(
+        self, user_ids: Iterable[int], article_id: int, created_at: datetime
+    ) -> None:
+        entry = (to_score(created_at), article_id)
+        with self._lock:
+            for user_id in user_ids:
+                timeline = self._timelines.setdefault(user_id, [])
+                if entry not in timeline:
+                    bisect.insort(timeline, entry)
+                    del timeline[: -self.max_length]
+
+    def page(
+        self, user_id: int, before: Optional[Position], limit: int
+    ) -> List[Position]:
+        entries = [
+            (from_score(score), article_id)
+            for score, article_id in reversed(self._timelines.get(user_id, []))
+        ]
+        return _before(entries, before)[:limit]
+
+
+class RedisTimelineStore:
+    """
+    One capped sorted set per user: member is the padded article id, score
+    is the article's created_at in microseconds.
+    """
+
+    def __init__(self, max_length: int):
+        self.max_length = max_length
+
+    @property
+    def connection(self):
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    def key(self, user_id: int) -> str:
+        return cache.make_key(f"timeline:{user_id}")
+
+    def push(
+        self, user_ids: Iterable[int], article_id: int, created_at: datetime
+    ) -> None:
+        score = to_score(created_at)
+        pipe = self.connection.pipeline(transaction=False)
+        for user_id in user_ids:
+            key = self.key(user_id)
+            pipe.zadd(key, {to_member(article_id): score})
+            pipe.zremrangebyrank(key, 0, -(self.max_length + 1))
+        pipe.execute()
+
+    def page(
+        self, user_id: int, before: Optional[Position], limit: int
+    ) -> List[Position]:
+        key = self.key(user_id)
+        if before is None:
+            rows = self.connection.zrevrange(key, 0, limit - 1, withscores=True)
+            return [(from_score(score), int(member)) for member, score in rows]
+
+        # Entries sharing the cursor's score, then strictly older ones
+        cursor_score = to_score(before[0])
+        pipe = self.connection.pipeline(transaction=False)
+        pipe.zrevrangebyscore(key, cursor_score, cursor_score, withscores=True)
+        pipe.zrevrangebyscore(
+            key, f"({cursor_score}", "-inf", start=0, num=limit, withscores=True
+        )
+        ties, older = pipe.execute()
+        entries = [(from_score(score), int(member)) for member, score in ties + older]
+        return _before(entries, before)[:limit]
+
+
+def get_timeline_store() -> TimelineStoreProtocol:
+    if settings.CACHES["default"]["BACKEND"].startswith("django_redis"):
+        return RedisTimelineStore(settings.TIMELINE_MAX_LENGTH)
+    logger.warning("Timeline store is process-local; use Redis in production")
+    return LocalTimelineStore(settings.TIMELINE_MAX_LENGTH)
+
+
+timeline_store = get_timeline_store()
@@ -0,0 +1,7 @@
+from celery import shared_task
+from .repository import TimelineRepository
+
+
+@shared_task
+def fan_out_article(article_id: int) -> int:
+    return TimelineRepository().fan_out_article(article_id)
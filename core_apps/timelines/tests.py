@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from core_apps.articles.models import Article, Author
+from core_apps.profiles.repositories import FollowRepository
+from . import store
+from .repository import TimelineRepository
+from .store import LocalTimelineStore, RedisTimelineStore, to_member, to_score
+from .tasks import fan_out_article
+
+User = get_user_model()
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@override_settings(TIMELINE_FANOUT_FOLLOWER_LIMIT=3)
+class TimelineTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="secret-pass-123",
+            )
+            for i in range(5)
+        ]
+        self.reader, self.author, self.star = self.users[:3]
+        follows = FollowRepository()
+        follows.follow(self.reader, self.author)
+        # Three followers reach the limit: the star's articles are pulled
+        for follower in (self.reader, *self.users[3:]):
+            follows.follow(follower, self.star)
+
+        patcher = mock.patch.object(store, "timeline_store", LocalTimelineStore(100))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # No broker in tests: run fan-out inline, counting how often it is queued
+        patcher = mock.patch.object(
+            fan_out_article, "delay", side_effect=fan_out_article
+        )
+        self.fan_out = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def publish(self, author, title, created_at=None, status=Article.Status.PUBLISHED):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(title=title, slug=title, status=status)
+            Author.objects.create(article=article, user=author)
+            if created_at is not None:
+                Article.objects.filter(pk=article.pk).update(created_at=created_at)
+        return article
+
+    def stored_ids(self, user):
+        return [a_id for _, a_id in store.timeline_store.page(user.id, None, 100)]
+
+    def test_publishing_fans_out_to_followers(self):
+        article = self.publish(self.author, "pushed")
+
+        self.assertEqual(self.stored_ids(self.reader), [article.id])
+        self.assertEqual(self.stored_ids(self.users[3]), [])
+
+    def test_fan_out_waits_for_publication(self):
+        article = self.publish(self.author, "draft", status=Article.Status.DRAFT)
+        self.fan_out.assert_not_called()
+
+        article = Article.objects.get(pk=article.pk)
+        article.status = Article.Status.PUBLISHED
+        with self.captureOnCommitCallbacks(execute=True):
+            article.save()
+        # Saving an already published article does not fan out again
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.get(pk=article.pk).save()
+
+        self.fan_out.assert_called_once_with(article.id)
+        self.assertEqual(self.stored_ids(self.reader), [article.id])
+
+    def test_authors_at_the_follower_limit_are_pulled_at_read_time(self):
+        article = self.publish(self.star, "pulled")
+
+        self.assertEqual(self.stored_ids(self.reader), [])
+        page, _ = TimelineRepository().get_page(self.reader, None, 10)
+        self.assertEqual([a.id for a in page], [article.id])
+
+    def test_pages_merge_pushed_and_pulled_articles_newest_first(self):
+        articles = [
+            self.publish(
+                self.author if i % 2 else self.star,
+                f"article-{i}",
+                # Two pairs share a timestamp: id breaks the tie
+                created_at=T0 + timedelta(minutes=i // 2 * 2),
+            )
+            for i in range(6)
+        ]
+        expected = [
+            article.id
+            for article in sorted(
+                Article.objects.filter(pk__in=[a.pk for a in articles]),
+                key=lambda a: (a.created_at, a.id),
+                reverse=True,
+            )
+        ]
+
+        seen, before = [], None
+        for _ in range(len(articles)):
+            page, before = TimelineRepository().get_page(self.reader, before, 2)
+            seen += [article.id for article in page]
+            if before is None:
+                break
+        self.assertEqual(seen, expected)
+
+
+class RedisTimelineStoreTest(SimpleTestCase):
+    def test_members_sort_as_strings_in_numeric_order(self):
+        ids = [9, 10, 99, 100, 1234567]
+        self.assertEqual(sorted(ids, key=to_member), ids)
+
+    def test_cursor_page_keeps_older_ties_then_older_scores(self):
+        score = to_score(T0)
+        redis = mock.MagicMock()
+        redis.pipeline.return_value.execute.return_value = [
+            [(to_member(12).encode(), score), (to_member(9).encode(), score)],
+            [(to_member(30).encode(), score - 1)],
+        ]
+        with mock.patch.object(
+            RedisTimelineStore,
+            "connection",
+            new_callable=mock.PropertyMock,
+            return_value=redis,
+        ):
+            page = RedisTimelineStore(100).page(1, (T0, 10), 5)
+
+        self.assertEqual([article_id for _, article_id in page], [9, 30])
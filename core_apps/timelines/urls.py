@@ -0,0 +1,9 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import TimelineViewSet
+
+router = DefaultRouter()
+router.register(r"timeline", TimelineViewSet, basename="timeline")
+urlpatterns = [
+    path("", include(router.urls)),
+]
@@ -0,0 +1,47 @@
+from rest_framework import viewsets
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from django.utils.translation import gettext_lazy as _
+from core_apps.articles.serializers import ArticleListSerializer
+from core_apps.common.pagination import KeysetPagination, decode_cursor, encode_cursor
+from .repository import TimelineRepository
+
+
+class TimelineViewSet(viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticated]
+    serializer_class = ArticleListSerializer
+    repository = TimelineRepository()
+
+    def list(self, request: Request) -> Response:
+        """
+        Get the current user's home timeline, newest first.
+
+        Args:
+            request: The request object
+
+        Returns:
+            Response: A page of articles and the cursor link to the next one
+        """
+        paginator = KeysetPagination()
+        before = None
+        cursor = request.query_params.get(paginator.cursor_query_param)
+        if cursor:
+            before = decode_cursor(cursor)
+            if before is None:
+                raise NotFound(_("Invalid cursor"))
+
+        articles, next_position = self.repository.get_page(
+            request.user, before, paginator.get_page_size(request)
+        )
+        next_link = None
+        if next_position is not None:
+            next_link = replace_query_param(
+                request.build_absolute_uri(),
+                paginator.cursor_query_param,
+                encode_cursor(next_position),
+            )
+        serializer = self.get_serializer(articles, many=True)
+        return Response({"next": next_link, "results": serializer.data})
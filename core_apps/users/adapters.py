@@ -0,0 +1,49 @@
+import time
+from allauth.account.adapter import DefaultAccountAdapter
+from django.conf import settings
+from django.utils.translation import gettext as _
+from core_apps.common.outbox import outbox
+
+# Repeated reset requests for a user within this many seconds send one email
+PASSWORD_RESET_DEDUP_WINDOW = 60
+
+
+class AccountAdapter(DefaultAccountAdapter):
+    """Queues allauth's emails in the outbox instead of sending them inline."""
+
+    def send_mail(self, template_prefix, email, context):
+        message = self.render_mail(template_prefix, email, context)
+        html_body = next(
+            (
+                content
+                for content, mimetype in getattr(message, "alternatives", [])
+                if mimetype == "text/html"
+            ),
+            "",
+        )
+        outbox.enqueue(
+            message.subject,
+            message.body,
+            message.to,
+            html_body=html_body,
+            from_email=message.from_email,
+        )
+
+    def get_reset_password_from_key_url(self, key):
+        # Keys are "<uid>-<token>"; the page posts both to password_reset_confirm
+        uid, token = key.split("-", 1)
+        return settings.PASSWORD_RESET_URL.format(uid=uid, token=token)
+
+    def send_password_reset_mail(self, user, email, context):
+        request = context.get("request")
+        reset_url = context["password_reset_url"]
+        if request is not None:
+            reset_url = request.build_absolute_uri(reset_url)
+        window = int(time.time() // PASSWORD_RESET_DEDUP_WINDOW)
+        outbox.enqueue_template(
+            "password_reset_email.html",
+            {"user": user, "reset_url": reset_url},
+            subject=_("Password Reset Request"),
+            to=[email],
+            idempotency_key=f"password-reset:{user.pk}:{window}",
+        )
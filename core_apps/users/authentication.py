@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .repositories import UserRepository
+from .tokens import TOKEN_VERSION_CLAIM
+
+User = get_user_model()
+
+
+class LazyTokenUser(SimpleLazyObject):
+    """
+    `request.user` for token-authenticated requests.
+
+    `id`/`pk` come from the token. Reading any other attribute (or an
+    isinstance() check) loads the User row once, so views that only need
+    the id never query for it.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id: int):
+        super().__init__(lambda: User.objects.get(id=user_id))
+        # Set on the proxy itself; LazyObject.__setattr__ would load the row
+        self.__dict__["id"] = self.__dict__["pk"] = user_id
+
+    def __bool__(self) -> bool:
+        # Permission checks test `request.user and ...`
+        return True
+
+    def __eq__(self, other) -> bool:
+        if type(other) is LazyTokenUser:
+            return self.pk == other.pk
+        if isinstance(other, models.Model):
+            return other._meta.concrete_model is User and other.pk == self.pk
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.pk)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the per-request user query.
+
+    The token's version claim is checked against the user's current
+    token_version (cached, see UserRepository.get_token_version), which
+    also rejects deleted and deactivated users.
+    """
+
+    repository = UserRepository()
+
+    def get_user(self, validated_token) -> LazyTokenUser:
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        current = self.repository.get_token_version(user_id)
+        # Tokens issued before versioning carry no claim: version 0
+        if current is None or validated_token.get(TOKEN_VERSION_CLAIM, 0) != current:
+            raise AuthenticationFailed(
+                _("Token has been revoked."), code="token_revoked"
+            )
+        return LazyTokenUser(user_id)
@@ -1,29 +1,67 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 import re
 
 User = get_user_model()
 
+EMAIL_RE = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+
+# Columns read while logging in: the password check, user_can_authenticate(),
+# token minting and the login response. Anything else is deferred; the
+# last_login update is buffered (see signals.update_user_last_login).
+LOGIN_FIELDS = (
+    "id",
+    "password",
+    "username",
+    "email",
+    "is_active",
+    "token_version",
+)
+
 
 class EmailOrUsernameBackend(ModelBackend):
     @staticmethod
     def is_valid_email(value):
-        # Regex for email validation
-        email_regex = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-        return re.match(email_regex, value) is not None
+        return EMAIL_RE.match(value) is not None
+
+    def get_login_user(self, auth_value: str):
+        """
+        Find the user for an email or username with one indexed query.
+
+        Both unique columns are matched exactly; should an email-shaped
+        username collide with another user's email, the email wins for
+        email-shaped input.
+        """
+        is_email = self.is_valid_email(auth_value)
+        email = User.objects.normalize_email(auth_value) if is_email else auth_value
+        candidates = list(
+            User.objects.filter(Q(email=email) | Q(username=auth_value)).only(
+                *LOGIN_FIELDS
+            )[:2]
+        )
+        for user in candidates:
+            if (user.email == email) == is_email:
+                return user
+        return candidates[0] if candidates else None
 
     def authenticate(self, request, username=None, password=None, **kwargs):
         # Use the `username` parameter for both email and username authentication
-        auth_value = username or request.POST.get("username")
+        auth_value = username or kwargs.get(User.USERNAME_FIELD)
+        if auth_value is None and request is not None:
+            auth_value = request.POST.get("username")
+        if not auth_value or password is None:
+            return None
 
-        # Check if the auth_value is an email or username
-        if self.is_valid_email(auth_value):
-            user = User.objects.filter(email=auth_value).first()
-        else:
-            user = User.objects.filter(username=auth_value).first()
+        user = self.get_login_user(auth_value)
+        if user is None:
+            # Hash anyway, so response time does not reveal unknown logins
+            User().set_password(password)
+            return None
 
-        # Verify the password and return the user if valid
-        if user and user.check_password(password):
+        # check_password() rehashes and saves the password when the hasher
+        # or its parameters changed (see hashers.TunableArgon2PasswordHasher)
+        if user.check_password(password):
             return user if self.user_can_authenticate(user) else None
 
         return None
@@ -0,0 +1,4 @@
+from core_apps.common.buffers import get_timestamp_buffer
+
+# Latest login per user waiting to be written by flush_user_last_logins
+last_logins = get_timestamp_buffer("user_last_logins")
@@ -0,0 +1,89 @@
+import itertools
+import statistics
+import time
+import uuid
+from typing import List, Tuple
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from core_apps.users.models import User
+from core_apps.users.serializers import CustomLoginSerializer
+
+PASSWORD = "benchmark-login-password"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the login pipeline (user lookup, Argon2 check, token minting) "
+        "under one or more Argon2 parameter sets. Runs in a rolled back "
+        "transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=50)
+        parser.add_argument(
+            "--time-cost", type=int, nargs="+", default=[settings.ARGON2_TIME_COST]
+        )
+        parser.add_argument(
+            "--memory-cost",
+            type=int,
+            nargs="+",
+            default=[settings.ARGON2_MEMORY_COST],
+            help="KiB.",
+        )
+        parser.add_argument(
+            "--parallelism",
+            type=int,
+            nargs="+",
+            default=[settings.ARGON2_PARALLELISM],
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'time':>5} {'memory':>8} {'lanes':>5}"
+            f" {'p50 ms':>8} {'p99 ms':>8} {'cpu ms':>8}"
+        )
+        with transaction.atomic():
+            name = f"bench-{uuid.uuid4().hex[:12]}"
+            user = User.objects.create_user(
+                username=name, email=f"{name}@example.com", password=PASSWORD
+            )
+            for params in itertools.product(
+                options["time_cost"], options["memory_cost"], options["parallelism"]
+            ):
+                timings, cpu = self.measure(user, params, options["logins"])
+                percentiles = statistics.quantiles(timings, n=100)
+                self.stdout.write(
+                    f"{params[0]:>5} {params[1]:>8} {params[2]:>5}"
+                    f" {percentiles[49] * 1e3:>8.1f} {percentiles[98] * 1e3:>8.1f}"
+                    f" {cpu * 1e3:>8.1f}"
+                )
+            transaction.set_rollback(True)
+
+    def measure(
+        self, user: User, params: Tuple[int, int, int], logins: int
+    ) -> Tuple[List[float], float]:
+        time_cost, memory_cost, parallelism = params
+        with override_settings(
+            ARGON2_TIME_COST=time_cost,
+            ARGON2_MEMORY_COST=memory_cost,
+            ARGON2_PARALLELISM=parallelism,
+        ):
+            # Hash under these parameters first, as rehash-on-login would
+            user.set_password(PASSWORD)
+            user.save(update_fields=["password"])
+
+            timings = []
+            cpu_started = time.process_time()
+            for _ in range(logins):
+                started = time.perf_counter()
+                serializer = CustomLoginSerializer(
+                    data={"login": user.username, "password": PASSWORD},
+                    context={"request": None},
+                )
+                serializer.is_valid(raise_exception=True)
+                timings.append(time.perf_counter() - started)
+            # Includes the Argon2 lanes running on other threads
+            cpu = (time.process_time() - cpu_started) / logins
+        return timings, cpu
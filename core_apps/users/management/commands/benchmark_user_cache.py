@@ -0,0 +1,75 @@
+import random
+import statistics
+import time
+from typing import Callable, List
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from core_apps.users.models import User
+from core_apps.users.repositories import UserRepository, user_cache
+from core_apps.users.serializers import UserProfileSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare user lookups through the shared cache alone against the "
+        "two-tier (local LRU + shared cache) path."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lookups", type=int, default=20_000)
+        parser.add_argument(
+            "--users", type=int, default=500, help="Distinct users to look up."
+        )
+
+    def handle(self, *args, **options):
+        user_ids = list(
+            User.objects.order_by("id").values_list("id", flat=True)[: options["users"]]
+        )
+        if not user_ids:
+            self.stderr.write("No users to look up")
+            return
+        lookups = [random.choice(user_ids) for _ in range(options["lookups"])]
+
+        def serialize(user: User):
+            return UserProfileSerializer(user).data
+
+        def single_tier(user_id: int):
+            # The previous path: one round trip and unpickle per lookup
+            key = f"benchmark_user_{user_id}"
+            data = cache.get(key)
+            if data is None:
+                user = User.objects.select_related("profile").get(id=user_id)
+                data = serialize(user)
+                cache.set(key, data, timeout=60 * 5)
+            return data
+
+        def two_tier(user_id: int):
+            return repository.get_profile_data(user_id, serialize)
+
+        repository = UserRepository()
+        for user_id in user_ids:
+            repository.invalidate_user(user_id)
+
+        self.stdout.write(f"{'path':>12} {'p50 us':>10} {'p99 us':>10} {'ops/s':>10}")
+        self.report("single-tier", self.measure(single_tier, lookups))
+        self.report("two-tier", self.measure(two_tier, lookups))
+        self.stdout.write(str(user_cache.metrics()))
+
+        cache.delete_many([f"benchmark_user_{user_id}" for user_id in user_ids])
+
+    def measure(
+        self, lookup: Callable[[int], object], lookups: List[int]
+    ) -> List[float]:
+        timings = []
+        for user_id in lookups:
+            started = time.perf_counter()
+            lookup(user_id)
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def report(self, name: str, timings: List[float]) -> None:
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"{name:>12} {percentiles[49] * 1e6:>10.1f} {percentiles[98] * 1e6:>10.1f}"
+            f" {len(timings) / sum(timings):>10.0f}"
+        )
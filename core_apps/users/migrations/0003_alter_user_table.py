@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-18 16:28
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_alter_user_options"),
+    ]
+
+    operations = [
+        migrations.AlterModelTable(
+            name="user",
+            table="user",
+        ),
+    ]
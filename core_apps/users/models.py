@@ -19,6 +19,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     last_login = models.DateTimeField(_("last login"), blank=True, null=True)
+    # Carried in issued JWTs; bumping it revokes every token issued before
+    token_version = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
@@ -29,6 +31,8 @@ class User(AbstractBaseUser, PermissionsMixin):
         db_table = "user"
         verbose_name = _("User")
         verbose_name_plural = _("Users")
+        # Backs keyset pagination over (created_at, id)
+        indexes = [models.Index(fields=["created_at", "id"])]
 
     @property
     def full_name(self):
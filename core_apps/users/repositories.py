@@ -1,9 +1,41 @@
-from django.core.cache import cache
+from core_apps.common.cache_keys import cache_keys
+from core_apps.common.tiered_cache import TwoTierCache, invalidation_bus
 from .models import User
-from typing import Any, Optional, List, Protocol
-from django.db import transaction
-from loguru import logger
-import json
+from django.db.models import Case, F, QuerySet, Value, When
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+from django.db import connection, models, transaction
+from datetime import datetime
+
+
+# Local LRU in front of Redis holding serializer output, never model
+# instances. Keys are versioned by user_tag(), so invalidate_user()
+# retires all of a user's entries on every worker.
+user_cache = TwoTierCache("users", invalidation_bus, timeout=60 * 5)
+
+# Current token_version per user, checked on every JWT request. Revoking
+# evicts it everywhere at once; the timeouts bound how long deactivating
+# a user by other means takes to apply.
+token_versions = TwoTierCache(
+    "token_versions", invalidation_bus, local_ttl=10, timeout=60
+)
+
+
+# Rows touched by a single bulk timestamp UPDATE
+TIMESTAMP_UPDATE_BATCH_SIZE = 1000
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
 
 
 class UserRepositoryProtocol(Protocol):
@@ -15,35 +47,47 @@ class UserRepositoryProtocol(Protocol):
 
     def delete_user(self, id: int) -> bool: ...
 
-    def list_users(self, **filters: Any) -> dict[Optional[list], bool]: ...
+    def get_all_users(self) -> QuerySet: ...
+
+    def list_users(self, **filters: Any) -> QuerySet: ...
+
+    def export_users(
+        self, fields: Sequence[str], chunk_size: int = 2000, **filters: Any
+    ) -> Iterator[Dict[str, Any]]: ...
+
+    def get_user_with_profile(self, user_id: int) -> Optional[User]: ...
+
+    def get_profile_data(
+        self, user_id: int, serialize: Callable[[User], Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]: ...
+
+    def get_user_with_followers(self, user_id: int) -> Optional[User]: ...
+
+    def cached(self, name: str, user_id: int, loader: Callable[[], Any]) -> Any: ...
+
+    def invalidate_user(self, user_id: int) -> None: ...
 
-    def get_user_with_profile(user_id: int) -> Optional[User]: ...
+    def invalidate_users(self, user_ids: Iterable[int]) -> None: ...
 
-    def get_user_with_followers(user_id: int) -> Optional[User]: ...
+    def get_token_version(self, user_id: int) -> Optional[int]: ...
+
+    def revoke_tokens(self, user_id: int) -> None: ...
+
+    def set_timestamps(self, field: str, stamps: Dict[int, datetime]) -> int: ...
 
 
 class UserRepository:
     def create_user(self, **kwargs) -> User:
-        return User.objects.create_user(**kwargs)
+        user = User.objects.create_user(**kwargs)
+        # Lookups of a missing id are cached as None
+        self.invalidate_user(user.id)
+        return user
 
     def get_by_id(self, user_id: int) -> Optional[User]:
-        cache_key = f"user_{user_id}"
-        user = cache.get(cache_key)
+        return User.objects.filter(id=user_id).first()
 
-        if not user:
-            user = User.objects.filter(id=user_id).first()
-            if user:
-                cache.set(cache_key, user, timeout=60 * 5)  # Cache for 5 min
-        return user
-
-    def get_all_users(self) -> List[User]:
-        cache_key = "all_users"
-        users = cache.get(cache_key)
-        if users is None:
-            users = list(User.objects.all())
-            if len(users) < 1000:
-                cache.set(cache_key, users, timeout=60 * 5)  # 5 minutes
-        return users
+    def get_all_users(self) -> QuerySet:
+        return self.list_users()
 
     def update_user(self, user: User, user_data: dict[str:Any]) -> User:
         with transaction.atomic():
@@ -52,50 +96,129 @@ class UserRepository:
 
             [setattr(user, key, value) for key, value in user_data.items()]
             user.save()
-            cache.delete(f"user_{user.id}")
-            cache.delete("all_users")
+            # Invalidating before commit lets a concurrent read re-cache
+            # the old row
+            transaction.on_commit(lambda: self.invalidate_user(user.id))
             return user
 
     def delete_user(self, id: int) -> bool:
         try:
             User.objects.get(id=id).delete()
-            return True
-
-            cache.delete(f"user_{id}")
-            cache.delete("all_users")
         except User.DoesNotExist:
             return False
-
-    def list_users(self, **filters: Any) -> Optional[List[User]]:
-        try:
-            # Generate a cache key based on the filters
-            cache_key = f"users_{json.dumps(filters, sort_keys=True)}"
-            users = cache.get(cache_key)
-
-            if not users:
-                users = list(User.objects.filter(**filters))
-                # Cache for 5 minutes, but only if the list is not too large
-                if len(users) < 1000:
-                    cache.set(cache_key, users, timeout=60 * 5)
-
-            return users
-        except Exception as e:
-            logger.error(f"Error listing users: {e}")
-            return None
+        self.invalidate_user(id)
+        token_versions.delete(f"token_version:{id}")
+        return True
+
+    def list_users(self, **filters: Any) -> QuerySet:
+        # Lazy and ordered for keyset pagination; callers slice a page
+        # instead of loading (and caching) every matching user.
+        return User.objects.filter(**filters).order_by("-created_at", "-id")
+
+    def export_users(
+        self, fields: Sequence[str], chunk_size: int = 2000, **filters: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream matching users as dicts with a server-side cursor."""
+        return (
+            User.objects.filter(**filters)
+            .order_by("id")
+            .values(*fields)
+            .iterator(chunk_size=chunk_size)
+        )
 
     # Select related for reducing queries
-    def get_user_with_profile(user_id: int) -> Optional[User]:
-        cache_key = f"user_with_profile_{user_id}"
-        user = cache.get(cache_key)
+    def get_user_with_profile(self, user_id: int) -> Optional[User]:
+        return User.objects.select_related("profile").filter(id=user_id).first()
 
-        if not user:
-            user = User.objects.select_related("profile").filter(id=user_id).first()
-            if user:
-                # Cache for 5 minutes
-                cache.set(cache_key, user, timeout=60 * 5)
+    def get_profile_data(
+        self, user_id: int, serialize: Callable[[User], Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Cached `serialize(user)` output, or None if the user is missing."""
 
-        return user
+        def load():
+            user = self.get_user_with_profile(user_id)
+            return None if user is None else serialize(user)
+
+        return self.cached("profile_data", user_id, load)
 
     # Prefetch related for many-to-many relationships
-    def get_user_with_followers(user_id: int) -> Optional[User]:
+    def get_user_with_followers(self, user_id: int) -> Optional[User]:
         return User.objects.prefetch_related("follow").filter(id=user_id).first()
+
+    def cached(self, name: str, user_id: int, loader: Callable[[], Any]) -> Any:
+        """
+        Read-through cache for anything derived from one user's data.
+        `loader` must return plain JSON data, e.g. serializer output.
+
+        The key carries the user's version, so it must not be deleted by
+        hand; invalidate_user() retires it along with every other entry.
+        """
+        key = cache_keys.make_key(name, user_id, tags=[user_tag(user_id)])
+        return user_cache.get_or_set(key, loader)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.invalidate_users([user_id])
+
+    def invalidate_users(self, user_ids: Iterable[int]) -> None:
+        cache_keys.invalidate(user_tag(user_id) for user_id in user_ids)
+
+    def get_token_version(self, user_id: int) -> Optional[int]:
+        """The version tokens must carry, or None if the user cannot log in."""
+        return token_versions.get_or_set(
+            f"token_version:{user_id}",
+            lambda: User.objects.filter(id=user_id, is_active=True)
+            .values_list("token_version", flat=True)
+            .first(),
+        )
+
+    def set_timestamps(self, field: str, stamps: Dict[int, datetime]) -> int:
+        """
+        Write per-user activity timestamps (e.g. last_login) in bulk,
+        without moving any of them backwards on PostgreSQL.
+        """
+        if not isinstance(User._meta.get_field(field), models.DateTimeField):
+            raise ValueError(f"{field} is not a timestamp field")
+
+        items = sorted(stamps.items())
+        updated = 0
+        for start in range(0, len(items), TIMESTAMP_UPDATE_BATCH_SIZE):
+            batch = items[start : start + TIMESTAMP_UPDATE_BATCH_SIZE]
+            if connection.vendor == "postgresql":
+                updated += self._set_timestamps_from_values(field, batch)
+            else:
+                updated += User.objects.filter(
+                    id__in=[user_id for user_id, _ in batch]
+                ).update(
+                    **{
+                        field: Case(
+                            *[
+                                When(id=user_id, then=Value(stamp))
+                                for user_id, stamp in batch
+                            ],
+                            output_field=models.DateTimeField(),
+                        )
+                    }
+                )
+        return updated
+
+    def _set_timestamps_from_values(
+        self, field: str, batch: Sequence[Tuple[int, datetime]]
+    ) -> int:
+        # One UPDATE ... FROM (VALUES ...) joined on the primary key
+        column = connection.ops.quote_name(User._meta.get_field(field).column)
+        table = connection.ops.quote_name(User._meta.db_table)
+        values = ", ".join(["(%s, %s::timestamptz)"] * len(batch))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} AS u SET {column} = v.stamp "
+                f"FROM (VALUES {values}) AS v(id, stamp) "
+                f"WHERE u.id = v.id "
+                f"AND (u.{column} IS NULL OR u.{column} < v.stamp)",
+                [param for row in batch for param in row],
+            )
+            return cursor.rowcount
+
+    def revoke_tokens(self, user_id: int) -> None:
+        """Invalidate every JWT issued to the user so far."""
+        User.objects.filter(id=user_id).update(token_version=F("token_version") + 1)
+        token_versions.delete(f"token_version:{user_id}")
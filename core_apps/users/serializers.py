@@ -4,7 +4,6 @@ from allauth.account.adapter import get_adapter
 from allauth.account.utils import setup_user_email
 from dj_rest_auth.registration.serializers import RegisterSerializer
 from dj_rest_auth.serializers import LoginSerializer, PasswordChangeSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
 from dj_rest_auth.serializers import (
     PasswordResetSerializer,
     PasswordResetConfirmSerializer,
@@ -17,9 +16,9 @@ from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from typing import Dict, Any
 from django.contrib.auth import get_user_model
-from .tasks import send_password_reset_email
+from .tokens import VersionedRefreshToken
 from django.db import transaction
-from profiles.models import Profile
+from core_apps.profiles.models import Profile
 
 User = get_user_model()
 
@@ -37,11 +36,28 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
+class StaffUserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = (
+            "id",
+            "username",
+            "email",
+            "first_name",
+            "last_name",
+            "is_active",
+            "is_staff",
+            "created_at",
+            "last_login",
+        )
+        read_only_fields = fields
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     avatar = serializers.ImageField(source="profile.avatar", required=False)
     phone_number = serializers.CharField(source="profile.phone_number", required=False)
     gender = serializers.ChoiceField(
-        source="profile.gender", choices=Profile.gender.choices, required=False
+        source="profile.gender", choices=Profile.Gender.choices, required=False
     )
 
     class Meta:
@@ -139,7 +155,7 @@ class CustomLoginSerializer(LoginSerializer):
     )
 
     def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
-        login: str = attrs.get("username")
+        login: str = attrs.get("login") or attrs.get("username")
         password: str = attrs.get("password")
 
         if login and password:
@@ -157,7 +173,8 @@ class CustomLoginSerializer(LoginSerializer):
                 _('Must include "email" and "password".'), code="authorization"
             )
 
-        refresh = RefreshToken.for_user(user)
+        self.user = user
+        refresh = VersionedRefreshToken.for_user(user)
         return {
             "access": str(refresh.access_token),
             "refresh": str(refresh),
@@ -179,17 +196,15 @@ class CustomPasswordResetSerializer(PasswordResetSerializer):
         return value
 
     def save(self) -> None:
-        """Use allauth's form to generate and send the reset email via Celery."""
+        """
+        Use allauth's form to generate the reset key; the email is queued in
+        the outbox and sent by Celery (see adapters.AccountAdapter).
+        """
         request = self.context.get("request")
         email = self.validated_data["email"]
         reset_form = ResetPasswordForm(data={"email": email})
         if reset_form.is_valid():
-            reset_form.save(
-                request=request,
-                use_https=request.is_secure(),
-                from_email=None,  # Uses settings.DEFAULT_FROM_EMAIL
-            )
-        send_password_reset_email.delay(email, reset_form.generate_reset_url(request))
+            reset_form.save(request=request)
 
 
 class CustomPasswordResetConfirmSerializer(PasswordResetConfirmSerializer):
@@ -256,4 +271,5 @@ class CustomPasswordChangeSerializer(PasswordChangeSerializer):
 
         if not self.context["request"].user.check_password(attrs["old_password"]):
             raise ValidationError(_("Old password is incorrect."))
-        return attrs
+        # Builds the SetPasswordForm that save() writes the password with
+        return super().validate(attrs)
@@ -1,10 +1,13 @@
 from django.dispatch import Signal, receiver
 from django.utils import timezone
+from . import buffers
 
 user_login_signal = Signal()
 
 
 @receiver(user_login_signal)
 def update_user_last_login(sender, instance, request, **kwargs):
+    # Buffered, and coalesced per user; flush_user_last_logins writes
+    # them in bulk
     instance.last_login = timezone.now()
-    instance.save(update_fields=["last_login"])
+    buffers.last_logins.record(instance.id, instance.last_login.timestamp())
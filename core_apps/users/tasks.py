@@ -1,17 +1,22 @@
+from datetime import datetime, timezone
 from celery import shared_task
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
+from loguru import logger
+from . import buffers
+from .repositories import UserRepository
 
 
 @shared_task
-def send_password_reset_email(user_id: int, reset_url: str) -> None:
-    user = User.objects.get(id=user_id)
-    subject = "Password Reset Request"
-    message = render_to_string(
-        "registration/password_reset_email.html",
-        {"user": user, "reset_url": reset_url},
-    )
-    send_mail(subject, message, "noreply@example.com", [user.email])
+def flush_user_last_logins() -> int:
+    """Write buffered login times to the database in bulk UPDATEs."""
+    with buffers.last_logins.draining() as pending:
+        if pending:
+            UserRepository().set_timestamps(
+                "last_login",
+                {
+                    user_id: datetime.fromtimestamp(stamp, tz=timezone.utc)
+                    for user_id, stamp in pending.items()
+                },
+            )
+    if pending:
+        logger.info(f"Flushed last logins for {len(pending)} users")
+    return len(pending)
@@ -1,3 +1,398 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest import mock
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from . import buffers
+from .authentication import LazyTokenUser
+from .backends import EmailOrUsernameBackend
+from .models import User
+from .repositories import UserRepository, token_versions, user_cache
+from .serializers import UserProfileSerializer
+from .tasks import flush_user_last_logins
+from .throttling import login_lockout
+from .tokens import VersionedRefreshToken
+from core_apps.common.buffers import LocalTimestampBuffer
+from core_apps.common.models import OutboxEmail
+from core_apps.common.tasks import send_outbox_emails
+from core_apps.common.throttling import LocalRateCounter
 
-# Create your tests here.
+
+class StaffUserListingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="secret-pass-123"
+        )
+        cls.member = User.objects.create_user(
+            username="member", email="member@example.com", password="secret-pass-123"
+        )
+        for i in range(5):
+            User.objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="secret-pass-123",
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_export_streams_ndjson_and_csv(self):
+        self.client.force_authenticate(self.staff)
+
+        response = self.client.get("/api/v1/users/export/")
+        self.assertTrue(response.streaming)
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[0]["username"], "admin")
+        self.assertNotIn("password", rows[0])
+
+        response = self.client.get("/api/v1/users/export/", {"type": "csv"})
+        body = b"".join(response.streaming_content).decode()
+        reader = csv.DictReader(io.StringIO(body))
+        self.assertEqual(len(list(reader)), 7)
+        self.assertIn("attachment", response["Content-Disposition"])
+
+    def test_export_and_listing_are_staff_only(self):
+        self.client.force_authenticate(self.member)
+        self.assertEqual(self.client.get("/api/v1/users/export/").status_code, 403)
+        self.assertEqual(self.client.get("/api/v1/users/").status_code, 403)
+
+    def test_listing_pages_from_the_database(self):
+        self.client.force_authenticate(self.staff)
+
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get("/api/v1/users/", {"page_size": 4}).json()
+        self.assertEqual(len(first["results"]), 4)
+        self.assertTrue(any("LIMIT 5" in q["sql"] for q in queries.captured_queries))
+
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(len(second["results"]), 3)
+        self.assertIsNone(second["next"])
+
+
+class UserCacheTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="cached", email="cached@example.com", password="secret-pass-123"
+        )
+        self.repository = UserRepository()
+        self.repository.invalidate_user(self.user.id)
+
+    def profile_data(self, user_id: int):
+        return self.repository.get_profile_data(
+            user_id, lambda user: UserProfileSerializer(user).data
+        )
+
+    def test_cached_lookups_skip_the_database(self):
+        self.profile_data(self.user.id)
+        with self.assertNumQueries(0):
+            data = self.profile_data(self.user.id)
+        self.assertEqual(data["username"], "cached")
+
+    def test_updates_evict_cached_user(self):
+        self.profile_data(self.user.id)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.repository.update_user(self.user, {"first_name": "Renamed"})
+        # Evicted only once the update has committed
+        self.assertEqual(len(callbacks), 1)
+
+        self.assertEqual(self.profile_data(self.user.id)["first_name"], "Renamed")
+
+    def test_one_invalidation_retires_every_derived_key(self):
+        loader = mock.Mock(return_value={"id": self.user.id})
+        self.repository.cached("profile_data", self.user.id, loader)
+        self.repository.cached("followers", self.user.id, loader)
+        other = self.repository.cached("profile_data", self.user.id + 1, loader)
+
+        self.repository.invalidate_user(self.user.id)
+
+        self.repository.cached("profile_data", self.user.id, loader)
+        self.repository.cached("followers", self.user.id, loader)
+        self.repository.cached("profile_data", self.user.id + 1, loader)
+        self.assertEqual(loader.call_count, 5)  # Other users stay cached
+        self.assertEqual(other, {"id": self.user.id})
+
+    def test_delete_user_clears_the_cache(self):
+        self.profile_data(self.user.id)
+        self.assertTrue(self.repository.delete_user(self.user.id))
+        self.assertIsNone(self.profile_data(self.user.id))
+
+    def test_profile_view_caches_under_the_numeric_id(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = f"/api/v1/users/0{self.user.id}/profile/"
+        self.assertEqual(client.get(url).json()["first_name"], "")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.repository.update_user(self.user, {"first_name": "Renamed"})
+
+        self.assertEqual(client.get(url).json()["first_name"], "Renamed")
+        self.assertEqual(client.get("/api/v1/users/abc/profile/").status_code, 404)
+
+
+class LoginPipelineTest(TestCase):
+    ARGON2 = {
+        "PASSWORD_HASHERS": ["core_apps.users.hashers.TunableArgon2PasswordHasher"],
+        "ARGON2_TIME_COST": 1,
+        "ARGON2_MEMORY_COST": 64,
+        "ARGON2_PARALLELISM": 1,
+    }
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="writer", email="writer@example.com", password="secret-pass-123"
+        )
+        self.backend = EmailOrUsernameBackend()
+
+    def test_email_or_username_is_one_narrow_query(self):
+        for login in ("writer", "writer@EXAMPLE.com"):
+            with CaptureQueriesContext(connection) as queries:
+                user = self.backend.authenticate(
+                    None, username=login, password="secret-pass-123"
+                )
+            self.assertEqual(user, self.user)
+            self.assertEqual(len(queries), 1)
+            self.assertNotIn('"created_at"', queries[0]["sql"])
+
+        self.assertIsNone(
+            self.backend.authenticate(None, username="writer", password="wrong")
+        )
+
+    def test_email_shaped_username_does_not_shadow_an_email(self):
+        User.objects.create_user(
+            username="writer@example.com",
+            email="other@example.com",
+            password="other-pass-123",
+        )
+        user = self.backend.authenticate(
+            None, username="writer@example.com", password="secret-pass-123"
+        )
+        self.assertEqual(user, self.user)
+
+    def test_changed_argon2_parameters_rehash_on_login(self):
+        with override_settings(**self.ARGON2):
+            self.user.set_password("secret-pass-123")
+            self.user.save()
+            self.assertIn("t=1", self.user.password)
+
+            with override_settings(ARGON2_TIME_COST=2):
+                self.backend.authenticate(
+                    None, username="writer", password="secret-pass-123"
+                )
+
+        self.user.refresh_from_db()
+        self.assertIn("t=2", self.user.password)
+
+
+class StatelessJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com", password="secret-pass-123"
+        )
+        # Versions cached by earlier tests' rolled-back users share these ids
+        cache.clear()
+        token_versions.local.clear()
+        user_cache.local.clear()
+        self.client = APIClient()
+        self.authorize(self.user)
+
+    def authorize(self, user: User) -> None:
+        token = VersionedRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_cached_requests_do_not_load_the_user(self):
+        self.assertEqual(self.client.get("/api/v1/users/me/").status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/users/me/")
+        self.assertEqual(response.json()["username"], "reader")
+
+    def test_lazy_user_loads_the_row_once_when_needed(self):
+        user = LazyTokenUser(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual(user.pk, self.user.id)
+            self.assertEqual(user, self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "reader@example.com")
+            self.assertEqual(user.username, "reader")
+
+    def test_logout_revokes_issued_tokens(self):
+        self.assertEqual(self.client.post("/api/v1/users/logout/").status_code, 205)
+        self.assertEqual(self.client.get("/api/v1/users/me/").status_code, 401)
+
+        self.user.refresh_from_db()
+        self.authorize(self.user)  # Logging in again issues a current token
+        self.assertEqual(self.client.get("/api/v1/users/me/").status_code, 200)
+
+    def test_password_change_revokes_issued_tokens(self):
+        response = self.client.post(
+            "/api/v1/users/password_change/",
+            {
+                "old_password": "secret-pass-123",
+                "new_password1": "fresh-pass-456",
+                "new_password2": "fresh-pass-456",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("fresh-pass-456"))
+        self.assertEqual(self.client.get("/api/v1/users/me/").status_code, 401)
+
+    def test_password_change_checks_the_old_password(self):
+        response = self.client.post(
+            "/api/v1/users/password_change/",
+            {
+                "old_password": "wrong",
+                "new_password1": "fresh-pass-456",
+                "new_password2": "fresh-pass-456",
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/users/me/").status_code, 200)
+
+    def test_deactivated_users_are_rejected(self):
+        self.assertEqual(self.client.get("/api/v1/users/me/").status_code, 200)
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        # Deactivation applies once the cached version expires
+        token_versions.delete(f"token_version:{self.user.id}")
+
+        self.assertEqual(self.client.get("/api/v1/users/me/").status_code, 401)
+
+
+@override_settings(
+    LOGIN_ATTEMPTS=2, LOGIN_ACCOUNT_ATTEMPTS=3, LOCKOUT_DURATION=timedelta(minutes=1)
+)
+class LoginLockoutTest(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username="guarded", email="guarded@example.com", password="secret-pass-123"
+        )
+        patcher = mock.patch.object(login_lockout, "counter", LocalRateCounter())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+
+    def login(self, password: str, address: str = "127.0.0.1"):
+        return self.client.post(
+            "/api/v1/users/login/",
+            {"login": "guarded", "password": password},
+            REMOTE_ADDR=address,
+        )
+
+    def test_repeated_failures_lock_the_login_out(self):
+        self.assertEqual(self.login("wrong").status_code, 400)
+        self.assertEqual(self.login("wrong").status_code, 400)
+
+        response = self.login("secret-pass-123")
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+    def test_successful_login_clears_failures(self):
+        self.assertEqual(self.login("wrong").status_code, 400)
+        self.assertEqual(self.login("secret-pass-123").status_code, 200)
+        self.assertEqual(self.login("wrong").status_code, 400)
+        self.assertEqual(self.login("secret-pass-123").status_code, 200)
+
+    def test_failures_across_addresses_lock_the_login_out_for_everyone(self):
+        for address in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            self.assertEqual(self.login("wrong", address).status_code, 400)
+
+        self.assertEqual(self.login("secret-pass-123", "10.0.0.4").status_code, 429)
+
+
+class LastLoginBufferTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f"member{i}",
+                email=f"member{i}@example.com",
+                password="secret-pass-123",
+            )
+            for i in range(3)
+        ]
+        patcher = mock.patch.object(buffers, "last_logins", LocalTimestampBuffer())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(login_lockout, "counter", LocalRateCounter())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_login_does_not_write_the_user_row(self):
+        client = APIClient()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                "/api/v1/users/login/",
+                {"login": "member0", "password": "secret-pass-123"},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(
+            [query for query in queries if query["sql"].startswith("UPDATE")]
+        )
+        self.assertGreater(buffers.last_logins.pending(self.users[0].id), 0)
+
+    def test_logins_are_coalesced_and_written_in_bulk(self):
+        base = 1_700_000_000.0
+        for user in self.users:
+            for offset in (30, 10, 20):
+                buffers.last_logins.record(user.id, base + user.id + offset)
+
+        with CaptureQueriesContext(connection) as flush:
+            self.assertEqual(flush_user_last_logins(), len(self.users))
+        writes = [
+            query
+            for query in flush.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(writes), 1)
+
+        for user in self.users:
+            user.refresh_from_db()
+            self.assertEqual(user.last_login.timestamp(), base + user.id + 30)
+        self.assertEqual(flush_user_last_logins(), 0)
+
+
+class PasswordResetEmailTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="forgetful",
+            email="forgetful@example.com",
+            password="secret-pass-123",
+        )
+        self.client = APIClient()
+
+    def request_reset(self):
+        # No broker in tests: the queued dispatch is checked, then run inline
+        with mock.patch("core_apps.common.tasks.send_outbox_emails.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    "/api/v1/users/password_reset/", {"email": self.user.email}
+                )
+        return response, delay.called
+
+    def test_reset_sends_one_email(self):
+        response, queued = self.request_reset()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(queued)
+        # A double submit within the window is deduplicated
+        response, queued = self.request_reset()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(queued)
+
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+        self.assertEqual(send_outbox_emails(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, [self.user.email])
+        self.assertIn("/password-reset/", message.body)
+        self.assertIn("forgetful", message.alternatives[0][0])
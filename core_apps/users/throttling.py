@@ -0,0 +1,50 @@
+from typing import List, Optional, Tuple
+from django.conf import settings
+from core_apps.common.throttling import RateCounterProtocol, rate_counter
+
+
+class LoginLockout:
+    """
+    Locks a login out for a client after LOGIN_ATTEMPTS attempts within a
+    sliding LOCKOUT_DURATION window, and for everyone after
+    LOGIN_ACCOUNT_ATTEMPTS.
+
+    The per-client count keeps someone failing on purpose elsewhere from
+    locking the account owner out; the much higher per-login ceiling
+    bounds guessing spread across many addresses. Attempts are counted
+    before the credentials are checked, so concurrent requests cannot all
+    pass the check, and a successful login resets both counts.
+    """
+
+    def __init__(self, counter: Optional[RateCounterProtocol] = None):
+        self.counter = counter or rate_counter
+
+    @property
+    def window(self) -> float:
+        return settings.LOCKOUT_DURATION.total_seconds()
+
+    def limits(self, login: str, ident: str) -> List[Tuple[str, int]]:
+        login = login.strip().lower()
+        return [
+            (f"login_attempts:{ident}:{login}", settings.LOGIN_ATTEMPTS),
+            (f"login_attempts:account:{login}", settings.LOGIN_ACCOUNT_ATTEMPTS),
+        ]
+
+    def attempt(self, login: str, ident: str) -> float:
+        """
+        Count an attempt; returns the seconds the client must wait if it is
+        over either limit, or 0 if the credentials may be checked.
+        """
+        retry_after = 0.0
+        for key, limit in self.limits(login, ident):
+            count = self.counter.hit(key, self.window)
+            if count.estimate > limit:
+                retry_after = max(retry_after, count.retry_after(limit))
+        return retry_after
+
+    def reset(self, login: str, ident: str) -> None:
+        for key, _ in self.limits(login, ident):
+            self.counter.reset(key, self.window)
+
+
+login_lockout = LoginLockout()
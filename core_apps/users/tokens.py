@@ -0,0 +1,17 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+TOKEN_VERSION_CLAIM = "token_version"
+
+
+class VersionedRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user's token_version; access tokens made
+    from it copy the claim. StatelessJWTAuthentication rejects tokens whose
+    version is behind the user's current one.
+    """
+
+    @classmethod
+    def for_user(cls, user) -> "VersionedRefreshToken":
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
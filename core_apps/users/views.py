@@ -1,68 +1,102 @@
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.serializers import Serializer
 from typing import Optional, List, Any, Type
 from .serializers import (
+    StaffUserSerializer,
     UserSerializer,
     UserProfileSerializer,
     CustomLoginSerializer,
     CustomRegisterSerializer,
-    PasswordResetSerializer,
+    CustomPasswordChangeSerializer,
+    CustomPasswordResetSerializer,
     PasswordResetConfirmSerializer,
 )
 from rest_framework.decorators import action
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import (
+    AllowAny,
+    IsAdminUser,
+    IsAuthenticated,
+)
+from rest_framework.exceptions import NotFound, Throttled, ValidationError
+from rest_framework.throttling import BaseThrottle
+from django.http import StreamingHttpResponse
+from core_apps.common.exports import streaming_export
+from core_apps.common.pagination import KeysetPagination
 from .signals import update_user_last_login
 from .permissions import IsOwnerOrReadOnly
 from django.utils.translation import gettext_lazy as _
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from .repositories import UserRepository
-from django.core.cache import cache
-from django.views.decorators.vary import vary_on_cookie, vary_on_headers
+from .throttling import login_lockout
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
-class UserViewSet(viewsets.GenericViewSet):
+EXPORT_FIELDS = StaffUserSerializer.Meta.fields
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+class UserViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
-    repository = UserRepository
+    pagination_class = KeysetPagination
+    # Other pks 404 at routing, so they never reach the user cache keys
+    lookup_value_regex = r"\d+"
+    repository = UserRepository()
 
     def get_queryset(self):
         if self.request.user.is_staff:
-            return self.repository.get_all_users()
-        return self.repository.get_by_id(id=self.request.user.id)
+            return self.repository.get_all_users().only(*EXPORT_FIELDS)
+        return self.repository.list_users(id=self.request.user.id)
 
     def get_permissions(self) -> List[Any]:
-        if action in ("register", "login", "password_reset", "password_reset_confirm"):
-            return [AllowAny]
-        return [IsAuthenticated]
-
-    def get_serializer(self, *args, **kwargs) -> Type[Serializer]:
+        if self.action in (
+            "register",
+            "login",
+            "password_reset",
+            "password_reset_confirm",
+        ):
+            return [AllowAny()]
+        if self.action == "list":
+            return [IsAdminUser()]
+        return super().get_permissions()
+
+    def get_serializer_class(self) -> Type[Serializer]:
         return {
+            "list": StaffUserSerializer,
             "register": CustomRegisterSerializer,
             "login": CustomLoginSerializer,
-            "password_reset": PasswordResetSerializer,
+            "password_reset": CustomPasswordResetSerializer,
             "password_reset_confirm": PasswordResetConfirmSerializer,
+            "password_change": CustomPasswordChangeSerializer,
         }.get(self.action, UserProfileSerializer)
 
     def get_object(self) -> User:  # type: ignore
         user_id = self.kwargs.get("pk")
         if user_id is None:
             return self.request.user
+        return self.repository.get_user_with_profile(user_id)
+
+    @action(methods=["GET"], detail=False, permission_classes=[IsAdminUser])
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """
+        Stream all users as NDJSON or CSV, straight from a DB cursor.
+
+        Args:
+            request: The request object with an optional `type` query param
+                (`ndjson` or `csv`)
 
-        cache_key = f"user_profile_{user_id}"
-        user = cache.get(cache_key)
+        Returns:
+            StreamingHttpResponse: The export as an attachment
+        """
+        fmt = request.query_params.get("type", "ndjson")
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({"type": _("Must be one of: ndjson, csv.")})
 
-        if not user:
-            user = self.repository.get_user_with_profile(self.kwargs.get("pk"))
-            if user:
-                # Cache for 5 minutes
-                cache.set(cache_key, user, timeout=60 * 5)
-        return user
+        rows = self.repository.export_users(EXPORT_FIELDS)
+        return streaming_export(rows, EXPORT_FIELDS, "users", fmt)
 
     @action(methods=["POST"], detail=False)
     def register(self, request):
@@ -71,33 +105,34 @@ class UserViewSet(viewsets.GenericViewSet):
         serializer.save(request)
         return Response(status=status.HTTP_201_CREATED)
 
-    @action(methods="POST")
+    @action(methods=["POST"], detail=False)
     def login(self, request):
+        login = str(request.data.get("login") or request.data.get("username") or "")
+        ident = BaseThrottle().get_ident(request)
+        retry_after = login_lockout.attempt(login, ident)
+        if retry_after:
+            raise Throttled(
+                wait=retry_after, detail=str(_("Too many failed login attempts."))
+            )
+
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        # Fire signal only if user is authenticated
-        [
-            update_user_last_login(
-                sender="User", instance=request.user, request=request
-            )
-            for _ in [request.user]
-            if getattr(request, "user", None) and request.user.is_authenticated
-        ]
+        login_lockout.reset(login, ident)
+        update_user_last_login(sender=User, instance=serializer.user, request=request)
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
-    @action(methods="POST")
+    @action(methods=["POST"], detail=False)
     def logout(self, request):
-        # Clear user-specific cache
+        # Revokes every token the user holds, on all devices
         if request.user.is_authenticated:
-            cache.delete(f"user_profile_{request.user.id}")
-            cache.delete(f"user_{request.user.id}")
+            self.repository.revoke_tokens(request.user.id)
         return Response(
             _("Successful, discard token."), status=status.HTTP_205_RESET_CONTENT
         )
 
     @action(methods=["POST"], detail=False)
     def password_reset(self, request):
-        serializer = PasswordResetSerializer(
+        serializer = CustomPasswordResetSerializer(
             data=request.data, context={"request": request}
         )
         serializer.is_valid(raise_exception=True)
@@ -112,6 +147,7 @@ class UserViewSet(viewsets.GenericViewSet):
         serializer = PasswordResetConfirmSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        self.repository.revoke_tokens(serializer.user.pk)
         return Response(
             {"detail": _("Password has been reset.")},
             status=status.HTTP_200_OK,
@@ -132,19 +168,18 @@ class UserViewSet(viewsets.GenericViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
-        # Clear user cache after password change
-        cache.delete(f"user_profile_{request.user.id}")
-        cache.delete(f"user_{request.user.id}")
+        # Retires every cached entry derived from this user, and the tokens
+        # issued with the old password
+        self.repository.invalidate_user(request.user.id)
+        self.repository.revoke_tokens(request.user.id)
 
         return Response(
             {"detail": _("Password has been changed.")},
             status=status.HTTP_200_OK,
         )
 
-    # Cache the response for 5 minutes, but vary by user
-    @method_decorator(cache_page(60 * 5))
-    @method_decorator(vary_on_cookie)
-    @method_decorator(vary_on_headers("Authorization"))
+    # Serializer output cached per user under a versioned key, so profile
+    # updates show up immediately instead of after a cache_page timeout
     @action(methods=["GET"], detail=False, permission_classes=[IsAuthenticated])
     def me(self, request: Request) -> Response:
         """
@@ -156,11 +191,11 @@ class UserViewSet(viewsets.GenericViewSet):
         Returns:
             Response: User profile data
         """
-        serializer = UserProfileSerializer(request.user)
-        return Response(serializer.data)
+        data = self.repository.get_profile_data(
+            request.user.id, lambda user: UserProfileSerializer(user).data
+        )
+        return Response(data)
 
-    @method_decorator(cache_page(60 * 5))
-    @method_decorator(vary_on_headers("Authorization"))
     @action(methods=["GET"], detail=True, permission_classes=[IsAuthenticated])
     def profile(self, request: Request, pk: Optional[int] = None) -> Response:
         """
@@ -173,9 +208,12 @@ class UserViewSet(viewsets.GenericViewSet):
         Returns:
             Response: User profile data
         """
-        user = self.get_object()
-        serializer = UserProfileSerializer(user)
-        return Response(serializer.data)
+        data = self.repository.get_profile_data(
+            int(pk), lambda user: UserProfileSerializer(user).data
+        )
+        if data is None:
+            raise NotFound(_("User not found."))
+        return Response(data)
 
     @action(
         methods=["PUT", "PATCH"], detail=True, permission_classes=[IsOwnerOrReadOnly]
@@ -196,8 +234,7 @@ class UserViewSet(viewsets.GenericViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
-        # Invalidate cache
-        cache.delete(f"user_profile_{user.id}")
-        cache.delete(f"user_{user.id}")
+        # Retires every cached entry derived from this user
+        self.repository.invalidate_user(user.id)
 
         return Response(serializer.data)